@@ -0,0 +1,31 @@
+"""Add (created_at, id) indexes for keyset-paginated admin lists.
+
+Revision ID: 0006_admin_list_indexes
+Revises: 0005_notification_delivery_log
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0006_admin_list_indexes"
+down_revision = "0005_notification_delivery_log"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = (
+    ("ix_users_created_at_id", "users"),
+    ("ix_media_requests_created_at_id", "media_requests"),
+    ("ix_notifications_created_at_id", "notifications"),
+    ("ix_reported_issues_created_at_id", "reported_issues"),
+)
+
+
+def upgrade() -> None:
+    for index_name, table_name in _INDEXES:
+        op.create_index(index_name, table_name, ["created_at", "id"])
+
+
+def downgrade() -> None:
+    for index_name, table_name in reversed(_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,86 @@
+"""Add per-minute / per-hour service health rollups.
+
+Counts, ok/failure totals and latency sums are backfilled from the raw
+service_health_events still retained; latency histograms start empty for
+backfilled buckets, so percentiles cover new checks only.
+
+Revision ID: 0007_service_health_rollups
+Revises: 0006_admin_list_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_service_health_rollups"
+down_revision = "0006_admin_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+# Bucket formats match SQLAlchemy's SQLite DateTime storage so range filters
+# compare correctly as strings.
+_BACKFILL = (
+    ("hour", "%Y-%m-%d %H:00:00.000000", None),
+    ("minute", "%Y-%m-%d %H:%M:00.000000", "-2 days"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "service_health_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("service_key", sa.String(), nullable=False),
+        sa.Column("resolution", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("checks", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ok_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failure_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_sum_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=True),
+        sa.Column("latency_histogram", sa.Text(), nullable=True),
+        sa.UniqueConstraint(
+            "service_key", "resolution", "bucket_start", name="_service_rollup_bucket_uc"
+        ),
+    )
+    op.create_index(
+        "ix_service_health_rollups_resolution_bucket",
+        "service_health_rollups",
+        ["resolution", "bucket_start"],
+    )
+
+    for resolution, bucket_format, window in _BACKFILL:
+        window_filter = (
+            f"WHERE checked_at >= strftime('%Y-%m-%d %H:%M:%S', 'now', '{window}')"
+            if window
+            else ""
+        )
+        op.execute(
+            f"""
+            INSERT INTO service_health_rollups (
+                service_key, resolution, bucket_start, checks, ok_count, failure_count,
+                latency_count, latency_sum_ms, latency_max_ms
+            )
+            SELECT
+                service_key,
+                '{resolution}',
+                strftime('{bucket_format}', checked_at),
+                SUM(CASE WHEN configured THEN 1 ELSE 0 END),
+                SUM(CASE WHEN configured AND status = 'ok' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN configured AND status IN ('degraded', 'down') THEN 1 ELSE 0 END),
+                COUNT(latency_ms),
+                COALESCE(SUM(latency_ms), 0),
+                MAX(latency_ms)
+            FROM service_health_events
+            {window_filter}
+            GROUP BY service_key, strftime('{bucket_format}', checked_at)
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_service_health_rollups_resolution_bucket", table_name="service_health_rollups"
+    )
+    op.drop_table("service_health_rollups")
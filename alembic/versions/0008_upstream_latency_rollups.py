@@ -0,0 +1,44 @@
+"""Add hourly upstream latency rollups.
+
+Revision ID: 0008_upstream_latency_rollups
+Revises: 0007_service_health_rollups
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_upstream_latency_rollups"
+down_revision = "0007_service_health_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upstream_latency_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("service", sa.String(), nullable=False),
+        sa.Column("endpoint", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("requests", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_sum_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=True),
+        sa.Column("latency_histogram", sa.Text(), nullable=True),
+        sa.UniqueConstraint(
+            "service", "endpoint", "bucket_start", name="_upstream_rollup_bucket_uc"
+        ),
+    )
+    op.create_index(
+        "ix_upstream_latency_rollups_bucket_start",
+        "upstream_latency_rollups",
+        ["bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_upstream_latency_rollups_bucket_start", table_name="upstream_latency_rollups"
+    )
+    op.drop_table("upstream_latency_rollups")
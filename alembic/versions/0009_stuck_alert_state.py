@@ -0,0 +1,33 @@
+"""Persist stuck-download alert dedupe state.
+
+Revision ID: 0009_stuck_alert_state
+Revises: 0008_upstream_latency_rollups
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_stuck_alert_state"
+down_revision = "0008_upstream_latency_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stuck_alert_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("instance", sa.String(), nullable=False),
+        sa.Column("queue_id", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("alerted_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("instance", "queue_id", "reason", name="_stuck_alert_state_uc"),
+    )
+    op.create_index("ix_stuck_alert_state_expires_at", "stuck_alert_state", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stuck_alert_state_expires_at", table_name="stuck_alert_state")
+    op.drop_table("stuck_alert_state")
@@ -0,0 +1,24 @@
+"""Index lower(email) / lower(username) for webhook user resolution.
+
+Revision ID: 0010_user_lookup_indexes
+Revises: 0009_stuck_alert_state
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_user_lookup_indexes"
+down_revision = "0009_stuck_alert_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_users_email_lower", "users", [sa.text("lower(email)")])
+    op.create_index("ix_users_username_lower", "users", [sa.text("lower(username)")])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.drop_index("ix_users_email_lower", table_name="users")
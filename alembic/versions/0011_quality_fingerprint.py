@@ -0,0 +1,29 @@
+"""Add media_requests.quality_fingerprint / quality_checked_at.
+
+Revision ID: 0011_quality_fingerprint
+Revises: 0010_user_lookup_indexes
+Create Date: 2026-10-19
+
+The quality/release monitor stores a hash of the upstream state it last
+evaluated for each request and skips requests whose state is unchanged.
+Both columns start NULL, so the first run after the upgrade checks
+everything.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_quality_fingerprint"
+down_revision = "0010_user_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("media_requests", sa.Column("quality_fingerprint", sa.String(), nullable=True))
+    op.add_column("media_requests", sa.Column("quality_checked_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("media_requests", "quality_checked_at")
+    op.drop_column("media_requests", "quality_fingerprint")
@@ -11,7 +11,7 @@ What changed vs v1:
     - Setup-mode gating moved out of here into app.middleware.SetupGateMiddleware.
 
 What carried forward:
-    - bcrypt password hash + verify
+    - bcrypt password hash + verify (now on a dedicated thread pool)
     - HMAC-signed session cookie (timestamp.signature)
     - Local network CIDR bypass with X-Forwarded-For / CF-Connecting-IP support
     - Login rate limit (5 attempts / IP / 5 minutes)
@@ -19,21 +19,25 @@ What carried forward:
 """
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
 import ipaddress
 import logging
 import time
-from collections import defaultdict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import bcrypt
 import httpx
 from fastapi.responses import JSONResponse, RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
+from app.security import get_network_acl
 
 
 logger = logging.getLogger(__name__)
@@ -59,6 +63,7 @@ _PUBLIC_PATHS = (
     # IS the credential, so calendar apps subscribe without a login session.
     "/calendar/",
 )
+_UNAUTHENTICATED_JSON_PREFIXES = ("/api/", "/admin/", "/metrics")
 
 
 # ---------------------------------------------------------------------------
@@ -66,6 +71,16 @@ _PUBLIC_PATHS = (
 # ---------------------------------------------------------------------------
 
 
+# bcrypt is deliberately slow (~250ms per check at the default cost). It runs
+# on a small dedicated pool so a burst of logins can neither freeze the event
+# loop nor starve the default executor other code relies on; the pool size
+# is the concurrency cap, extra calls queue.
+BCRYPT_MAX_CONCURRENCY = 2
+_bcrypt_executor = ThreadPoolExecutor(
+    max_workers=BCRYPT_MAX_CONCURRENCY, thread_name_prefix="bcrypt"
+)
+
+
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
@@ -77,6 +92,18 @@ def verify_password(password: str, hashed: str) -> bool:
         return False
 
 
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the bcrypt pool -- use this from async routes."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """verify_password() on the bcrypt pool -- use this from async routes."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_executor, verify_password, password, hashed)
+
+
 # ---------------------------------------------------------------------------
 # Session token (HMAC over a timestamp)
 # ---------------------------------------------------------------------------
@@ -112,7 +139,7 @@ def verify_session_token(token: str, secret_key: str, max_age_seconds: int) -> b
 # ---------------------------------------------------------------------------
 
 
-def get_client_ip(request: Request) -> str:
+def get_client_ip(request: HTTPConnection) -> str:
     """Return client IP, trusting proxy headers only from trusted proxies."""
     peer_ip = request.client.host if request.client else "0.0.0.0"
     if is_local_network(peer_ip, settings.trusted_proxy_cidrs):
@@ -140,20 +167,7 @@ def get_client_ip(request: Request) -> str:
 def is_local_network(ip_str: str, cidr_csv: str) -> bool:
     if not cidr_csv:
         return False
-    try:
-        addr = ipaddress.ip_address(ip_str)
-    except ValueError:
-        return False
-    for cidr in cidr_csv.split(","):
-        cidr = cidr.strip()
-        if not cidr:
-            continue
-        try:
-            if addr in ipaddress.ip_network(cidr, strict=False):
-                return True
-        except ValueError:
-            continue
-    return False
+    return get_network_acl(cidr_csv).contains(ip_str)
 
 
 # ---------------------------------------------------------------------------
@@ -161,23 +175,73 @@ def is_local_network(ip_str: str, cidr_csv: str) -> bool:
 # ---------------------------------------------------------------------------
 
 
-_LOGIN_ATTEMPTS: dict[str, list[float]] = defaultdict(list)
 LOGIN_MAX_ATTEMPTS = 5
 LOGIN_WINDOW_SECONDS = 300
+LOGIN_MAX_TRACKED_IPS = 10_000
+
+
+class LoginRateLimiter:
+    """Sliding-window login limiter with bounded memory.
+
+    Each IP keeps at most `max_attempts` timestamps (a fixed-size deque), so
+    a check is O(1). IPs are held in an OrderedDict in least-recently-seen
+    order: idle entries are evicted from the front as the window passes, and
+    if a scanner cycles through more than `max_ips` addresses the oldest are
+    dropped, so the table cannot grow without bound.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = LOGIN_MAX_ATTEMPTS,
+        window_seconds: float = LOGIN_WINDOW_SECONDS,
+        max_ips: int = LOGIN_MAX_TRACKED_IPS,
+    ):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_ips = max_ips
+        self._attempts: "OrderedDict[str, deque[float]]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        while self._attempts:
+            ip, attempts = next(iter(self._attempts.items()))
+            if now - attempts[-1] < self.window_seconds:
+                break
+            self._attempts.pop(ip)
+
+    def allow(self, ip: str) -> bool:
+        """Return True if a new attempt is allowed; record it if so."""
+        now = time.monotonic()
+        self._evict(now)
+        attempts = self._attempts.get(ip)
+        if attempts is None:
+            attempts = deque(maxlen=self.max_attempts)
+            self._attempts[ip] = attempts
+            while len(self._attempts) > self.max_ips:
+                self._attempts.popitem(last=False)
+        else:
+            self._attempts.move_to_end(ip)
+        if len(attempts) >= self.max_attempts and now - attempts[0] < self.window_seconds:
+            return False
+        attempts.append(now)
+        return True
+
+    def clear(self, ip: str) -> None:
+        self._attempts.pop(ip, None)
+
+    def __len__(self) -> int:
+        return len(self._attempts)
+
+
+_login_limiter = LoginRateLimiter()
 
 
 def login_attempt_allowed(ip: str) -> bool:
     """Return True if a new login attempt is allowed; record it if so."""
-    now = time.time()
-    _LOGIN_ATTEMPTS[ip] = [t for t in _LOGIN_ATTEMPTS[ip] if now - t < LOGIN_WINDOW_SECONDS]
-    if len(_LOGIN_ATTEMPTS[ip]) >= LOGIN_MAX_ATTEMPTS:
-        return False
-    _LOGIN_ATTEMPTS[ip].append(now)
-    return True
+    return _login_limiter.allow(ip)
 
 
 def clear_login_attempts(ip: str) -> None:
-    _LOGIN_ATTEMPTS.pop(ip, None)
+    _login_limiter.clear(ip)
 
 
 # ---------------------------------------------------------------------------
@@ -229,49 +293,64 @@ async def verify_turnstile(token: str, secret_key: str, client_ip: Optional[str]
 # ---------------------------------------------------------------------------
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+def auth_gate_response(scope: Scope) -> Optional[Response]:
+    """Return the login/401 response for an unauthenticated request, or None."""
+    # Pre-setup, SetupGateMiddleware (which runs first) has already
+    # restricted the surface to the wizard + housekeeping. Don't try
+    # to enforce auth on routes that don't exist yet -- otherwise
+    # /setup -> /login -> SetupGate redirect to /setup -> infinite loop.
+    if not settings.is_minimally_configured():
+        return None
+
+    if not settings.auth_required:
+        return None
+
+    path = scope["path"]
+    if path.startswith(_PUBLIC_PATHS):
+        return None
+
+    conn = HTTPConnection(scope)
+    client_ip = get_client_ip(conn)
+    if is_local_network(client_ip, settings.local_network_cidrs):
+        logger.debug(f"local-network bypass for {client_ip}")
+        return None
+
+    token = conn.cookies.get(AuthMiddleware.SESSION_COOKIE)
+    if (
+        token
+        and settings.app_secret_key
+        and verify_session_token(token, settings.app_secret_key, settings.session_max_age_seconds)
+    ):
+        return None
+
+    # Unauthenticated. API routes get JSON 401; everything else redirects to login.
+    if path.startswith(_UNAUTHENTICATED_JSON_PREFIXES):
+        return JSONResponse(
+            status_code=401, content={"detail": "Authentication required"}
+        )
+    return RedirectResponse(url="/login", status_code=302)
+
+
+class AuthMiddleware:
     """Require auth on protected routes once setup is complete.
 
     No-op when settings.auth_required is False. CIDR-matched clients bypass
     the password check. SetupGateMiddleware runs *before* this and gates
     everything to /setup until configured -- so AuthMiddleware can assume
     config is loaded.
+
+    Plain ASGI (see SetupGateMiddleware for why).
     """
 
     SESSION_COOKIE = "ba_session"
 
-    async def dispatch(self, request: Request, call_next):
-        # Pre-setup, SetupGateMiddleware (which runs first) has already
-        # restricted the surface to the wizard + housekeeping. Don't try
-        # to enforce auth on routes that don't exist yet -- otherwise
-        # /setup -> /login -> SetupGate redirect to /setup -> infinite loop.
-        if not settings.is_minimally_configured():
-            return await call_next(request)
-
-        if not settings.auth_required:
-            return await call_next(request)
-
-        path = request.url.path
-        for pub in _PUBLIC_PATHS:
-            if path == pub or path.startswith(pub):
-                return await call_next(request)
-
-        client_ip = get_client_ip(request)
-        if is_local_network(client_ip, settings.local_network_cidrs):
-            logger.debug(f"local-network bypass for {client_ip}")
-            return await call_next(request)
-
-        token = request.cookies.get(self.SESSION_COOKIE)
-        if (
-            token
-            and settings.app_secret_key
-            and verify_session_token(token, settings.app_secret_key, settings.session_max_age_seconds)
-        ):
-            return await call_next(request)
-
-        # Unauthenticated. API routes get JSON 401; everything else redirects to login.
-        if path.startswith("/api/") or path.startswith("/admin/"):
-            return JSONResponse(
-                status_code=401, content={"detail": "Authentication required"}
-            )
-        return RedirectResponse(url="/login", status_code=302)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            response = auth_gate_response(scope)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
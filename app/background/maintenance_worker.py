@@ -20,7 +20,10 @@ REMINDER_THRESHOLD_MINUTES = 60
 
 async def maintenance_window_worker():
     """Background worker that manages maintenance window lifecycle"""
+    from app.background.utils import refresh_maintenance_state
+
     logger.info("Maintenance window worker started")
+    refresh_maintenance_state()
     
     while True:
         try:
@@ -37,6 +40,7 @@ async def check_maintenance_windows():
     """Check all active/scheduled maintenance windows and take appropriate actions"""
     from app.database import get_db, MaintenanceWindow
     from app.services.email_service import EmailService
+    from app.background.utils import refresh_maintenance_state
     from app.background.system_health import (
         record_worker_failure,
         record_worker_started,
@@ -97,6 +101,9 @@ async def check_maintenance_windows():
             except Exception as e:
                 logger.error(f"Error processing maintenance window '{window.title}': {e}")
                 db.rollback()
+
+        # Publish any scheduled -> active -> completed transition to workers.
+        refresh_maintenance_state(db)
                 
     except Exception as e:
         failed = True
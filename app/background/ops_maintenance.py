@@ -5,29 +5,150 @@ import asyncio
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import func
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import Notification, SessionLocal, SystemConfig
+from app.database import Notification, SessionLocal, SystemConfig, optimize_database
+from app.pagination import invalidate_cached_counts
 from app.services.admin_activity import record_admin_activity
 from app.services.backup_service import BackupService
-from app.services.notification_history import backfill_delivery_log_from_notifications
+from app.services.notification_history import record_delivery_for_notification
 
 
 logger = logging.getLogger(__name__)
 
 
-def purge_sent_notifications(db: Session, days_old: int) -> int:
-    """Delete sent notifications older than the retention window."""
+# Bulk notification maintenance works in id-ordered batches, committing
+# after each one, so no single statement holds SQLite's write lock for long
+# and a 50k-row backlog never has to be loaded into memory at once.
+NOTIFICATION_BATCH_SIZE = 1000
+
+
+def run_with_session(fn, *args, **kwargs):
+    """Call fn(db, *args, **kwargs) on a short-lived session of its own.
+
+    For asyncio.to_thread(): admin jobs run each batch this way so a batch
+    waiting out SQLite's busy_timeout never blocks the event loop.
+    """
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def _pending_notification_filters(created_before: datetime | None, max_id: int | None) -> list:
+    filters = [Notification.sent.is_(False)]
+    if created_before is not None:
+        filters.append(Notification.created_at < created_before)
+    if max_id is not None:
+        filters.append(Notification.id <= max_id)
+    return filters
+
+
+def count_pending_notifications(
+    db: Session, created_before: datetime | None = None
+) -> tuple[int, int | None]:
+    """Return (count, max_id) of matching pending rows.
+
+    max_id pins the job to rows that existed when it started; notifications
+    queued while the job runs are left alone.
+    """
+    count, max_id = db.query(func.count(Notification.id), func.max(Notification.id)).filter(
+        *_pending_notification_filters(created_before, None)
+    ).one()
+    return int(count or 0), max_id
+
+
+def mark_pending_batch_as_sent(
+    db: Session,
+    *,
+    created_before: datetime | None = None,
+    max_id: int | None = None,
+    batch_size: int = NOTIFICATION_BATCH_SIZE,
+) -> int:
+    """Mark up to batch_size pending notifications as sent (no email). Commits."""
+    batch_ids = (
+        select(Notification.id)
+        .where(*_pending_notification_filters(created_before, max_id))
+        .order_by(Notification.id)
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Notification)
+        .where(Notification.id.in_(batch_ids))
+        .values(sent=True, sent_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(result.rowcount or 0)
+
+
+def purge_cutoff(days_old: int) -> datetime:
+    """Cutoff for purge_sent_batch(), with days_old clamped to 1..3650."""
     days = max(1, min(int(days_old or 90), 3650))
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    backfill_delivery_log_from_notifications(db)
-    deleted = db.query(Notification).filter(
-        Notification.sent.is_(True),
-        func.coalesce(Notification.sent_at, Notification.created_at) < cutoff,
-    ).delete(synchronize_session=False)
-    return int(deleted or 0)
+    return datetime.utcnow() - timedelta(days=days)
+
+
+def purge_sent_batch(
+    db: Session, cutoff: datetime, batch_size: int = NOTIFICATION_BATCH_SIZE
+) -> int:
+    """Delete up to batch_size sent notifications older than cutoff. Commits.
+
+    The rows are written to the delivery ledger first. Returns how many
+    were deleted; fewer than batch_size means nothing is left.
+    """
+    batch = (
+        db.query(Notification)
+        .filter(
+            Notification.sent.is_(True),
+            func.coalesce(Notification.sent_at, Notification.created_at) < cutoff,
+        )
+        .order_by(Notification.id)
+        .limit(batch_size)
+        .all()
+    )
+    if not batch:
+        return 0
+    for notification in batch:
+        try:
+            record_delivery_for_notification(db, notification, sent_at=notification.sent_at)
+        except Exception:
+            logger.debug(
+                "failed to backfill delivery log from notification %s",
+                notification.id,
+                exc_info=True,
+            )
+    batch_ids = [notification.id for notification in batch]
+    for notification in batch:
+        db.expunge(notification)
+    db.query(Notification).filter(Notification.id.in_(batch_ids)).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    return len(batch_ids)
+
+
+def purge_sent_notifications(
+    db: Session, days_old: int, batch_size: int = NOTIFICATION_BATCH_SIZE
+) -> int:
+    """Delete sent notifications older than the retention window.
+
+    Each batch is written to the delivery ledger and then deleted in its own
+    transaction (this commits the caller's session as it goes).
+    """
+    cutoff = purge_cutoff(days_old)
+    deleted = 0
+    while True:
+        changed = purge_sent_batch(db, cutoff, batch_size)
+        deleted += changed
+        if changed < batch_size:
+            break
+    if deleted:
+        invalidate_cached_counts("notifications")
+    return deleted
 
 
 def _get_state_datetime(db: Session, key: str) -> datetime | None:
@@ -105,6 +226,30 @@ def _run_scheduled_backup(db: Session) -> str | None:
     return backup_path
 
 
+def _run_sqlite_optimize(db: Session) -> bool:
+    state_key = "ops_sqlite_optimize_last_run"
+    if not _due(_get_state_datetime(db, state_key), settings.sqlite_optimize_interval_hours):
+        return False
+    optimize_database()
+    _set_state_datetime(db, state_key, datetime.utcnow())
+    return True
+
+
+def _run_ops_maintenance_tasks() -> dict[str, object]:
+    db = SessionLocal()
+    try:
+        deleted = _run_notification_retention(db)
+        backup_path = _run_scheduled_backup(db)
+        optimized = _run_sqlite_optimize(db)
+        db.commit()
+        return {"deleted_notifications": deleted, "backup_path": backup_path, "optimized": optimized}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 async def run_ops_maintenance_cycle() -> dict[str, object]:
     from app.background.system_health import (
         record_worker_failure,
@@ -118,20 +263,18 @@ async def run_ops_maintenance_cycle() -> dict[str, object]:
         "Operational maintenance",
         next_run_at=next_run_at,
     )
-    db = SessionLocal()
     try:
-        deleted = _run_notification_retention(db)
-        backup_path = _run_scheduled_backup(db)
-        db.commit()
+        # Purge batches, the backup and PRAGMA optimize all block on SQLite
+        # and the disk; run them in a worker thread, off the event loop.
+        result = await asyncio.to_thread(_run_ops_maintenance_tasks)
         record_worker_success(
             "ops_maintenance",
             "Operational maintenance",
             started_at=started_at,
             next_run_at=next_run_at,
         )
-        return {"deleted_notifications": deleted, "backup_path": backup_path}
+        return result
     except Exception as e:
-        db.rollback()
         logger.error("operational maintenance failed: %s", e, exc_info=True)
         record_worker_failure(
             "ops_maintenance",
@@ -141,8 +284,6 @@ async def run_ops_maintenance_cycle() -> dict[str, object]:
             next_run_at=next_run_at,
         )
         raise
-    finally:
-        db.close()
 
 
 async def ops_maintenance_worker() -> None:
@@ -3,9 +3,19 @@ Quality and Release Monitor
 Checks pending requests for:
 1. Content not yet released (send "coming soon" notification with premiere date)
 2. Content available but wrong quality (send "waiting for quality" notification)
+
+Each run fetches /series, /movie and the queues once per instance (quality
+profile names come from the shared app.services.arr_metadata cache), then
+fingerprints every request's upstream state (series statistics / movie
+file, monitored flag, status, queue presence, whether the release or last
+airing has passed). Requests whose fingerprint matches the previous run
+are skipped; everything is re-checked at least every QUALITY_RECHECK_DAYS
+so the notification cooldowns still expire normally.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
@@ -16,10 +26,38 @@ from app.services.email_service import EmailService
 from app.services.sonarr_service import SonarrService
 from app.services.radarr_service import RadarrService
 from app.services.tmdb_service import TMDBService
+from app.services.arr_metadata import quality_profile_name
 from app.config import settings
+from app.metrics import Gauge, register_metric
 
 logger = logging.getLogger(__name__)
 
+# Force a full re-check of an unchanged request after this long, matching
+# the quality_waiting cooldown in _already_notified_quality_wait.
+QUALITY_RECHECK_DAYS = 7
+
+QUALITY_MONITOR_REQUESTS = register_metric(Gauge(
+    "quality_monitor_requests",
+    "Requests in the last quality monitor run: total, and changed (re-checked).",
+    ("result",),
+))
+
+
+def _fingerprint(state: dict) -> str:
+    return hashlib.sha1(json.dumps(state, sort_keys=True, default=str).encode()).hexdigest()[:20]
+
+
+def _has_passed(date_str: Optional[str], days: int = 0) -> Optional[bool]:
+    if not date_str:
+        return None
+    try:
+        moment = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment < datetime.now(timezone.utc) - timedelta(days=days)
+
 
 class QualityReleaseMonitor:
     def __init__(self):
@@ -31,6 +69,7 @@ class QualityReleaseMonitor:
         # All Sonarr instances (primary + anime if configured)
         from app.services.sonarr_service import get_all_sonarr_instances
         self.sonarr_instances = get_all_sonarr_instances()
+        self._reset_cycle_cache()
     
     async def run(self):
         """Run the quality/release monitoring check"""
@@ -50,6 +89,7 @@ class QualityReleaseMonitor:
             next_run_at=next_run_at,
         )
         
+        self._reset_cycle_cache()
         db = next(get_db())
         try:
             # Get all approved requests that aren't available yet
@@ -60,17 +100,21 @@ class QualityReleaseMonitor:
             
             logger.info(f"Checking {len(pending_requests)} pending requests")
             
+            changed = 0
             for request in pending_requests:
                 try:
-                    if request.media_type == 'tv':
-                        await self._check_tv_show(request, db)
-                    elif request.media_type == 'movie':
-                        await self._check_movie(request, db)
+                    if await self.check_request(request, db, force=False):
+                        changed += 1
                 except Exception as e:
                     logger.error(f"Failed to check request {request.id} ({request.title}): {e}")
             
             db.commit()
-            logger.info("Quality/release monitoring check completed")
+            QUALITY_MONITOR_REQUESTS.set(changed, "changed")
+            QUALITY_MONITOR_REQUESTS.set(len(pending_requests), "total")
+            logger.info(
+                f"Quality/release monitoring check completed: "
+                f"{changed}/{len(pending_requests)} requests changed and re-checked"
+            )
             record_worker_success(
                 "quality_release_monitor",
                 "Quality/release monitor",
@@ -91,37 +135,140 @@ class QualityReleaseMonitor:
         finally:
             db.close()
     
-    async def _check_tv_show(self, request: MediaRequest, db: Session):
-        """Check TV show for release status and quality"""
-        # If we don't have a series_id, try to find it in Sonarr by TMDB ID
-        series = None
-        matched_sonarr = self.sonarr  # Default to primary
-        
-        # Search across all Sonarr instances
+    # ------------------------------------------------------------------
+    # Per-run caches: one /series, /movie and /queue fetch per instance,
+    # shared by every request in the run
+    # ------------------------------------------------------------------
+    def _reset_cycle_cache(self):
+        self._series_lists = {}
+        self._movie_list = None
+        self._queue_ids = {}
+    
+    async def _all_series(self, sonarr: SonarrService) -> list:
+        key = sonarr.instance_name
+        if key not in self._series_lists:
+            self._series_lists[key] = await sonarr.get_all_series() or []
+        return self._series_lists[key]
+    
+    async def _all_movies(self) -> list:
+        if self._movie_list is None:
+            self._movie_list = await self.radarr.get_movies() or []
+        return self._movie_list
+    
+    async def _in_queue(self, service, item_id) -> bool:
+        """Whether a series/movie id is in the service's download queue."""
+        key = getattr(service, 'instance_name', 'Radarr')
+        if key not in self._queue_ids:
+            field = 'seriesId' if isinstance(service, SonarrService) else 'movieId'
+            try:
+                queue = await service._get("/queue")
+                self._queue_ids[key] = {
+                    record.get(field) for record in (queue or {}).get('records', [])
+                }
+            except Exception as e:
+                logger.warning(f"Failed to check {key} download queue: {e}")
+                self._queue_ids[key] = set()
+        return item_id in self._queue_ids[key]
+    
+    async def _quality_profile_name(self, service, item: dict) -> str:
+        """Display name of an item's quality profile."""
+        quality_obj = item.get('qualityProfile')
+        if quality_obj and isinstance(quality_obj, dict):
+            return quality_obj.get('name', 'Unknown')
+        quality_profile_id = item.get('qualityProfileId')
+        if not quality_profile_id:
+            return 'Unknown'
+        name = await quality_profile_name(service, quality_profile_id)
+        return name or f"Profile ID {quality_profile_id}"
+    
+    async def _locate_series(self, request: MediaRequest):
+        """(sonarr instance, series) for a TV request, searching every instance."""
         for sonarr_inst in self.sonarr_instances:
-            if hasattr(request, 'series_id') and request.series_id:
-                try:
-                    s = await sonarr_inst.get_series(request.series_id)
-                    if s:
-                        series = s
-                        matched_sonarr = sonarr_inst
-                        break
-                except Exception:
-                    continue
-            else:
-                # Look up series by TMDB ID
-                all_series = await sonarr_inst.get_all_series()
-                if all_series:
-                    s = next((s for s in all_series if s.get('tvdbId') == request.tmdb_id), None)
-                    if s:
-                        series = s
-                        matched_sonarr = sonarr_inst
-                        break
-        
-        if not series:
-            logger.debug(f"Series not yet in Sonarr for request {request.id} ({request.title})")
-            return
-        
+            all_series = await self._all_series(sonarr_inst)
+            series = next((s for s in all_series if s.get('tvdbId') == request.tmdb_id), None)
+            if series:
+                return sonarr_inst, series
+        return None
+    
+    async def _locate_movie(self, request: MediaRequest):
+        """(radarr, movie) for a movie request."""
+        if not request.tmdb_id:
+            return None
+        movies = await self._all_movies()
+        movie = next((m for m in movies if m.get('tmdbId') == request.tmdb_id), None)
+        if not movie:
+            logger.info(f"Movie '{request.title}' (TMDB: {request.tmdb_id}) not yet in Radarr - skipping quality check")
+            return None
+        return self.radarr, movie
+    
+    async def _request_fingerprint(self, request: MediaRequest, service, item: dict) -> str:
+        """Hash of everything the checks below depend on."""
+        if request.media_type == 'tv':
+            statistics = item.get('statistics') or {}
+            state = {
+                'id': item.get('id'),
+                'status': item.get('status'),
+                'monitored': item.get('monitored'),
+                'quality_profile': item.get('qualityProfileId'),
+                'episode_count': statistics.get('episodeCount'),
+                'episode_file_count': statistics.get('episodeFileCount'),
+                'size_on_disk': statistics.get('sizeOnDisk'),
+                'first_aired': item.get('firstAired'),
+                'last_airing_week_old': _has_passed(item.get('previousAiring'), days=7),
+                'in_queue': await self._in_queue(service, item.get('id')),
+            }
+        else:
+            movie_file = item.get('movieFile') or {}
+            release_date = item.get('digitalRelease') or item.get('physicalRelease') or item.get('inCinemas')
+            state = {
+                'id': item.get('id'),
+                'status': item.get('status'),
+                'monitored': item.get('monitored'),
+                'quality_profile': item.get('qualityProfileId'),
+                'has_file': item.get('hasFile'),
+                'movie_file': movie_file.get('id'),
+                'cutoff_not_met': movie_file.get('qualityCutoffNotMet'),
+                'release_date': release_date,
+                'released': _has_passed(release_date),
+                'in_queue': await self._in_queue(service, item.get('id')),
+            }
+        return _fingerprint(state)
+    
+    async def check_request(self, request: MediaRequest, db: Session, force: bool = True) -> bool:
+        """Check one request; returns False if it was skipped.
+
+        With force=False a request whose fingerprint matches the last check
+        (made within QUALITY_RECHECK_DAYS) is skipped.
+        """
+        if request.media_type == 'tv':
+            located = await self._locate_series(request)
+        elif request.media_type == 'movie':
+            located = await self._locate_movie(request)
+        else:
+            return False
+        if located is None:
+            logger.debug(f"Not yet in Sonarr/Radarr: request {request.id} ({request.title})")
+            return False
+        service, item = located
+        fingerprint = await self._request_fingerprint(request, service, item)
+        recheck_before = datetime.utcnow() - timedelta(days=QUALITY_RECHECK_DAYS)
+        if (
+            not force
+            and fingerprint == request.quality_fingerprint
+            and request.quality_checked_at
+            and request.quality_checked_at > recheck_before
+        ):
+            return False
+        if request.media_type == 'tv':
+            await self._check_tv_show(request, db, item, service)
+        else:
+            await self._check_movie(request, db, item)
+        request.quality_fingerprint = fingerprint
+        request.quality_checked_at = datetime.utcnow()
+        return True
+    
+    async def _check_tv_show(self, request: MediaRequest, db: Session, series: dict, matched_sonarr: SonarrService):
+        """Check TV show for release status and quality"""
         # Check if series hasn't premiered yet
         if series.get('status') == 'upcoming':
             premiere_date = series.get('firstAired')
@@ -152,43 +299,13 @@ class QualityReleaseMonitor:
                 if air_datetime < datetime.now(timezone.utc) - timedelta(days=7):  # Aired more than a week ago
                     # Check if series is currently in the download queue (downloading, stuck, etc.)
                     # If it's in the queue, don't send quality notification - the stuck monitor handles errors
-                    try:
-                        queue = await matched_sonarr._get("/queue")
-                        if queue and 'records' in queue:
-                            in_queue = any(
-                                item.get('seriesId') == series.get('id')
-                                for item in queue['records']
-                            )
-                            if in_queue:
-                                logger.info(f"Series '{request.title}' is in {matched_sonarr.instance_name} download queue - skipping quality notification")
-                                return
-                    except Exception as e:
-                        logger.warning(f"Failed to check {matched_sonarr.instance_name} queue for '{request.title}': {e}")
+                    if await self._in_queue(matched_sonarr, series.get('id')):
+                        logger.info(f"Series '{request.title}' is in {matched_sonarr.instance_name} download queue - skipping quality notification")
+                        return
                     
                     # Check if we already notified about quality waiting
                     if not self._already_notified_quality_wait(request, db):
-                        # Get quality profile name from series
-                        quality_profile_id = series.get('qualityProfileId')
-                        quality_profile_name = 'Unknown'
-                        
-                        # Try to get the actual profile name from Sonarr
-                        if quality_profile_id:
-                            # Quality profiles are in the series object as qualityProfile
-                            quality_obj = series.get('qualityProfile')
-                            if quality_obj and isinstance(quality_obj, dict):
-                                quality_profile_name = quality_obj.get('name', 'Unknown')
-                            else:
-                                # Look up profile name from Sonarr API
-                                try:
-                                    profiles = await matched_sonarr.get_quality_profiles()
-                                    profile = next((p for p in profiles if p.get('id') == quality_profile_id), None)
-                                    if profile:
-                                        quality_profile_name = profile.get('name', f"Profile ID {quality_profile_id}")
-                                    else:
-                                        quality_profile_name = f"Profile ID {quality_profile_id}"
-                                except Exception as e:
-                                    logger.error(f"Failed to lookup quality profile: {e}")
-                                    quality_profile_name = f"Profile ID {quality_profile_id}"
+                        quality_profile_name = await self._quality_profile_name(matched_sonarr, series)
                         
                         await self._send_quality_waiting_notification(
                             request=request,
@@ -197,24 +314,8 @@ class QualityReleaseMonitor:
                         )
                         return  # Only send one notification per check
     
-    async def _check_movie(self, request: MediaRequest, db: Session):
+    async def _check_movie(self, request: MediaRequest, db: Session, movie: dict):
         """Check movie for release status and quality"""
-        # Get all movies from Radarr
-        movies = await self.radarr.get_movies()
-        
-        # Find movie by movie_id or TMDB ID
-        movie = None
-        if hasattr(request, 'movie_id') and request.movie_id:
-            movie = next((m for m in movies if m.get('id') == request.movie_id), None)
-        
-        if not movie and request.tmdb_id:
-            # Look up by TMDB ID
-            movie = next((m for m in movies if m.get('tmdbId') == request.tmdb_id), None)
-        
-        if not movie:
-            logger.info(f"Movie '{request.title}' (TMDB: {request.tmdb_id}) not yet in Radarr - skipping quality check")
-            return
-        
         logger.info(f"Checking movie '{request.title}' - Status: {movie.get('status')}, HasFile: {movie.get('hasFile')}")
         
         # Check release status
@@ -255,26 +356,7 @@ class QualityReleaseMonitor:
             if quality_cutoff_not_met:
                 logger.info(f"Movie has file but quality cutoff not met - sending quality waiting notification")
                 if not self._already_notified_quality_wait(request, db):
-                    # Get quality profile name from movie
-                    quality_profile_id = movie.get('qualityProfileId')
-                    quality_profile_name = 'Unknown'
-                    
-                    # Try to get the actual profile name
-                    quality_obj = movie.get('qualityProfile')
-                    if quality_obj and isinstance(quality_obj, dict):
-                        quality_profile_name = quality_obj.get('name', 'Unknown')
-                    elif quality_profile_id:
-                        # Look up profile name from Radarr API
-                        try:
-                            profiles = await self.radarr.get_quality_profiles()
-                            profile = next((p for p in profiles if p.get('id') == quality_profile_id), None)
-                            if profile:
-                                quality_profile_name = profile.get('name', f"Profile ID {quality_profile_id}")
-                            else:
-                                quality_profile_name = f"Profile ID {quality_profile_id}"
-                        except Exception as e:
-                            logger.error(f"Failed to lookup quality profile: {e}")
-                            quality_profile_name = f"Profile ID {quality_profile_id}"
+                    quality_profile_name = await self._quality_profile_name(self.radarr, movie)
                     
                     await self._send_quality_waiting_notification(
                         request=request,
@@ -287,43 +369,15 @@ class QualityReleaseMonitor:
             
             # Check if movie is currently in the download queue (downloading, stuck, etc.)
             # If it's in the queue, don't send quality notification - the stuck monitor handles errors
-            try:
-                queue = await self.radarr._get("/queue")
-                if queue and 'records' in queue:
-                    in_queue = any(
-                        item.get('movieId') == movie.get('id')
-                        for item in queue['records']
-                    )
-                    if in_queue:
-                        logger.info(f"Movie '{request.title}' is in Radarr download queue - skipping quality notification")
-                        return
-            except Exception as e:
-                logger.warning(f"Failed to check Radarr queue for '{request.title}': {e}")
+            if await self._in_queue(self.radarr, movie.get('id')):
+                logger.info(f"Movie '{request.title}' is in Radarr download queue - skipping quality notification")
+                return
             
             already_notified = self._already_notified_quality_wait(request, db)
             logger.info(f"Already notified check: {already_notified}")
             
             if not already_notified:
-                # Get quality profile name from movie
-                quality_profile_id = movie.get('qualityProfileId')
-                quality_profile_name = 'Unknown'
-                
-                # Try to get the actual profile name
-                quality_obj = movie.get('qualityProfile')
-                if quality_obj and isinstance(quality_obj, dict):
-                    quality_profile_name = quality_obj.get('name', 'Unknown')
-                elif quality_profile_id:
-                    # Look up profile name from Radarr API
-                    try:
-                        profiles = await self.radarr.get_quality_profiles()
-                        profile = next((p for p in profiles if p.get('id') == quality_profile_id), None)
-                        if profile:
-                            quality_profile_name = profile.get('name', f"Profile ID {quality_profile_id}")
-                        else:
-                            quality_profile_name = f"Profile ID {quality_profile_id}"
-                    except Exception as e:
-                        logger.error(f"Failed to lookup quality profile: {e}")
-                        quality_profile_name = f"Profile ID {quality_profile_id}"
+                quality_profile_name = await self._quality_profile_name(self.radarr, movie)
                 
                 await self._send_quality_waiting_notification(
                     request=request,
@@ -503,15 +557,16 @@ async def run_quality_release_monitor():
 async def quality_release_monitor_worker():
     """Background worker that runs at configured interval"""
     from app.config import settings
-    from app.background.utils import is_maintenance_active
+    from app.background.utils import is_maintenance_active, wait_for_maintenance_end
     
     logger.info("Quality/Release monitor worker started")
     
     while True:
         try:
             if is_maintenance_active():
-                logger.info("🔧 Maintenance active — skipping quality/release check")
-            elif settings.quality_monitor_enabled:
+                logger.info("🔧 Maintenance active — quality/release check waits for it to end")
+                await wait_for_maintenance_end()
+            if settings.quality_monitor_enabled:
                 await run_quality_release_monitor()
             else:
                 logger.debug("Quality monitoring is disabled in settings")
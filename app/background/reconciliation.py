@@ -701,7 +701,7 @@ async def run_reconciliation():
 
 async def reconciliation_worker():
     """Background worker that runs reconciliation periodically"""
-    from app.background.utils import is_maintenance_active
+    from app.background.utils import is_maintenance_active, wait_for_maintenance_end
     
     logger.info("🔄 Reconciliation worker started")
     
@@ -711,9 +711,9 @@ async def reconciliation_worker():
             interval_hours = recon_settings['interval_hours']
             
             if is_maintenance_active():
-                logger.info("🔧 Maintenance active — skipping reconciliation cycle")
-            else:
-                await run_reconciliation()
+                logger.info("🔧 Maintenance active — reconciliation waits for it to end")
+                await wait_for_maintenance_end()
+            await run_reconciliation()
         except Exception as e:
             logger.error(f"Reconciliation worker error: {e}")
             interval_hours = 2  # fallback
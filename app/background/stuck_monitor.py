@@ -1,9 +1,20 @@
 """
 Stuck Download Monitor
 Monitors Sonarr/Radarr activity queues and alerts when downloads are stuck
+
+Which queue items have already been alerted on or auto-fixed is kept in the
+stuck_alert_state table (keyed by instance + queue id + reason, expiring
+after ALERT_TTL) behind a bounded in-memory LRU, so a restart doesn't
+re-blocklist and re-alert everything still sitting in the queues.
 """
 import asyncio
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.database import SessionLocal, StuckAlertState
 from app.services.sonarr_service import SonarrService
 from app.services.radarr_service import RadarrService
 from app.services.email_service import EmailService
@@ -14,8 +25,132 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# Track items we've already alerted about
-alerted_items = set()
+# How long an alert/fix suppresses another one for the same queue item.
+ALERT_TTL = timedelta(hours=24)
+ALERT_CACHE_SIZE = 4096
+ALERT_REASONS = ("stuck", "import_fix", "tba_fix")
+
+# Remediation calls in flight per instance, and how long to wait for a
+# RefreshSeries command to finish before rescanning anyway.
+REMEDIATION_CONCURRENCY = 4
+COMMAND_TIMEOUT_SECONDS = 60
+
+
+class StuckAlertStore:
+    """Persistent "already handled" set for queue items, with an LRU in front.
+
+    The cache maps (instance, queue_id, reason) to the row's expires_at, or
+    None when the table is known to hold no live row. This process is the
+    only writer, so cached entries stay authoritative and a steady-state
+    scan only queries for queue ids it hasn't seen before.
+    """
+
+    def __init__(self, ttl: timedelta = ALERT_TTL, max_cached: int = ALERT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[tuple[str, int, str], Optional[datetime]]" = OrderedDict()
+
+    def _remember(self, key: tuple[str, int, str], expires_at: Optional[datetime]) -> None:
+        self._cache[key] = expires_at
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def prefetch(self, instance: str, queue_ids: Iterable[Optional[int]]) -> None:
+        """Load state for every uncached item of a queue in one query."""
+        unknown = {
+            queue_id
+            for queue_id in queue_ids
+            if queue_id and any((instance, queue_id, reason) not in self._cache for reason in ALERT_REASONS)
+        }
+        if not unknown:
+            return
+        found: dict[tuple[str, int, str], datetime] = {}
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                StuckAlertState.queue_id, StuckAlertState.reason, StuckAlertState.expires_at
+            ).filter(
+                StuckAlertState.instance == instance,
+                StuckAlertState.queue_id.in_(unknown),
+                StuckAlertState.expires_at > datetime.utcnow(),
+            )
+            for queue_id, reason, expires_at in rows:
+                found[(instance, queue_id, reason)] = expires_at
+        except Exception as e:
+            logger.warning(f"Failed loading stuck alert state for {instance}: {e}")
+            return
+        finally:
+            db.close()
+        for queue_id in unknown:
+            for reason in ALERT_REASONS:
+                key = (instance, queue_id, reason)
+                self._remember(key, found.get(key))
+
+    def is_alerted(self, instance: str, queue_id: int, reason: str) -> bool:
+        key = (instance, queue_id, reason)
+        if key in self._cache:
+            expires_at = self._cache[key]
+            self._cache.move_to_end(key)
+        else:
+            db = SessionLocal()
+            try:
+                expires_at = db.query(StuckAlertState.expires_at).filter(
+                    StuckAlertState.instance == instance,
+                    StuckAlertState.queue_id == queue_id,
+                    StuckAlertState.reason == reason,
+                ).scalar()
+            except Exception as e:
+                logger.warning(f"Failed reading stuck alert state: {e}")
+                return False
+            finally:
+                db.close()
+            self._remember(key, expires_at)
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    def mark(self, instance: str, queue_id: int, reason: str) -> None:
+        now = datetime.utcnow()
+        expires_at = now + self.ttl
+        self._remember((instance, queue_id, reason), expires_at)
+        stmt = sqlite_insert(StuckAlertState).values(
+            instance=instance, queue_id=queue_id, reason=reason, alerted_at=now, expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["instance", "queue_id", "reason"],
+            set_={"alerted_at": now, "expires_at": expires_at},
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Still suppressed in memory for this process's lifetime.
+            logger.warning(f"Failed persisting stuck alert state: {e}")
+        finally:
+            db.close()
+
+    def compact(self) -> int:
+        """Delete expired rows and cache entries. Returns rows deleted."""
+        now = datetime.utcnow()
+        for key in [key for key, expires_at in self._cache.items() if expires_at is not None and expires_at <= now]:
+            self._cache[key] = None
+        db = SessionLocal()
+        try:
+            deleted = db.query(StuckAlertState).filter(
+                StuckAlertState.expires_at <= now
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed compacting stuck alert state: {e}")
+            return 0
+        finally:
+            db.close()
+
+
+alert_store = StuckAlertStore()
 
 
 def _is_import_failure(messages):
@@ -37,8 +172,98 @@ def _is_import_failure(messages):
     return False
 
 
+def _queue_messages(item):
+    """Flatten a queue record's statusMessages into a list of strings."""
+    messages = []
+    for msg in item.get('statusMessages', []):
+        if msg.get('messages'):
+            messages.extend(msg.get('messages'))
+    return messages
+
+
+def _stuck_entry(service, item, now):
+    """Alert entry for a queue record that looks stuck, else None.
+
+    Stuck means status warning/stalled/failed, or more than 4 hours in the
+    queue with a non-zero size.
+    """
+    added_str = item.get('added')
+    if not added_str:
+        return None
+    title = item.get('title', 'Unknown')
+    status = item.get('status', '').lower()
+    try:
+        added = datetime.fromisoformat(added_str.replace('Z', '+00:00'))
+        time_in_queue = (now - added.replace(tzinfo=None)).total_seconds() / 3600  # hours
+    except Exception as e:
+        logger.error(f"Error parsing {service} item time: {e}")
+        return None
+    is_stalled = status in ['warning', 'stalled', 'failed']
+    if not (is_stalled or (time_in_queue > 4 and item.get('size', 0) > 0)):
+        return None
+    logger.warning(f"Found stuck item in {service}: {title} ({status}, {time_in_queue:.1f}h in queue)")
+    return {
+        'service': service,
+        'title': title,
+        'status': status,
+        'time_in_queue': f"{time_in_queue:.1f} hours",
+        'messages': [msg.get('messages', []) for msg in item.get('statusMessages', []) if msg.get('messages')],
+        'protocol': item.get('protocol', 'Unknown'),
+        'download_client': item.get('downloadClient', 'Unknown')
+    }
+
+
+async def _gather_limited(coros, limit=REMEDIATION_CONCURRENCY):
+    """Run coroutines with at most `limit` in flight; exceptions are returned, not raised."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros), return_exceptions=True)
+
+
+async def _remove_and_blocklist(service, item_ids):
+    """Remove queue items from the client and blocklist their releases.
+
+    Returns the ids that were removed.
+    """
+    results = await _gather_limited(
+        service._delete(f"/queue/{item_id}", params={
+            "removeFromClient": "true",
+            "blocklist": "true"
+        })
+        for item_id in item_ids
+    )
+    removed = []
+    for item_id, result in zip(item_ids, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to auto-fix import failure for queue item {item_id}: {result}")
+        else:
+            removed.append(item_id)
+    return removed
+
+
+async def _refresh_and_rescan(sonarr, series_id):
+    """RefreshSeries, wait for it to finish, then RescanSeries."""
+    logger.info(f"Triggering Refresh & Scan for series ID {series_id}...")
+    command = await sonarr._post("/command", {"name": "RefreshSeries", "seriesId": series_id})
+    status = await sonarr.wait_for_command(command.get('id'), timeout=COMMAND_TIMEOUT_SECONDS)
+    if status != 'completed':
+        logger.warning(f"RefreshSeries for series ID {series_id} ended as {status}; rescanning anyway")
+    await sonarr._post("/command", {"name": "RescanSeries", "seriesId": series_id})
+    logger.info(f"✅ Refresh & Scan sent for series ID {series_id}")
+
+
 async def check_sonarr_queue(sonarr=None):
-    """Check Sonarr queue for stuck downloads and auto-fix TBA titles"""
+    """Check Sonarr queue for stuck downloads and auto-fix TBA titles and import failures.
+
+    The queue is classified first; remediation then runs batched: queue
+    removals concurrently, one SeriesSearch per affected series, one
+    Refresh & Scan per series with TBA titles, and series titles from a
+    single /series fetch.
+    """
     if sonarr is None:
         sonarr = SonarrService()
     
@@ -57,19 +282,27 @@ async def check_sonarr_queue(sonarr=None):
             return [], []
         
         now = datetime.utcnow()
+        alert_store.prefetch(instance, (item.get('id') for item in queue['records']))
+        
+        import_failures = []  # (item, messages)
+        tba_by_series = {}  # series_id -> [item, ...]
+        
+        def flag_if_stuck(item):
+            item_id = item.get('id')
+            # Only alert if we haven't already alerted for this item
+            if item_id and alert_store.is_alerted(instance, item_id, "stuck"):
+                return
+            entry = _stuck_entry('Sonarr', item, now)
+            if entry:
+                stuck_items.append(entry)
+                if item_id:
+                    alert_store.mark(instance, item_id, "stuck")
         
         for item in queue['records']:
             item_id = item.get('id')
             title = item.get('title', 'Unknown')
-            status = item.get('status', '').lower()
             series_id = item.get('seriesId')
-            
-            # Get status messages
-            status_messages = item.get('statusMessages', [])
-            messages = []
-            for msg in status_messages:
-                if msg.get('messages'):
-                    messages.extend(msg.get('messages'))
+            messages = _queue_messages(item)
             
             # Check for TBA title issue
             has_tba_issue = any('TBA' in msg or 'episode title' in msg.lower() for msg in messages)
@@ -77,130 +310,81 @@ async def check_sonarr_queue(sonarr=None):
             # Check for import failure using shared detection
             has_import_failure = _is_import_failure(messages)
             
-            if has_import_failure and item_id:
-                alert_key = f"sonarr_{item_id}_import_fix"
-                if alert_key not in alerted_items:
-                    logger.warning(f"🔧 Found import failure in Sonarr: {title}")
-                    
-                    try:
-                        # Remove from queue with blocklist and trigger new search
-                        await sonarr._delete(f"/queue/{item_id}", params={
-                            "removeFromClient": "true",
-                            "blocklist": "true"
-                        })
-                        logger.info(f"✅ Removed from queue and blocklisted: {title}")
-                        
-                        # Trigger new search if we have a series ID
-                        if series_id:
-                            await sonarr._post("/command", {"name": "SeriesSearch", "seriesId": series_id})
-                            logger.info(f"✅ Triggered new search for series ID {series_id}")
-                        
-                        # Get series name for the report
-                        series_title = title
-                        if series_id:
-                            try:
-                                series = await sonarr._get(f"/series/{series_id}")
-                                series_title = series.get('title', title)
-                            except Exception:
-                                pass
-                        
-                        fixed_items.append({
-                            'service': 'Sonarr',
-                            'series_title': series_title,
-                            'episode_title': title,
-                            'action': 'Blocklist & Re-search',
-                            'reason': 'Import failure — ' + (messages[0] if messages else 'No eligible files')
-                        })
-                        
-                        alerted_items.add(alert_key)
-                        logger.info(f"✅ Auto-fixed import failure for: {title}")
-                        continue
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to auto-fix import failure: {e}")
+            if has_import_failure and item_id and not alert_store.is_alerted(instance, item_id, "import_fix"):
+                logger.warning(f"🔧 Found import failure in Sonarr: {title}")
+                import_failures.append((item, messages))
+                continue
             
-            if has_tba_issue and series_id:
+            if has_tba_issue and series_id and not (item_id and alert_store.is_alerted(instance, item_id, "tba_fix")):
                 logger.warning(f"🔧 Found TBA title issue in Sonarr: {title}")
-                
-                try:
-                    # Trigger Series Refresh & Scan
-                    logger.info(f"Triggering Refresh & Scan for series ID {series_id}...")
-                    
-                    # Command to refresh series
-                    refresh_command = {
-                        "name": "RefreshSeries",
-                        "seriesId": series_id
-                    }
-                    await sonarr._post("/command", refresh_command)
-                    logger.info(f"✅ Refresh command sent for series ID {series_id}")
-                    
-                    # Wait a moment for refresh to start
-                    await asyncio.sleep(2)
-                    
-                    # Command to rescan series
-                    rescan_command = {
-                        "name": "RescanSeries",
-                        "seriesId": series_id
-                    }
-                    await sonarr._post("/command", rescan_command)
-                    logger.info(f"✅ Rescan command sent for series ID {series_id}")
-                    
-                    # Get series name
-                    series = await sonarr._get(f"/series/{series_id}")
-                    series_title = series.get('title', 'Unknown Series')
-                    
+                tba_by_series.setdefault(series_id, []).append(item)
+                continue
+            
+            flag_if_stuck(item)
+        
+        if not import_failures and not tba_by_series:
+            return stuck_items, fixed_items
+        
+        # One /series fetch names every fixed item
+        all_series = await sonarr.get_all_series() or []
+        series_titles = {series.get('id'): series.get('title') for series in all_series}
+        
+        if import_failures:
+            removed = set(await _remove_and_blocklist(sonarr, [item['id'] for item, _ in import_failures]))
+            # Trigger one new search per affected series
+            search_series = sorted({
+                item['seriesId'] for item, _ in import_failures
+                if item['id'] in removed and item.get('seriesId')
+            })
+            results = await _gather_limited(
+                sonarr._post("/command", {"name": "SeriesSearch", "seriesId": series_id})
+                for series_id in search_series
+            )
+            for series_id, result in zip(search_series, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to trigger search for series ID {series_id}: {result}")
+                else:
+                    logger.info(f"✅ Triggered new search for series ID {series_id}")
+            
+            for item, messages in import_failures:
+                if item['id'] not in removed:
+                    flag_if_stuck(item)
+                    continue
+                title = item.get('title', 'Unknown')
+                logger.info(f"✅ Removed from queue and blocklisted: {title}")
+                fixed_items.append({
+                    'service': 'Sonarr',
+                    'series_title': series_titles.get(item.get('seriesId')) or title,
+                    'episode_title': title,
+                    'action': 'Blocklist & Re-search',
+                    'reason': 'Import failure — ' + (messages[0] if messages else 'No eligible files')
+                })
+                alert_store.mark(instance, item['id'], "import_fix")
+        
+        if tba_by_series:
+            series_ids = list(tba_by_series)
+            results = await _gather_limited(_refresh_and_rescan(sonarr, series_id) for series_id in series_ids)
+            for series_id, result in zip(series_ids, results):
+                items = tba_by_series[series_id]
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to auto-fix TBA issue for series ID {series_id}: {result}")
+                    # Fall through to stuck_items since the fix failed
+                    for item in items:
+                        flag_if_stuck(item)
+                    continue
+                series_title = series_titles.get(series_id) or 'Unknown Series'
+                for item in items:
                     fixed_items.append({
                         'service': 'Sonarr',
                         'series_title': series_title,
-                        'episode_title': title,
+                        'episode_title': item.get('title', 'Unknown'),
                         'action': 'Refresh & Scan',
                         'reason': 'TBA title blocking import'
                     })
-                    
-                    # Mark as alerted so we don't keep trying
-                    alert_key = f"sonarr_{item_id}_tba_fixed"
-                    alerted_items.add(alert_key)
-                    
-                    logger.info(f"✅ Auto-fixed TBA issue for: {series_title} - {title}")
-                    
-                    # Don't add to stuck_items since we're fixing it
-                    continue
-                    
-                except Exception as e:
-                    logger.error(f"Failed to auto-fix TBA issue: {e}")
-                    # Fall through to stuck_items if fix failed
-            
-            # Check if stalled
-            is_stalled = status in ['warning', 'stalled', 'failed']
-            
-            # Check how long it's been in queue
-            added_str = item.get('added')
-            if added_str:
-                try:
-                    added = datetime.fromisoformat(added_str.replace('Z', '+00:00'))
-                    time_in_queue = (now - added.replace(tzinfo=None)).total_seconds() / 3600  # hours
-                    
-                    # Consider stuck if:
-                    # 1. Status is warning/stalled/failed, OR
-                    # 2. Been in queue for more than 4 hours with no progress
-                    if is_stalled or (time_in_queue > 4 and item.get('size', 0) > 0):
-                        # Only alert if we haven't already alerted for this item
-                        alert_key = f"sonarr_{item_id}"
-                        if alert_key not in alerted_items:
-                            stuck_items.append({
-                                'service': 'Sonarr',
-                                'title': title,
-                                'status': status,
-                                'time_in_queue': f"{time_in_queue:.1f} hours",
-                                'messages': messages,
-                                'protocol': item.get('protocol', 'Unknown'),
-                                'download_client': item.get('downloadClient', 'Unknown')
-                            })
-                            alerted_items.add(alert_key)
-                            logger.warning(f"Found stuck item in Sonarr: {title} ({status}, {time_in_queue:.1f}h in queue)")
-                
-                except Exception as e:
-                    logger.error(f"Error parsing Sonarr item time: {e}")
+                    # Mark as fixed so we don't keep trying
+                    if item.get('id'):
+                        alert_store.mark(instance, item['id'], "tba_fix")
+                logger.info(f"✅ Auto-fixed TBA issue for: {series_title} ({len(items)} item{'s' if len(items) != 1 else ''})")
         
         return stuck_items, fixed_items
         
@@ -210,10 +394,15 @@ async def check_sonarr_queue(sonarr=None):
 
 
 async def check_radarr_queue():
-    """Check Radarr queue for stuck downloads and auto-fix import failures"""
+    """Check Radarr queue for stuck downloads and auto-fix import failures.
+
+    Failed imports are removed concurrently and re-searched with a single
+    MoviesSearch covering every affected movie.
+    """
     logger.info("Checking Radarr queue for stuck downloads...")
     
     radarr = RadarrService()
+    instance = 'Radarr'
     stuck_items = []
     fixed_items = []
     
@@ -226,19 +415,25 @@ async def check_radarr_queue():
             return [], []
         
         now = datetime.utcnow()
+        alert_store.prefetch(instance, (item.get('id') for item in queue['records']))
+        
+        import_failures = []  # (item, reason_msg)
+        
+        def flag_if_stuck(item):
+            item_id = item.get('id')
+            # Only alert if we haven't already alerted for this item
+            if item_id and alert_store.is_alerted(instance, item_id, "stuck"):
+                return
+            entry = _stuck_entry('Radarr', item, now)
+            if entry:
+                stuck_items.append(entry)
+                if item_id:
+                    alert_store.mark(instance, item_id, "stuck")
         
         for item in queue['records']:
             item_id = item.get('id')
             title = item.get('title', 'Unknown')
-            status = item.get('status', '').lower()
-            movie_id = item.get('movieId')
-            
-            # Get status messages
-            status_messages = item.get('statusMessages', [])
-            messages = []
-            for msg in status_messages:
-                if msg.get('messages'):
-                    messages.extend(msg.get('messages'))
+            messages = _queue_messages(item)
             
             # Also check the trackedDownloadStatus and trackedDownloadState fields
             # Radarr uses these for "Downloaded - Unable to Import Automatically"
@@ -254,80 +449,51 @@ async def check_radarr_queue():
             # Check for import failure using shared detection
             has_import_failure = _is_import_failure(messages) or has_import_pending_warning
             
-            if has_import_failure and item_id:
-                alert_key = f"radarr_{item_id}_import_fix"
-                if alert_key not in alerted_items:
-                    reason_msg = messages[0] if messages else 'Unable to import automatically'
-                    logger.warning(f"🔧 Found import failure in Radarr: {title} — {reason_msg}")
-                    
-                    try:
-                        # Remove from queue with blocklist and trigger new search
-                        await radarr._delete(f"/queue/{item_id}", params={
-                            "removeFromClient": "true",
-                            "blocklist": "true"
-                        })
-                        logger.info(f"✅ Removed from queue and blocklisted: {title}")
-                        
-                        # Trigger new search if we have a movie ID
-                        if movie_id:
-                            await radarr._post("/command", {"name": "MoviesSearch", "movieIds": [movie_id]})
-                            logger.info(f"✅ Triggered new search for movie ID {movie_id}")
-                        
-                        # Get movie name for the report
-                        movie_title = title
-                        if movie_id:
-                            try:
-                                movie = await radarr._get(f"/movie/{movie_id}")
-                                movie_title = movie.get('title', title)
-                            except Exception:
-                                pass
-                        
-                        fixed_items.append({
-                            'service': 'Radarr',
-                            'series_title': movie_title,
-                            'episode_title': title,
-                            'action': 'Blocklist & Re-search',
-                            'reason': f'Import failure — {reason_msg}'
-                        })
-                        
-                        alerted_items.add(alert_key)
-                        logger.info(f"✅ Auto-fixed import failure for: {movie_title}")
-                        continue
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to auto-fix import failure: {e}")
-            
-            # Check if stalled
-            is_stalled = status in ['warning', 'stalled', 'failed']
+            if has_import_failure and item_id and not alert_store.is_alerted(instance, item_id, "import_fix"):
+                reason_msg = messages[0] if messages else 'Unable to import automatically'
+                logger.warning(f"🔧 Found import failure in Radarr: {title} — {reason_msg}")
+                import_failures.append((item, reason_msg))
+                continue
             
-            # Check how long it's been in queue
-            added_str = item.get('added')
-            if added_str:
-                try:
-                    added = datetime.fromisoformat(added_str.replace('Z', '+00:00'))
-                    time_in_queue = (now - added.replace(tzinfo=None)).total_seconds() / 3600  # hours
-                    
-                    # Consider stuck if:
-                    # 1. Status is warning/stalled/failed, OR
-                    # 2. Been in queue for more than 4 hours with no progress
-                    if is_stalled or (time_in_queue > 4 and item.get('size', 0) > 0):
-                        # Only alert if we haven't already alerted for this item
-                        alert_key = f"radarr_{item_id}"
-                        if alert_key not in alerted_items:
-                            stuck_items.append({
-                                'service': 'Radarr',
-                                'title': title,
-                                'status': status,
-                                'time_in_queue': f"{time_in_queue:.1f} hours",
-                                'messages': [msg.get('messages', []) for msg in status_messages if msg.get('messages')],
-                                'protocol': item.get('protocol', 'Unknown'),
-                                'download_client': item.get('downloadClient', 'Unknown')
-                            })
-                            alerted_items.add(alert_key)
-                            logger.warning(f"Found stuck item in Radarr: {title} ({status}, {time_in_queue:.1f}h in queue)")
-                
-                except Exception as e:
-                    logger.error(f"Error parsing Radarr item time: {e}")
+            flag_if_stuck(item)
+        
+        if not import_failures:
+            return stuck_items, fixed_items
+        
+        removed = set(await _remove_and_blocklist(radarr, [item['id'] for item, _ in import_failures]))
+        
+        # One search command covers every affected movie
+        movie_ids = sorted({
+            item['movieId'] for item, _ in import_failures
+            if item['id'] in removed and item.get('movieId')
+        })
+        if movie_ids:
+            try:
+                await radarr._post("/command", {"name": "MoviesSearch", "movieIds": movie_ids})
+                logger.info(f"✅ Triggered new search for movie IDs {movie_ids}")
+            except Exception as e:
+                logger.error(f"Failed to trigger search for movie IDs {movie_ids}: {e}")
+        
+        movie_titles = {}
+        if removed:
+            movie_titles = {movie.get('id'): movie.get('title') for movie in await radarr.get_movies()}
+        
+        for item, reason_msg in import_failures:
+            if item['id'] not in removed:
+                flag_if_stuck(item)
+                continue
+            title = item.get('title', 'Unknown')
+            movie_title = movie_titles.get(item.get('movieId')) or title
+            logger.info(f"✅ Removed from queue and blocklisted: {title}")
+            fixed_items.append({
+                'service': 'Radarr',
+                'series_title': movie_title,
+                'episode_title': title,
+                'action': 'Blocklist & Re-search',
+                'reason': f'Import failure — {reason_msg}'
+            })
+            alert_store.mark(instance, item['id'], "import_fix")
+            logger.info(f"✅ Auto-fixed import failure for: {movie_title}")
         
         return stuck_items, fixed_items
         
@@ -431,19 +597,15 @@ async def check_and_alert_stuck_downloads():
     )
     
     try:
-        # Check all Sonarr instances (primary + anime if configured)
+        # Scan all Sonarr instances (primary + anime if configured) and
+        # Radarr concurrently; each check handles its own errors
         from app.services.sonarr_service import get_all_sonarr_instances
-        sonarr_stuck = []
-        sonarr_fixed = []
-        for sonarr_instance in get_all_sonarr_instances():
-            s, f = await check_sonarr_queue(sonarr_instance)
-            sonarr_stuck.extend(s)
-            sonarr_fixed.extend(f)
-        
-        radarr_stuck, radarr_fixed = await check_radarr_queue()
-        
-        all_stuck = sonarr_stuck + radarr_stuck
-        all_fixed = sonarr_fixed + radarr_fixed
+        results = await asyncio.gather(
+            *(check_sonarr_queue(sonarr_instance) for sonarr_instance in get_all_sonarr_instances()),
+            check_radarr_queue(),
+        )
+        all_stuck = [item for stuck, _ in results for item in stuck]
+        all_fixed = [item for _, fixed in results for item in fixed]
         
         email_service = EmailService()
         admin_email = settings.admin_email or settings.smtp_from
@@ -562,27 +724,22 @@ def generate_auto_fix_email(fixed_items):
 
 async def stuck_download_monitor():
     """Background worker that checks for stuck downloads every 30 minutes"""
-    from app.background.utils import is_maintenance_active
+    from app.background.utils import is_maintenance_active, wait_for_maintenance_end
     
     logger.info("⚠️ Stuck download monitor started - will check every 30 minutes")
     
-    # Clear alerted items every 24 hours so we can re-alert
-    last_clear = datetime.utcnow()
-    
     while True:
         try:
             if is_maintenance_active():
-                logger.info("🔧 Maintenance active — skipping stuck download check")
-            else:
-                # Check for stuck downloads
-                await check_and_alert_stuck_downloads()
+                logger.info("🔧 Maintenance active — stuck download check waits for it to end")
+                await wait_for_maintenance_end()
+            # Check for stuck downloads
+            await check_and_alert_stuck_downloads()
             
-            # Clear alert cache every 24 hours
-            now = datetime.utcnow()
-            if (now - last_clear).total_seconds() > 86400:  # 24 hours
-                logger.info("Clearing alert cache (24h reset)")
-                alerted_items.clear()
-                last_clear = now
+            # Drop expired alert state so items can be re-alerted after ALERT_TTL
+            removed = alert_store.compact()
+            if removed:
+                logger.info(f"Expired {removed} stuck alert entries")
             
         except Exception as e:
             logger.error(f"Stuck download monitor error: {e}")
@@ -1,7 +1,10 @@
 """System and integration health checks.
 
 This module keeps the latest service reachability and worker run state in the
-database so the admin dashboard can show health without scraping logs. All DB
+database so the admin dashboard can show health without scraping logs. Worker
+run state is buffered in memory and flushed periodically (see below). Every
+check also updates per-minute and per-hour rollups, which the snapshot and
+history endpoints read instead of raw events. All DB
 sessions opened here are explicitly closed because these helpers run outside
 FastAPI request dependency cleanup.
 """
@@ -9,23 +12,30 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Any
 
 import aiosmtplib
 import httpx
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.config import normalize_smtp_security, settings
 from app.database import (
     ServiceHealthEvent,
+    ServiceHealthRollup,
     ServiceHealthStatus,
     SessionLocal,
     WorkerHealthStatus,
 )
+from app.histogram import LatencyHistogram, merge_histograms
+from app.metrics import begin_worker_query_stats, end_worker_query_stats
 from app.security import clean_email_address, html_escape, normalize_http_url
 from app.services.email_service import EmailService
 from app.services.pushover_service import PushoverService
+from app.services.upstream_metrics import get_upstream_metrics
 
 
 logger = logging.getLogger(__name__)
@@ -360,12 +370,113 @@ async def _send_alert_channels(kind: str, row_data: dict[str, Any]) -> None:
         await _send_webhook_alert(kind, row_data)
 
 
+# ---------------------------------------------------------------------------
+# Health check rollups
+#
+# Each check increments one minute bucket and one hour bucket per service.
+# Minute buckets back short history views and are pruned after a couple of
+# days; hour buckets back the 24h uptime/latency figures and longer history.
+# Both are independent of service_health_history_days, which now only bounds
+# the raw event log.
+# ---------------------------------------------------------------------------
+
+ROLLUP_RESOLUTIONS = ("minute", "hour")
+ROLLUP_RETENTION = {"minute": timedelta(days=2), "hour": timedelta(days=90)}
+
+
+def _bucket_start(moment: datetime, resolution: str) -> datetime:
+    if resolution == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+def _record_rollups(
+    db,
+    now: datetime,
+    checked: list[tuple[str, bool, str, int | None]],
+) -> None:
+    """Fold one round of check results into the minute and hour rollups."""
+    if not checked:
+        return
+    buckets = {resolution: _bucket_start(now, resolution) for resolution in ROLLUP_RESOLUTIONS}
+    existing = {
+        (row.service_key, row.resolution): row
+        for row in db.query(ServiceHealthRollup).filter(
+            ServiceHealthRollup.service_key.in_({key for key, *_ in checked}),
+            ServiceHealthRollup.bucket_start.in_(set(buckets.values())),
+        )
+        if row.bucket_start == buckets[row.resolution]
+    }
+    for service_key, configured, status, latency_ms in checked:
+        if not configured:
+            continue
+        for resolution, bucket_start in buckets.items():
+            rollup = existing.get((service_key, resolution))
+            if rollup is None:
+                rollup = ServiceHealthRollup(
+                    service_key=service_key,
+                    resolution=resolution,
+                    bucket_start=bucket_start,
+                    checks=0,
+                    ok_count=0,
+                    failure_count=0,
+                    latency_count=0,
+                    latency_sum_ms=0,
+                )
+                db.add(rollup)
+                existing[(service_key, resolution)] = rollup
+            rollup.checks += 1
+            if status == "ok":
+                rollup.ok_count += 1
+            elif status in {"degraded", "down"}:
+                rollup.failure_count += 1
+            if latency_ms is not None:
+                histogram = LatencyHistogram.loads(rollup.latency_histogram)
+                histogram.record(latency_ms)
+                rollup.latency_histogram = histogram.dumps()
+                rollup.latency_count += 1
+                rollup.latency_sum_ms += int(latency_ms)
+                rollup.latency_max_ms = max(rollup.latency_max_ms or 0, int(latency_ms))
+
+    for resolution, retention in ROLLUP_RETENTION.items():
+        db.query(ServiceHealthRollup).filter(
+            ServiceHealthRollup.resolution == resolution,
+            ServiceHealthRollup.bucket_start < now - retention,
+        ).delete(synchronize_session=False)
+
+
+def _rollup_histogram(row: ServiceHealthRollup) -> LatencyHistogram:
+    return LatencyHistogram.loads(
+        row.latency_histogram,
+        count=None,
+        total_ms=row.latency_sum_ms,
+        max_ms=row.latency_max_ms,
+    )
+
+
+def _rollup_metrics(rows: list[ServiceHealthRollup]) -> dict[str, Any]:
+    """Combine rollup rows for one service into uptime and latency figures."""
+    checks = sum(row.checks or 0 for row in rows)
+    ok = sum(row.ok_count or 0 for row in rows)
+    latency = merge_histograms(_rollup_histogram(row) for row in rows)
+    return {
+        "checks": checks,
+        "ok": ok,
+        "failures": sum(row.failure_count or 0 for row in rows),
+        "uptime": round((ok / checks) * 100, 1) if checks else None,
+        "latency_p50_ms": latency.percentile(50),
+        "latency_p95_ms": latency.percentile(95),
+        "latency_max_ms": max((row.latency_max_ms or 0 for row in rows), default=None) or None,
+    }
+
+
 def _upsert_results(results: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     now = _utcnow()
     failure_threshold = max(1, int(settings.service_health_failure_threshold or 1))
     cooldown = timedelta(minutes=max(1, int(settings.service_health_alert_cooldown_minutes or 1)))
     outage_alerts: list[dict[str, Any]] = []
     recovery_alerts: list[dict[str, Any]] = []
+    checked: list[tuple[str, bool, str, int | None]] = []
 
     db = SessionLocal()
     try:
@@ -413,6 +524,7 @@ def _upsert_results(results: list[dict[str, Any]]) -> tuple[list[dict[str, Any]]
                     row.last_alert_at = now
                     outage_alerts.append(_service_to_dict(row))
 
+            checked.append((row.service_key, row.configured, row.status, row.latency_ms))
             db.add(
                 ServiceHealthEvent(
                     service_key=row.service_key,
@@ -435,6 +547,9 @@ def _upsert_results(results: list[dict[str, Any]]) -> tuple[list[dict[str, Any]]
                     row.status,
                 )
 
+        _record_rollups(db, now, checked)
+
+        # Raw events are only kept for incident review; dashboards read rollups.
         history_days = max(1, int(settings.service_health_history_days or 14))
         db.query(ServiceHealthEvent).filter(
             ServiceHealthEvent.checked_at < now - timedelta(days=history_days)
@@ -477,34 +592,31 @@ def get_system_health_snapshot() -> dict[str, Any]:
             .order_by(ServiceHealthStatus.service_name.asc())
             .all()
         )
-        workers = (
-            db.query(WorkerHealthStatus)
-            .order_by(WorkerHealthStatus.worker_name.asc())
-            .all()
-        )
-        since = _utcnow() - timedelta(hours=24)
+        # Last 24 hourly buckets (the current, partial hour included).
+        since = _bucket_start(_utcnow(), "hour") - timedelta(hours=23)
+        rollups_by_service: dict[str, list[ServiceHealthRollup]] = {}
+        for rollup in db.query(ServiceHealthRollup).filter(
+            ServiceHealthRollup.resolution == "hour",
+            ServiceHealthRollup.bucket_start >= since,
+        ):
+            rollups_by_service.setdefault(rollup.service_key, []).append(rollup)
+        metrics: dict[str, dict[str, Any]] = {}
+        for service_key, rows in rollups_by_service.items():
+            combined = _rollup_metrics(rows)
+            metrics[service_key] = {
+                "checks_24h": combined["checks"],
+                "ok_24h": combined["ok"],
+                "failures_24h": combined["failures"],
+                "uptime_24h": combined["uptime"],
+                "latency_p50_24h": combined["latency_p50_ms"],
+                "latency_p95_24h": combined["latency_p95_ms"],
+            }
         recent_events = (
             db.query(ServiceHealthEvent)
-            .filter(ServiceHealthEvent.checked_at >= since)
             .order_by(ServiceHealthEvent.checked_at.desc())
+            .limit(50)
             .all()
         )
-        metrics: dict[str, dict[str, Any]] = {}
-        for event in recent_events:
-            bucket = metrics.setdefault(
-                event.service_key,
-                {"checks_24h": 0, "ok_24h": 0, "failures_24h": 0, "uptime_24h": None},
-            )
-            if not event.configured:
-                continue
-            bucket["checks_24h"] += 1
-            if event.status == "ok":
-                bucket["ok_24h"] += 1
-            elif event.status in {"degraded", "down"}:
-                bucket["failures_24h"] += 1
-        for bucket in metrics.values():
-            checks = bucket["checks_24h"]
-            bucket["uptime_24h"] = round((bucket["ok_24h"] / checks) * 100, 1) if checks else None
 
         unhealthy = sum(
             1 for service in services
@@ -518,12 +630,15 @@ def get_system_health_snapshot() -> dict[str, Any]:
                 "ok_24h": 0,
                 "failures_24h": 0,
                 "uptime_24h": None,
+                "latency_p50_24h": None,
+                "latency_p95_24h": None,
             }))
             service_rows.append(service_data)
         return {
             "services": service_rows,
-            "workers": [_worker_to_dict(row) for row in workers],
-            "history": [_event_to_dict(row) for row in recent_events[:50]],
+            "workers": get_worker_health(),
+            "upstream": get_upstream_metrics(),
+            "history": [_event_to_dict(row) for row in recent_events],
             "unhealthy_services": unhealthy,
             "settings": {
                 "enabled": settings.service_health_enabled,
@@ -542,9 +657,15 @@ def get_system_health_snapshot() -> dict[str, Any]:
 
 
 def get_service_health_history(hours: int = 24, limit: int = 200) -> dict[str, Any]:
+    """Recent raw events plus per-service rollup buckets for the window.
+
+    Windows up to six hours use minute buckets; longer ones use hour buckets.
+    """
     hours = max(1, min(int(hours or 24), 24 * 30))
     limit = max(1, min(int(limit or 200), 1000))
-    since = _utcnow() - timedelta(hours=hours)
+    now = _utcnow()
+    resolution = "minute" if hours <= 6 else "hour"
+    since = now - timedelta(hours=hours)
     db = SessionLocal()
     try:
         events = (
@@ -554,8 +675,30 @@ def get_service_health_history(hours: int = 24, limit: int = 200) -> dict[str, A
             .limit(limit)
             .all()
         )
+        rollups = (
+            db.query(ServiceHealthRollup)
+            .filter(
+                ServiceHealthRollup.resolution == resolution,
+                ServiceHealthRollup.bucket_start >= _bucket_start(since, resolution),
+            )
+            .order_by(ServiceHealthRollup.service_key.asc(), ServiceHealthRollup.bucket_start.asc())
+            .all()
+        )
+        services: dict[str, dict[str, Any]] = {}
+        for rollup in rollups:
+            service = services.setdefault(
+                rollup.service_key, {"service_key": rollup.service_key, "buckets": [], "_rows": []}
+            )
+            service["_rows"].append(rollup)
+            bucket = _rollup_metrics([rollup])
+            bucket["bucket_start"] = rollup.bucket_start.isoformat()
+            service["buckets"].append(bucket)
+        for service in services.values():
+            service["summary"] = _rollup_metrics(service.pop("_rows"))
         return {
             "events": [_event_to_dict(row) for row in events],
+            "services": list(services.values()),
+            "resolution": resolution,
             "hours": hours,
             "limit": limit,
         }
@@ -563,31 +706,164 @@ def get_service_health_history(hours: int = 24, limit: int = 200) -> dict[str, A
         db.close()
 
 
-def record_worker_started(worker_key: str, worker_name: str, next_run_at: datetime | None = None) -> datetime:
-    started_at = _utcnow()
+# ---------------------------------------------------------------------------
+# Worker heartbeats
+#
+# Every worker reports start/success/failure several times per cycle. Writing
+# each report straight to SQLite meant a session + SELECT + COMMIT per call,
+# all competing with webhooks for the write lock. Reports now update an
+# in-memory registry (seeded from the table on first use so run/failure
+# counts stay cumulative across restarts); the dashboard reads the registry
+# directly and worker_health_flusher() persists dirty rows periodically in a
+# single multi-row upsert.
+# ---------------------------------------------------------------------------
+
+WORKER_HEALTH_FLUSH_SECONDS = 30
+
+_WORKER_COLUMNS = (
+    "worker_name",
+    "status",
+    "last_started_at",
+    "last_finished_at",
+    "last_success_at",
+    "next_run_at",
+    "last_duration_ms",
+    "run_count",
+    "failure_count",
+    "last_error",
+    "updated_at",
+)
+
+_worker_registry: dict[str, dict[str, Any]] = {}
+_dirty_workers: set[str] = set()
+_worker_registry_loaded = False
+_worker_registry_lock = threading.Lock()
+
+
+def _ensure_worker_registry_loaded() -> None:
+    global _worker_registry_loaded
+    if _worker_registry_loaded:
+        return
+    db = SessionLocal()
+    try:
+        rows = db.query(WorkerHealthStatus).all()
+    except Exception:
+        logger.debug("failed loading worker health rows", exc_info=True)
+        return
+    finally:
+        db.close()
+    with _worker_registry_lock:
+        if _worker_registry_loaded:
+            return
+        for row in rows:
+            _worker_registry.setdefault(
+                row.worker_key,
+                {"worker_key": row.worker_key, **{col: getattr(row, col) for col in _WORKER_COLUMNS}},
+            )
+        _worker_registry_loaded = True
+
+
+def _update_worker(worker_key: str, worker_name: str, **changes: Any) -> None:
+    _ensure_worker_registry_loaded()
+    with _worker_registry_lock:
+        entry = _worker_registry.get(worker_key)
+        if entry is None:
+            entry = {"worker_key": worker_key, **{col: None for col in _WORKER_COLUMNS}}
+            entry.update(run_count=0, failure_count=0)
+            _worker_registry[worker_key] = entry
+        entry["worker_name"] = worker_name
+        if changes.pop("increment_run", False):
+            changes["run_count"] = int(entry["run_count"] or 0) + 1
+        if changes.pop("increment_failure", False):
+            changes["failure_count"] = int(entry["failure_count"] or 0) + 1
+        entry.update(changes)
+        _dirty_workers.add(worker_key)
+
+
+def get_worker_health() -> list[dict[str, Any]]:
+    """Live worker status from memory, ordered like the dashboard expects."""
+    _ensure_worker_registry_loaded()
+    with _worker_registry_lock:
+        entries = [dict(entry) for entry in _worker_registry.values()]
+    entries.sort(key=lambda entry: entry["worker_name"] or "")
+    return [_worker_to_dict(SimpleNamespace(**entry)) for entry in entries]
+
+
+def _take_dirty_workers() -> list[dict]:
+    with _worker_registry_lock:
+        rows = [dict(_worker_registry[key]) for key in _dirty_workers]
+        _dirty_workers.clear()
+    return rows
+
+
+def _restore_dirty_workers(rows: list[dict]) -> None:
+    with _worker_registry_lock:
+        # Retry on the next flush rather than losing the update.
+        _dirty_workers.update(row["worker_key"] for row in rows)
+
+
+def _write_worker_rows(db, rows: list[dict]) -> int:
+    stmt = sqlite_insert(WorkerHealthStatus).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["worker_key"],
+        set_={col: getattr(stmt.excluded, col) for col in _WORKER_COLUMNS},
+    )
+    db.execute(stmt)
+    return len(rows)
+
+
+def flush_worker_health() -> int:
+    """Persist dirty worker rows in one INSERT ... ON CONFLICT upsert."""
+    rows = _take_dirty_workers()
+    if not rows:
+        return 0
     db = SessionLocal()
     try:
-        row = db.query(WorkerHealthStatus).filter(
-            WorkerHealthStatus.worker_key == worker_key
-        ).first()
-        if not row:
-            row = WorkerHealthStatus(worker_key=worker_key, worker_name=worker_name)
-            db.add(row)
-        row.worker_name = worker_name
-        row.status = "running"
-        row.last_started_at = started_at
-        row.next_run_at = next_run_at
-        row.updated_at = started_at
+        written = _write_worker_rows(db, rows)
         db.commit()
-        return started_at
+        return written
     except Exception:
         db.rollback()
-        logger.debug("failed recording worker start for %s", worker_key, exc_info=True)
-        return started_at
+        _restore_dirty_workers(rows)
+        logger.debug("failed flushing worker health", exc_info=True)
+        return 0
     finally:
         db.close()
 
 
+async def worker_health_flusher() -> None:
+    """Periodically persist worker heartbeats; flushes once more on shutdown."""
+    from app.db_writer import run_write
+
+    try:
+        while True:
+            await asyncio.sleep(WORKER_HEALTH_FLUSH_SECONDS)
+            rows = _take_dirty_workers()
+            if not rows:
+                continue
+            try:
+                await run_write(lambda db: _write_worker_rows(db, rows), "worker_health")
+            except Exception:
+                _restore_dirty_workers(rows)
+                logger.debug("failed flushing worker health", exc_info=True)
+    finally:
+        flush_worker_health()
+
+
+def record_worker_started(worker_key: str, worker_name: str, next_run_at: datetime | None = None) -> datetime:
+    started_at = _utcnow()
+    begin_worker_query_stats(worker_key)
+    _update_worker(
+        worker_key,
+        worker_name,
+        status="running",
+        last_started_at=started_at,
+        next_run_at=next_run_at,
+        updated_at=started_at,
+    )
+    return started_at
+
+
 def record_worker_success(
     worker_key: str,
     worker_name: str,
@@ -598,29 +874,19 @@ def record_worker_success(
     duration_ms = None
     if started_at:
         duration_ms = max(0, int((now - started_at).total_seconds() * 1000))
-    db = SessionLocal()
-    try:
-        row = db.query(WorkerHealthStatus).filter(
-            WorkerHealthStatus.worker_key == worker_key
-        ).first()
-        if not row:
-            row = WorkerHealthStatus(worker_key=worker_key, worker_name=worker_name)
-            db.add(row)
-        row.worker_name = worker_name
-        row.status = "ok"
-        row.last_finished_at = now
-        row.last_success_at = now
-        row.next_run_at = next_run_at
-        row.last_duration_ms = duration_ms
-        row.run_count = int(row.run_count or 0) + 1
-        row.last_error = None
-        row.updated_at = now
-        db.commit()
-    except Exception:
-        db.rollback()
-        logger.debug("failed recording worker success for %s", worker_key, exc_info=True)
-    finally:
-        db.close()
+    end_worker_query_stats(worker_key)
+    _update_worker(
+        worker_key,
+        worker_name,
+        status="ok",
+        last_finished_at=now,
+        last_success_at=now,
+        next_run_at=next_run_at,
+        last_duration_ms=duration_ms,
+        increment_run=True,
+        last_error=None,
+        updated_at=now,
+    )
 
 
 def record_worker_failure(
@@ -634,28 +900,18 @@ def record_worker_failure(
     duration_ms = None
     if started_at:
         duration_ms = max(0, int((now - started_at).total_seconds() * 1000))
-    db = SessionLocal()
-    try:
-        row = db.query(WorkerHealthStatus).filter(
-            WorkerHealthStatus.worker_key == worker_key
-        ).first()
-        if not row:
-            row = WorkerHealthStatus(worker_key=worker_key, worker_name=worker_name)
-            db.add(row)
-        row.worker_name = worker_name
-        row.status = "error"
-        row.last_finished_at = now
-        row.next_run_at = next_run_at
-        row.last_duration_ms = duration_ms
-        row.failure_count = int(row.failure_count or 0) + 1
-        row.last_error = _trim_error(error)
-        row.updated_at = now
-        db.commit()
-    except Exception:
-        db.rollback()
-        logger.debug("failed recording worker failure for %s", worker_key, exc_info=True)
-    finally:
-        db.close()
+    end_worker_query_stats(worker_key)
+    _update_worker(
+        worker_key,
+        worker_name,
+        status="error",
+        last_finished_at=now,
+        next_run_at=next_run_at,
+        last_duration_ms=duration_ms,
+        increment_failure=True,
+        last_error=_trim_error(error),
+        updated_at=now,
+    )
 
 
 async def system_health_worker() -> None:
@@ -1,33 +1,85 @@
 """
 Shared utilities for background workers.
+
+Maintenance state is held in memory. It is loaded from `maintenance_windows`
+once, then refreshed by the maintenance window worker (which owns the
+scheduled -> active -> completed transitions) and by the admin endpoints that
+create, edit, complete, cancel or delete windows. Worker cycles therefore
+check a module-level flag instead of opening a session every time, and
+wait_for_maintenance_end() lets them park during a window and resume the
+moment it ends.
 """
 
+import asyncio
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+_state = {"loaded": False, "active": False, "window_id": None, "title": None}
+_maintenance_clear = asyncio.Event()
+_maintenance_clear.set()
 
-def is_maintenance_active() -> bool:
-    """Check if there is an active maintenance window. 
-    Background workers should skip their cycle when maintenance is active
-    to avoid noisy errors from unavailable services.
-    
-    Returns True if a maintenance window is currently active, False otherwise.
+
+def _apply_state(active: bool, window_id: Optional[int], title: Optional[str]) -> None:
+    was_active = _state["active"] if _state["loaded"] else None
+    _state.update(loaded=True, active=active, window_id=window_id, title=title)
+    if active:
+        _maintenance_clear.clear()
+    else:
+        _maintenance_clear.set()
+
+    if was_active is None or was_active == active:
+        return
+    if active:
+        logger.info(f"Maintenance window '{title}' started — pausing background workers")
+    else:
+        logger.info("Maintenance ended — resuming background workers")
+
+
+def refresh_maintenance_state(db=None) -> bool:
+    """Reload maintenance state from the database and wake waiters when it ends.
+
+    Pass a session to reuse it (the caller keeps ownership); otherwise a
+    short-lived one is opened. Returns the new active flag.
     """
+    from app.database import SessionLocal, MaintenanceWindow
+
+    session = db or SessionLocal()
     try:
-        from app.database import get_db, MaintenanceWindow
-        db = next(get_db())
-        try:
-            window = db.query(MaintenanceWindow).filter(
-                MaintenanceWindow.status == "active",
-                MaintenanceWindow.cancelled == False
-            ).first()
-            if window:
-                logger.debug(f"Maintenance window active: '{window.title}' — skipping worker cycle")
-                return True
-            return False
-        finally:
-            db.close()
+        window = session.query(MaintenanceWindow).filter(
+            MaintenanceWindow.status == "active",
+            MaintenanceWindow.cancelled == False
+        ).first()
+        if window:
+            _apply_state(True, window.id, window.title)
+        else:
+            _apply_state(False, None, None)
     except Exception as e:
-        logger.debug(f"Could not check maintenance status: {e}")
-        return False  # If we can't check, assume no maintenance (don't block workers)
+        logger.debug(f"Could not refresh maintenance status: {e}")
+    finally:
+        if db is None:
+            session.close()
+    return bool(_state["active"])
+
+
+def is_maintenance_active() -> bool:
+    """Check if there is an active maintenance window.
+    Background workers should hold their cycle (wait_for_maintenance_end())
+    while maintenance is active to avoid noisy errors from unavailable services.
+
+    Returns True if a maintenance window is currently active, False otherwise.
+    If the state can't be loaded, assume no maintenance (don't block workers).
+    """
+    if not _state["loaded"]:
+        refresh_maintenance_state()
+    if _state["active"]:
+        logger.debug(f"Maintenance window active: '{_state['title']}' — holding worker cycle")
+    return bool(_state["active"])
+
+
+async def wait_for_maintenance_end() -> None:
+    """Return as soon as no maintenance window is active."""
+    if not is_maintenance_active():
+        return
+    await _maintenance_clear.wait()
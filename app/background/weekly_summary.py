@@ -15,54 +15,89 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Recent notifications listed per user in the summary email.
+SUMMARY_RECENT_PER_USER = 10
+
 
 async def generate_weekly_summary(db: Session):
-    """Generate weekly summary of notifications sent"""
+    """Generate weekly summary of notifications sent
+
+    Per-user counts come from one GROUP BY over (user_id, notification_type)
+    and the recent-notification lists from a ROW_NUMBER() window capped at
+    SUMMARY_RECENT_PER_USER rows per user, selecting only the columns the
+    email shows -- memory stays flat however many notifications went out.
+    """
     logger.info("Generating weekly summary...")
     
     # Get date range (last 7 days)
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=7)
-    
-    # Get all sent notifications in the last week
-    sent_notifications = db.query(Notification).filter(
+    in_window = (
         Notification.sent == True,
         Notification.sent_at >= start_date,
-        Notification.sent_at <= end_date
-    ).order_by(Notification.sent_at.desc()).all()
+        Notification.sent_at <= end_date,
+    )
+    
+    # Count sent notifications per user and type
+    counts = db.query(
+        Notification.user_id,
+        Notification.notification_type,
+        func.count(Notification.id),
+    ).filter(*in_window).group_by(Notification.user_id, Notification.notification_type).all()
     
-    if not sent_notifications:
+    if not counts:
         logger.info("No notifications sent this week")
         return None
     
-    # Group by user
-    user_stats = {}
-    for notif in sent_notifications:
-        user_email = notif.user.email
-        if user_email not in user_stats:
-            user_stats[user_email] = {
-                'email': user_email,
-                'username': notif.user.username,
-                'total': 0,
-                'episodes': 0,
-                'movies': 0,
-                'notifications': []
-            }
-        
-        user_stats[user_email]['total'] += 1
-        if notif.notification_type == 'episode':
-            user_stats[user_email]['episodes'] += 1
-        elif notif.notification_type == 'movie':
-            user_stats[user_email]['movies'] += 1
-        
-        user_stats[user_email]['notifications'].append({
-            'subject': notif.subject,
-            'type': notif.notification_type,
-            'sent_at': notif.sent_at
-        })
+    user_ids = {user_id for user_id, _, _ in counts if user_id is not None}
+    user_stats = {
+        user_id: {
+            'email': email,
+            'username': username,
+            'total': 0,
+            'episodes': 0,
+            'movies': 0,
+            'notifications': []
+        }
+        for user_id, email, username in db.query(User.id, User.email, User.username).filter(User.id.in_(user_ids))
+    }
+    
+    total_count = 0
+    for user_id, notification_type, count in counts:
+        stats = user_stats.get(user_id)
+        if stats is None:
+            continue
+        total_count += count
+        stats['total'] += count
+        if notification_type == 'episode':
+            stats['episodes'] += count
+        elif notification_type == 'movie':
+            stats['movies'] += count
+    
+    # Most recent few per user
+    ranked = db.query(
+        Notification.user_id,
+        Notification.subject,
+        Notification.notification_type,
+        Notification.sent_at,
+        func.row_number().over(
+            partition_by=Notification.user_id,
+            order_by=(Notification.sent_at.desc(), Notification.id.desc()),
+        ).label('rank'),
+    ).filter(*in_window).subquery()
+    recent = db.query(
+        ranked.c.user_id, ranked.c.subject, ranked.c.notification_type, ranked.c.sent_at
+    ).filter(ranked.c.rank <= SUMMARY_RECENT_PER_USER).order_by(ranked.c.user_id, ranked.c.rank)
+    for user_id, subject, notification_type, sent_at in recent:
+        if user_id in user_stats:
+            user_stats[user_id]['notifications'].append({
+                'subject': subject,
+                'type': notification_type,
+                'sent_at': sent_at
+            })
     
     # Generate HTML summary
-    html = generate_summary_html(user_stats, start_date, end_date, len(sent_notifications))
+    html = generate_summary_html(user_stats, start_date, end_date, total_count)
     
     return html
 
@@ -79,12 +114,12 @@ def generate_summary_html(user_stats, start_date, end_date, total_count):
         email = html_escape(user["email"])
         # Generate notification list
         notif_list = '<ul style="margin: 5px 0; padding-left: 20px; font-size: 13px; color: #666;">'
-        for notif in user['notifications'][:10]:  # Show first 10
+        for notif in user['notifications']:  # Most recent SUMMARY_RECENT_PER_USER
             icon = '📺' if notif['type'] == 'episode' else '🎬'
             notif_list += f'<li>{icon} {html_escape(notif["subject"])}</li>'
         
-        if len(user['notifications']) > 10:
-            notif_list += f'<li style="color: #999;">... and {len(user["notifications"]) - 10} more</li>'
+        if user['total'] > len(user['notifications']):
+            notif_list += f'<li style="color: #999;">... and {user["total"] - len(user["notifications"])} more</li>'
         notif_list += '</ul>'
         
         user_rows.append(f'''
@@ -264,7 +299,7 @@ async def send_weekly_summary():
 
 async def weekly_summary_worker():
     """Background worker that sends weekly summary every Sunday at 9 AM"""
-    from app.background.utils import is_maintenance_active
+    from app.background.utils import is_maintenance_active, wait_for_maintenance_end
     
     logger.info("📊 Weekly summary worker started - will run every Sunday at 9 AM UTC")
     
@@ -289,10 +324,10 @@ async def weekly_summary_worker():
             # Sleep until next Sunday
             await asyncio.sleep(sleep_seconds)
             
-            # Check maintenance before sending
+            # Hold the summary until any maintenance window is over
             if is_maintenance_active():
-                logger.info("🔧 Maintenance active — skipping weekly summary")
-                continue
+                logger.info("🔧 Maintenance active — weekly summary waits for it to end")
+                await wait_for_maintenance_end()
             
             # Send summary
             await send_weekly_summary()
@@ -72,6 +72,18 @@ class Settings(BaseSettings):
     # ----- Storage -----
     data_dir: str = str(DATA_DIR)
     sqlite_filename: str = "bingealert.db"
+    # SQLite tuning profile: safe | balanced | performance (see
+    # app.database.SQLITE_PROFILES; compare them with scripts/bench_storage.py).
+    # The individual values below override the profile when set.
+    sqlite_profile: str = "balanced"
+    sqlite_cache_size_kib: Optional[int] = None
+    sqlite_mmap_size_mb: Optional[int] = None
+    sqlite_busy_timeout_ms: Optional[int] = None
+    sqlite_wal_autocheckpoint_pages: Optional[int] = None
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    # How often ops maintenance runs PRAGMA optimize (refreshes planner stats).
+    sqlite_optimize_interval_hours: int = 24
 
     # ----- Integrations -----
     jellyseerr_url: Optional[str] = None
@@ -105,6 +117,9 @@ class Settings(BaseSettings):
     notification_extension_delay_minutes: int = 3
     notification_max_wait_minutes: int = 20
     notification_check_frequency_seconds: int = 60
+    # Sonarr fires one Download webhook per imported file; episodes of one
+    # series arriving within this many seconds are processed as one batch.
+    webhook_download_debounce_seconds: int = 5
 
     quality_monitor_enabled: bool = True
     quality_monitor_interval_hours: int = 24
@@ -167,6 +182,9 @@ class Settings(BaseSettings):
     # ----- Application -----
     app_secret_key: Optional[str] = None  # HMAC for session cookies; wizard generates
     environment: str = "production"
+    # Log a warning (with the heaviest statements) when one HTTP request or
+    # worker cycle runs more SQL statements than this. 0 disables the check.
+    db_query_budget: int = 50
 
     # External-facing base URL (e.g. "https://bingealert.example.com"). Used to
     # build absolute links inside notification emails (per-user calendar feed,
@@ -259,9 +277,16 @@ def reload_from_disk() -> None:
     NOT pick up new URLs/tokens until restart -- only the read paths that
     consult `settings.X` per-request benefit.
     """
+    from app.security import clear_network_acls
+    from app.services.arr_metadata import clear_metadata_cache
+
     fresh = _build_settings()
     for field_name in Settings.model_fields:
         try:
             object.__setattr__(settings, field_name, getattr(fresh, field_name))
         except Exception:
             pass
+    # Compiled CIDR allow-lists (auth bypass, trusted proxies, webhook IPs).
+    clear_network_acls()
+    # Profiles / root folders cached from *arr URLs that may have changed.
+    clear_metadata_cache()
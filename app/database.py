@@ -6,11 +6,20 @@ The engine targets SQLite. On every new connection we apply three PRAGMAs:
   - foreign_keys=ON     -- off by default in SQLite; we depend on FK enforcement.
   - synchronous=NORMAL  -- safe default for WAL; FULL is overkill for our workload.
 
+plus the tuning PRAGMAs of the configured storage profile (page cache, mmap,
+temp_store, busy_timeout, WAL autocheckpoint), which also sizes the
+connection pool. See SQLITE_PROFILES and settings.sqlite_profile.
+
+Cursor-execute hooks on the app engine feed statement counts and time into
+app.metrics, attributed to the current HTTP request or worker cycle.
+
 Models match the v1.5.x post-008 schema 1:1 so existing data migrates byte-for-byte
 via scripts/migrate_from_v1.py. Schema cleanup (notifications.status enum,
 system_config retirement, UTC-aware timestamps) is deferred to a future migration.
 """
+import logging
 import secrets
+import time
 from datetime import datetime
 
 from sqlalchemy import (
@@ -18,23 +27,89 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     create_engine,
     event,
+    func,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.config import settings
-
+from app.metrics import record_db_query
+
+
+logger = logging.getLogger(__name__)
+
+# Storage tuning profiles. "safe" is SQLite's stock behaviour with a small
+# pool; "balanced" suits most installs; "performance" trades memory (page
+# cache + mmap are per connection / per process) for fewer disk reads and
+# checkpoints. Benchmark them with scripts/bench_storage.py.
+SQLITE_PROFILES = {
+    "safe": {
+        "cache_size_kib": 2000,
+        "mmap_size_mb": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout_ms": 5000,
+        "wal_autocheckpoint_pages": 1000,
+        "pool_size": 5,
+        "max_overflow": 10,
+    },
+    "balanced": {
+        "cache_size_kib": 16000,
+        "mmap_size_mb": 64,
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 10000,
+        "wal_autocheckpoint_pages": 1000,
+        "pool_size": 10,
+        "max_overflow": 20,
+    },
+    "performance": {
+        "cache_size_kib": 64000,
+        "mmap_size_mb": 256,
+        "temp_store": "MEMORY",
+        "busy_timeout_ms": 15000,
+        "wal_autocheckpoint_pages": 4000,
+        "pool_size": 20,
+        "max_overflow": 20,
+    },
+}
+DEFAULT_SQLITE_PROFILE = "balanced"
+
+
+def storage_profile() -> dict:
+    """The configured profile with any per-setting overrides applied."""
+    name = (settings.sqlite_profile or DEFAULT_SQLITE_PROFILE).strip().lower()
+    if name not in SQLITE_PROFILES:
+        logger.warning(f"Unknown sqlite_profile {name!r}, using {DEFAULT_SQLITE_PROFILE!r}")
+        name = DEFAULT_SQLITE_PROFILE
+    profile = dict(SQLITE_PROFILES[name], name=name)
+    overrides = {
+        "cache_size_kib": settings.sqlite_cache_size_kib,
+        "mmap_size_mb": settings.sqlite_mmap_size_mb,
+        "busy_timeout_ms": settings.sqlite_busy_timeout_ms,
+        "wal_autocheckpoint_pages": settings.sqlite_wal_autocheckpoint_pages,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+    }
+    profile.update({key: int(value) for key, value in overrides.items() if value is not None})
+    return profile
+
+
+STORAGE_PROFILE = storage_profile()
 
 engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=STORAGE_PROFILE["pool_size"],
+    max_overflow=STORAGE_PROFILE["max_overflow"],
     future=True,
 )
 
@@ -52,10 +127,30 @@ def _sqlite_on_connect(dbapi_connection, connection_record):
         cursor.execute("PRAGMA journal_mode=WAL")
         cursor.execute("PRAGMA synchronous=NORMAL")
         cursor.execute("PRAGMA foreign_keys=ON")
+        # Negative cache_size is in KiB rather than pages.
+        cursor.execute(f"PRAGMA cache_size=-{int(STORAGE_PROFILE['cache_size_kib'])}")
+        cursor.execute(f"PRAGMA mmap_size={int(STORAGE_PROFILE['mmap_size_mb']) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA temp_store={STORAGE_PROFILE['temp_store']}")
+        cursor.execute(f"PRAGMA busy_timeout={int(STORAGE_PROFILE['busy_timeout_ms'])}")
+        cursor.execute(f"PRAGMA wal_autocheckpoint={int(STORAGE_PROFILE['wal_autocheckpoint_pages'])}")
     finally:
         cursor.close()
 
 
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a statement that raises (and never
+    # reaches after_cursor_execute) leaves nothing behind on the connection.
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_start", None)
+    if started is not None:
+        record_db_query(time.perf_counter() - started, statement)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -69,6 +164,12 @@ def get_db():
         db.close()
 
 
+def optimize_database() -> None:
+    """Run PRAGMA optimize so the query planner's statistics stay current."""
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+
+
 # ---------------------------------------------------------------------------
 # Models -- schema mirrors v1.5.x post-008 exactly.
 # ---------------------------------------------------------------------------
@@ -116,6 +217,14 @@ class User(Base):
     requests = relationship("MediaRequest", back_populates="user")
     notifications = relationship("Notification", back_populates="user")
 
+    __table_args__ = (
+        # Keyset pagination order for the admin list endpoints (app.pagination).
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Case-insensitive webhook user resolution (app.services.user_directory).
+        Index("ix_users_email_lower", func.lower(email)),
+        Index("ix_users_username_lower", func.lower(username)),
+    )
+
 
 class MediaRequest(Base):
     __tablename__ = "media_requests"
@@ -128,6 +237,10 @@ class MediaRequest(Base):
     title = Column(String, nullable=False)
     status = Column(String, nullable=False)  # 'pending' | 'approved' | 'available'
     season_count = Column(Integer, nullable=True)
+    # Hash of the Sonarr/Radarr state the quality monitor last evaluated
+    # (app.background.quality_monitor); unchanged requests are skipped.
+    quality_fingerprint = Column(String, nullable=True)
+    quality_checked_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -138,6 +251,8 @@ class MediaRequest(Base):
         "SharedRequest", back_populates="request", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (Index("ix_media_requests_created_at_id", "created_at", "id"),)
+
 
 class SharedRequest(Base):
     __tablename__ = "shared_requests"
@@ -210,6 +325,8 @@ class ReportedIssue(Base):
     user = relationship("User", foreign_keys=[user_id])
     request = relationship("MediaRequest")
 
+    __table_args__ = (Index("ix_reported_issues_created_at_id", "created_at", "id"),)
+
 
 class MaintenanceWindow(Base):
     """Scheduled maintenance windows with email broadcasts."""
@@ -288,6 +405,82 @@ class ServiceHealthEvent(Base):
     checked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
 
+class ServiceHealthRollup(Base):
+    """Per-service health check aggregates for one minute or one hour.
+
+    Maintained as each check is recorded so dashboards read a few dozen
+    bucket rows instead of scanning raw service_health_events.
+    `latency_histogram` is app.histogram.LatencyHistogram.dumps() output.
+    """
+
+    __tablename__ = "service_health_rollups"
+
+    id = Column(Integer, primary_key=True)
+    service_key = Column(String, nullable=False)
+    resolution = Column(String, nullable=False)  # 'minute' | 'hour'
+    bucket_start = Column(DateTime, nullable=False)
+    checks = Column(Integer, default=0, nullable=False)
+    ok_count = Column(Integer, default=0, nullable=False)
+    failure_count = Column(Integer, default=0, nullable=False)
+    latency_count = Column(Integer, default=0, nullable=False)
+    latency_sum_ms = Column(Integer, default=0, nullable=False)
+    latency_max_ms = Column(Integer, nullable=True)
+    latency_histogram = Column(Text, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "service_key", "resolution", "bucket_start", name="_service_rollup_bucket_uc"
+        ),
+        Index("ix_service_health_rollups_resolution_bucket", "resolution", "bucket_start"),
+    )
+
+
+class UpstreamLatencyRollup(Base):
+    """Hourly request/error counts and latency histogram per upstream endpoint.
+
+    Written by app.services.upstream_metrics.flush_upstream_metrics();
+    `latency_histogram` is app.histogram.LatencyHistogram.dumps() output.
+    """
+
+    __tablename__ = "upstream_latency_rollups"
+
+    id = Column(Integer, primary_key=True)
+    service = Column(String, nullable=False)
+    endpoint = Column(String, nullable=False)
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    requests = Column(Integer, default=0, nullable=False)
+    errors = Column(Integer, default=0, nullable=False)
+    latency_sum_ms = Column(Integer, default=0, nullable=False)
+    latency_max_ms = Column(Integer, nullable=True)
+    latency_histogram = Column(Text, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("service", "endpoint", "bucket_start", name="_upstream_rollup_bucket_uc"),
+    )
+
+
+class StuckAlertState(Base):
+    """Queue items the stuck-download monitor has already alerted on or fixed.
+
+    One row per (instance, queue_id, reason); `expires_at` is when the item
+    may be alerted/remediated again. Expired rows are compacted away by the
+    monitor. See app.background.stuck_monitor.StuckAlertStore.
+    """
+
+    __tablename__ = "stuck_alert_state"
+
+    id = Column(Integer, primary_key=True)
+    instance = Column(String, nullable=False)
+    queue_id = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)
+    alerted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint("instance", "queue_id", "reason", name="_stuck_alert_state_uc"),
+    )
+
+
 class AdminActivityLog(Base):
     """Audit trail for admin-triggered and scheduled maintenance actions."""
 
@@ -322,6 +515,8 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
     request = relationship("MediaRequest", back_populates="notifications")
 
+    __table_args__ = (Index("ix_notifications_created_at_id", "created_at", "id"),)
+
 
 class NotificationDeliveryLog(Base):
     """Durable dedupe ledger for sent notifications.
@@ -0,0 +1,208 @@
+"""Serialized SQLite writes.
+
+SQLite allows one writer at a time. With webhooks, background workers and
+admin requests each committing through their own session, bursts end up
+queueing on the database lock (busy_timeout) and occasionally failing with
+"database is locked". Hot write paths instead hand a *write unit* -- a sync
+callable taking a Session, doing its reads/writes, and NOT committing -- to
+run_write(), which queues it for a single writer task:
+
+  - the writer takes every unit queued (up to WRITE_BATCH_MAX_UNITS) and runs
+    them in one session and one transaction, so a burst costs one commit;
+  - if a unit in a batch fails (e.g. IntegrityError), the batch is rolled
+    back and each unit is re-run in its own transaction, so only the
+    failing unit's caller sees the error;
+  - if the batch fails with OperationalError ("database is locked"), it is
+    retried once after LOCKED_RETRY_DELAY_SECONDS, then failed as a whole;
+  - run_write() returns the unit's return value (or raises its exception).
+
+Reads don't go through here: WAL lets readers run alongside the writer.
+
+Units run on one dedicated writer thread, so a unit waiting out busy_timeout
+never blocks the event loop. They must be sync, must not await (do upstream
+calls before submitting) and must only touch data they were handed.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.metrics import Counter, Histogram, register_collector, register_metric
+
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_MAX_UNITS = 50
+# A batch that fails with OperationalError (e.g. "database is locked") is
+# retried once after this pause, then failed.
+LOCKED_RETRY_DELAY_SECONDS = 1.0
+
+WriteUnit = Callable[[Session], Any]
+
+DB_WRITE_WAIT_SECONDS = register_metric(Histogram(
+    "db_write_wait_seconds",
+    "Time a write unit spent queued before the writer started it.",
+    ("unit",),
+))
+DB_WRITE_BATCH_UNITS = register_metric(Histogram(
+    "db_write_batch_units",
+    "Write units committed per writer transaction.",
+    buckets=(1, 2, 5, 10, 20, 50),
+))
+DB_WRITE_UNITS = register_metric(Counter(
+    "db_write_units_total",
+    "Write units run by the writer, by result.",
+    ("unit", "result"),
+))
+
+_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+_stopped = False
+# Units run here, never on the event loop: a unit waiting out busy_timeout
+# on a locked database must not freeze the app.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+
+def _ensure_writer() -> asyncio.Queue:
+    """Start the writer task on the running loop if it isn't running yet."""
+    global _queue, _writer_task
+    loop = asyncio.get_running_loop()
+    if _queue is None or _writer_task is None or _writer_task.get_loop() is not loop:
+        _queue = asyncio.Queue()
+        _writer_task = None
+    if _writer_task is None or _writer_task.done():
+        # Restart on the same queue so nothing already queued is orphaned.
+        _writer_task = loop.create_task(_writer(_queue))
+    return _queue
+
+
+async def run_write(unit: WriteUnit, name: str) -> Any:
+    """Queue `unit` for the writer and wait for its result.
+
+    After stop_db_writer() (late shutdown writes) the unit runs on its own
+    session instead.
+    """
+    if _stopped:
+        DB_WRITE_UNITS.inc(name, "direct")
+        results = await asyncio.to_thread(_run_units, [(unit, name, None, time.perf_counter())])
+        return results[0][1]
+    queue = _ensure_writer()
+    future = asyncio.get_running_loop().create_future()
+    queue.put_nowait((unit, name, future, time.perf_counter()))
+    return await future
+
+
+def write_queue_depth() -> int:
+    return _queue.qsize() if _queue is not None else 0
+
+
+def _run_units(items: list[tuple]) -> list[tuple[bool, Any]]:
+    """Run units in one transaction; returns (ok, result or exception) per unit."""
+    db = SessionLocal()
+    try:
+        results = []
+        for unit, _name, _future, _queued_at in items:
+            results.append((True, unit(db)))
+            db.flush()
+        db.commit()
+        return results
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _run_batch(items: list[tuple]) -> list[tuple[bool, Any]]:
+    """Run a batch; re-run units one by one only for per-unit errors.
+
+    OperationalError (database locked, disk I/O) is not about any one unit,
+    so it propagates for the caller to back off and retry the whole batch.
+    """
+    try:
+        return _run_units(items)
+    except OperationalError:
+        raise
+    except Exception as e:
+        if len(items) == 1:
+            return [(False, e)]
+    # Isolate the failing unit(s): everyone else still gets their write.
+    results = []
+    for item in items:
+        try:
+            results.extend(_run_units([item]))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+async def _execute_batch(items: list[tuple]) -> list[tuple[bool, Any]]:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_executor, _run_batch, items)
+    except OperationalError as e:
+        logger.warning(f"Write batch of {len(items)} hit {e}; retrying once in {LOCKED_RETRY_DELAY_SECONDS}s")
+    await asyncio.sleep(LOCKED_RETRY_DELAY_SECONDS)
+    try:
+        return await loop.run_in_executor(_executor, _run_batch, items)
+    except Exception as e:
+        return [(False, e)] * len(items)
+
+
+async def _writer(queue: asyncio.Queue) -> None:
+    while True:
+        items = [await queue.get()]
+        while len(items) < WRITE_BATCH_MAX_UNITS and not queue.empty():
+            items.append(queue.get_nowait())
+        try:
+            started = time.perf_counter()
+            for _unit, name, _future, queued_at in items:
+                DB_WRITE_WAIT_SECONDS.observe(started - queued_at, name)
+            DB_WRITE_BATCH_UNITS.observe(len(items))
+            results = await _execute_batch(items)
+        except Exception as e:
+            # Never let the writer die with callers still waiting.
+            logger.error(f"DB writer failed a batch of {len(items)}: {e}", exc_info=True)
+            results = [(False, e)] * len(items)
+        for (_unit, name, future, _queued_at), (ok, value) in zip(items, results):
+            DB_WRITE_UNITS.inc(name, "ok" if ok else "error")
+            if future.done():  # caller was cancelled
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+        for _ in items:
+            queue.task_done()
+
+
+async def stop_db_writer() -> None:
+    """Finish queued writes, then stop the writer (used at shutdown).
+
+    Writes submitted afterwards run directly on their own session.
+    """
+    global _writer_task, _stopped
+    _stopped = True
+    if _writer_task is None or _writer_task.done():
+        return
+    await _queue.join()
+    _writer_task.cancel()
+    try:
+        await _writer_task
+    except asyncio.CancelledError:
+        pass
+    _writer_task = None
+
+
+def _collect_write_queue():
+    yield "db_write_queue_depth", "gauge", "Write units waiting for the writer.", [({}, write_queue_depth())]
+
+
+register_collector(_collect_write_queue)
@@ -0,0 +1,118 @@
+"""Fixed-memory, log-bucketed latency histograms.
+
+Bucket upper bounds grow geometrically by LATENCY_BUCKET_GROWTH from 1 ms up
+to 2 minutes, so any histogram is at most 67 integer counters no matter how
+many samples it absorbs, and a percentile read back from it is within one
+bucket (≤ 20%) of the true value. Histograms merge by adding counters, which
+is what lets rollup rows for different minutes/hours be combined into a
+p50/p95/p99 over any window.
+
+Serialised form (for TEXT columns) is sparse: "index:count" pairs joined by
+commas, e.g. "12:3,17:41,30:1".
+"""
+from __future__ import annotations
+
+import bisect
+import math
+from typing import Iterable, Optional
+
+
+LATENCY_BUCKET_GROWTH = 1.2
+LATENCY_MAX_MS = 120_000.0
+
+LATENCY_BUCKET_BOUNDS: tuple[float, ...] = tuple(
+    round(LATENCY_BUCKET_GROWTH ** i, 2)
+    for i in range(int(math.log(LATENCY_MAX_MS, LATENCY_BUCKET_GROWTH)) + 2)
+)
+# Anything above the last bound lands in one overflow bucket.
+_OVERFLOW = len(LATENCY_BUCKET_BOUNDS)
+
+
+class LatencyHistogram:
+    """Counts of latency samples per log-spaced bucket."""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        latency_ms = max(0.0, float(latency_ms))
+        index = bisect.bisect_left(LATENCY_BUCKET_BOUNDS, latency_ms)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for index, value in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + value
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                if index >= _OVERFLOW:
+                    return self.max_ms
+                # Never report more than the slowest sample actually seen.
+                return min(LATENCY_BUCKET_BOUNDS[index], self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict[str, Optional[float]]:
+        def _round(value: Optional[float]) -> Optional[float]:
+            return round(value, 1) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg_ms": _round(self.total_ms / self.count) if self.count else None,
+            "p50_ms": _round(self.percentile(50)),
+            "p95_ms": _round(self.percentile(95)),
+            "p99_ms": _round(self.percentile(99)),
+            "max_ms": _round(self.max_ms) if self.count else None,
+        }
+
+    def dumps(self) -> str:
+        return ",".join(f"{index}:{value}" for index, value in sorted(self.counts.items()))
+
+    @classmethod
+    def loads(
+        cls,
+        text: Optional[str],
+        count: Optional[int] = None,
+        total_ms: Optional[float] = None,
+        max_ms: Optional[float] = None,
+    ) -> "LatencyHistogram":
+        """Rebuild a histogram from dumps() output plus its stored aggregates."""
+        histogram = cls()
+        for part in (text or "").split(","):
+            if not part:
+                continue
+            index, _, value = part.partition(":")
+            try:
+                histogram.counts[int(index)] = int(value)
+            except ValueError:
+                continue
+        histogram.count = count if count is not None else sum(histogram.counts.values())
+        histogram.total_ms = float(total_ms or 0.0)
+        histogram.max_ms = float(max_ms or 0.0)
+        return histogram
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    merged = LatencyHistogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
@@ -4,8 +4,10 @@ Phase 4 in progress: webhooks, health, and the six background workers are
 wired up. Admin endpoints and SSE log streaming come in 4d.
 
 Middleware order (Starlette applies last-added-first, so this reads outside-in):
-    SetupGateMiddleware  (added second below; runs first; redirects to /setup
-                          when not configured, locks /setup once configured)
+    MetricsMiddleware    (added last below; runs first; counts and times
+                          every request, gated ones included)
+    SetupGateMiddleware  (redirects to /setup when not configured, locks
+                          /setup once configured)
     AuthMiddleware       (added first below; runs after SetupGate; enforces
                           login on protected paths)
 """
@@ -23,12 +25,14 @@ from typing import Any
 
 import httpx
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app import __version__
 from app.auth import AuthMiddleware
 from app.config import settings
+from app.db_writer import stop_db_writer
+from app.metrics import MetricsMiddleware, event_loop_lag_monitor, record_cache, render_metrics
 from app.middleware import SetupGateMiddleware
 from app.routers import admin as admin_router
 from app.routers import auth as auth_router
@@ -208,8 +212,10 @@ async def _version_payload(force_refresh: bool = False) -> dict:
     now = time.monotonic()
     cached_payload = _version_cache.get("payload")
     if not force_refresh and cached_payload and now < float(_version_cache["expires_at"]):
+        record_cache("version", True)
         return cached_payload
 
+    record_cache("version", False)
     async with _version_cache_lock:
         now = time.monotonic()
         cached_payload = _version_cache.get("payload")
@@ -254,10 +260,9 @@ async def _version_payload(force_refresh: bool = False) -> dict:
 
 
 async def _notification_processor() -> None:
-    """Drain queued notifications every minute, skipping during maintenance."""
-    from app.background.utils import is_maintenance_active
-    from app.database import SessionLocal
-    from app.services.email_service import EmailService
+    """Drain queued notifications every minute, pausing during maintenance."""
+    from app.background.utils import is_maintenance_active, wait_for_maintenance_end
+    from app.services.email_service import drain_pending_notifications
     from app.background.system_health import (
         record_worker_failure,
         record_worker_started,
@@ -265,26 +270,22 @@ async def _notification_processor() -> None:
     )
     from datetime import timedelta
 
-    email_service = EmailService()
-
     while True:
         started_at = None
         interval_seconds = max(30, min(300, int(settings.notification_check_frequency_seconds or 60)))
         try:
             await asyncio.sleep(interval_seconds)
             if is_maintenance_active():
-                logger.debug("maintenance active -- skipping notification drain")
-                continue
+                # Park until the window ends, then drain straight away rather
+                # than waiting out another interval.
+                logger.debug("maintenance active -- pausing notification drain")
+                await wait_for_maintenance_end()
             started_at = record_worker_started(
                 "notification_processor",
                 "Notification processor",
                 next_run_at=datetime.utcnow() + timedelta(seconds=interval_seconds),
             )
-            db = SessionLocal()
-            try:
-                await email_service.process_pending_notifications(db)
-            finally:
-                db.close()
+            await drain_pending_notifications("periodic")
             record_worker_success(
                 "notification_processor",
                 "Notification processor",
@@ -316,17 +317,20 @@ async def lifespan(app: FastAPI):
         "BingeAlert v2 starting (configured=%s)", settings.is_minimally_configured()
     )
 
-    tasks: list[asyncio.Task] = []
+    tasks: list[asyncio.Task] = [asyncio.create_task(event_loop_lag_monitor())]
     if settings.is_minimally_configured():
         from app.background.maintenance_worker import maintenance_window_worker
         from app.background.ops_maintenance import ops_maintenance_worker
         from app.background.quality_monitor import quality_release_monitor_worker
         from app.background.reconciliation import reconciliation_worker
         from app.background.stuck_monitor import stuck_download_monitor
-        from app.background.system_health import system_health_worker
+        from app.background.system_health import system_health_worker, worker_health_flusher
         from app.background.weekly_summary import weekly_summary_worker
+        from app.services.arr_metadata import arr_metadata_refresher
+        from app.services.upstream_metrics import upstream_metrics_flusher
 
         starts = [
+            ("arr metadata cache (warm + every 6h)", arr_metadata_refresher()),
             ("notification processor", _notification_processor()),
             ("reconciliation worker (every 2h)", reconciliation_worker()),
             ("weekly summary (Sun 9am UTC)", weekly_summary_worker()),
@@ -335,6 +339,8 @@ async def lifespan(app: FastAPI):
             ("maintenance window worker (every 60s)", maintenance_window_worker()),
             ("system health worker", system_health_worker()),
             ("operational maintenance worker", ops_maintenance_worker()),
+            ("worker health flusher (every 30s)", worker_health_flusher()),
+            ("upstream metrics flusher (every 60s)", upstream_metrics_flusher()),
         ]
         for label, coro in starts:
             try:
@@ -348,6 +354,10 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Don't drop Sonarr imports still waiting in their debounce window, and
+    # let their queued writes land before the writer stops.
+    await webhooks_router.flush_sonarr_downloads()
+    await stop_db_writer()
     for t in tasks:
         t.cancel()
     for t in tasks:
@@ -373,6 +383,7 @@ app = FastAPI(
 # unconfigured installs reach the wizard without being intercepted by login.
 app.add_middleware(AuthMiddleware)
 app.add_middleware(SetupGateMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(setup_router.router, tags=["Setup"])
 app.include_router(auth_router.router, tags=["Auth"])
@@ -393,6 +404,12 @@ async def api_version(request: Request) -> dict:
     return await _version_payload(force_refresh=force_refresh)
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of in-process pipeline metrics."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/service-worker.js")
 async def service_worker():
     sw = _STATIC_DIR / "service-worker.js"
@@ -0,0 +1,532 @@
+"""In-process metrics and the Prometheus text exposition served at /metrics.
+
+Hot paths (every HTTP request, every SQL statement, every email) only bump
+counters or histogram buckets held in plain dicts under a lock -- no
+prometheus_client dependency and no I/O. Figures that already live elsewhere
+(notification queue, worker heartbeats, upstream call stats, ACL caches) are
+read by collectors at scrape time instead of being mirrored here.
+
+SQL statements are also attributed to the unit of work that issued them --
+an HTTP request or a background worker cycle -- through a ContextVar holding
+a QueryStats. Per-unit query counts and DB time feed histograms labelled by
+route template or worker key, development mode adds X-DB-Query-Count /
+X-DB-Query-Time-Ms response headers, and a unit that runs more than
+settings.db_query_budget statements logs a warning naming its heaviest
+statements, which is usually enough to spot an N+1.
+
+/metrics follows the admin auth rules: local-network clients (the usual home
+for a Prometheus scraper) pass via the CIDR bypass, anyone else needs a
+session or gets a JSON 401.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "bingealert_"
+DEFAULT_SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+EVENT_LOOP_LAG_INTERVAL_SECONDS = 0.5
+DB_QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+# Distinct statements kept per unit of work; the rest are lumped together so
+# a bulk job with many IN (...) shapes can't grow one QueryStats unbounded.
+MAX_TRACKED_STATEMENTS = 100
+TOP_STATEMENTS_LOGGED = 5
+
+Sample = tuple[dict[str, str], float]
+# A collector returns (name, type, help, samples) families, evaluated per scrape.
+Collector = Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed label set."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = METRIC_PREFIX + name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(
+                f"{self.name}{_format_labels(dict(zip(self.labelnames, labels)))} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(Counter):
+    """Settable value with a fixed label set."""
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) with a fixed label set."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_SECONDS_BUCKETS,
+    ):
+        self.name = METRIC_PREFIX + name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                bucket_labels = {**base, "le": _format_value(bound) if bound != float("inf") else "+Inf"}
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {_format_value(cumulative)}")
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Metric definitions
+# ---------------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled, by route template.", ("method", "route", "status")
+)
+HTTP_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, by route template.", ("method", "route")
+)
+EMAILS = Counter("emails_total", "Emails handed to SMTP, by result.", ("result",))
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed.")
+DB_QUERY_SECONDS = Counter("db_query_seconds_total", "Time spent executing SQL statements.")
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "In-process cache lookups, by cache and hit/miss.", ("cache", "result")
+)
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Most recent event-loop scheduling delay.")
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_distribution_seconds",
+    "Event-loop scheduling delay samples.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+UNIT_DB_QUERIES = Histogram(
+    "unit_db_queries",
+    "SQL statements per HTTP request or worker cycle.",
+    ("kind", "name"),
+    buckets=DB_QUERY_COUNT_BUCKETS,
+)
+UNIT_DB_SECONDS = Histogram(
+    "unit_db_seconds",
+    "Time spent in SQL per HTTP request or worker cycle.",
+    ("kind", "name"),
+)
+DB_QUERY_BUDGET_EXCEEDED = Counter(
+    "db_query_budget_exceeded_total",
+    "HTTP requests / worker cycles that ran more statements than db_query_budget.",
+    ("kind", "name"),
+)
+
+_METRICS: list[Any] = [
+    HTTP_REQUESTS,
+    HTTP_DURATION,
+    EMAILS,
+    DB_QUERIES,
+    DB_QUERY_SECONDS,
+    CACHE_REQUESTS,
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_HISTOGRAM,
+    UNIT_DB_QUERIES,
+    UNIT_DB_SECONDS,
+    DB_QUERY_BUDGET_EXCEEDED,
+]
+_collectors: list[Collector] = []
+
+
+def register_metric(metric: Any) -> Any:
+    """Add a Counter/Gauge/Histogram defined elsewhere to the exposition."""
+    _METRICS.append(metric)
+    return metric
+
+
+def register_collector(collector: Collector) -> Collector:
+    _collectors.append(collector)
+    return collector
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def record_email(sent: bool) -> None:
+    EMAILS.inc("sent" if sent else "failed")
+
+
+def record_db_query(seconds: float, statement: Optional[str] = None) -> None:
+    DB_QUERIES.inc()
+    DB_QUERY_SECONDS.inc(amount=seconds)
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement or "", seconds)
+
+
+# ---------------------------------------------------------------------------
+# Per-request / per-worker-cycle query attribution
+# ---------------------------------------------------------------------------
+
+
+class QueryStats:
+    """SQL statements issued by one HTTP request or worker cycle.
+
+    Sync route handlers run in the threadpool with a copy of the request's
+    context, so they share this object with the middleware. Updates are not
+    locked: a worker fanning out DB calls across threads may lose the odd
+    increment, which is fine for a diagnostic.
+    """
+
+    __slots__ = ("kind", "name", "count", "seconds", "statements")
+
+    def __init__(self, kind: str, name: str = ""):
+        self.kind = kind
+        self.name = name
+        self.count = 0
+        self.seconds = 0.0
+        # statement -> [count, seconds]
+        self.statements: dict[str, list[float]] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            if len(self.statements) >= MAX_TRACKED_STATEMENTS:
+                statement = "<other statements>"
+                entry = self.statements.get(statement)
+            if entry is None:
+                entry = self.statements[statement] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def top(self, limit: int = TOP_STATEMENTS_LOGGED) -> list[tuple[str, int, float]]:
+        """Heaviest statements by execution count, then time."""
+        ranked = sorted(self.statements.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)
+        return [(statement, int(count), seconds) for statement, (count, seconds) in ranked[:limit]]
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+_SELECT_LIST = re.compile(r"^SELECT\s.+?\sFROM\s", re.IGNORECASE | re.DOTALL)
+
+
+def _statement_summary(statement: str) -> str:
+    """Collapse whitespace and ORM column lists so the log line shows the table."""
+    text = " ".join(statement.split())
+    return _SELECT_LIST.sub("SELECT ... FROM ", text, count=1)[:200]
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def _report_query_stats(stats: QueryStats) -> None:
+    UNIT_DB_QUERIES.observe(stats.count, stats.kind, stats.name)
+    UNIT_DB_SECONDS.observe(stats.seconds, stats.kind, stats.name)
+    budget = int(settings.db_query_budget or 0)
+    if budget <= 0 or stats.count <= budget:
+        return
+    DB_QUERY_BUDGET_EXCEEDED.inc(stats.kind, stats.name)
+    top = "; ".join(
+        f"{count}x {seconds * 1000:.1f}ms {_statement_summary(statement)}"
+        for statement, count, seconds in stats.top()
+    )
+    logger.warning(
+        "%s %s ran %d SQL statements (%.1f ms, budget %d). Top: %s",
+        stats.kind,
+        stats.name,
+        stats.count,
+        stats.seconds * 1000,
+        budget,
+        top,
+    )
+
+
+def begin_worker_query_stats(worker_key: str) -> None:
+    """Start attributing queries to a worker cycle (called from record_worker_started).
+
+    A worker run from inside an HTTP request (admin "run now") stays
+    attributed to that request.
+    """
+    current = _query_stats.get()
+    if current is not None and current.kind == "http":
+        return
+    _query_stats.set(QueryStats("worker", worker_key))
+
+
+def end_worker_query_stats(worker_key: str) -> None:
+    """Report and clear the cycle started by begin_worker_query_stats()."""
+    stats = _query_stats.get()
+    if stats is None or stats.kind != "worker" or stats.name != worker_key:
+        return
+    _query_stats.set(None)
+    _report_query_stats(stats)
+
+
+# ---------------------------------------------------------------------------
+# HTTP middleware and event-loop lag
+# ---------------------------------------------------------------------------
+
+
+def _route_template(scope: Scope) -> str:
+    # Routes from include_router(prefix=...) keep their un-prefixed path on
+    # scope["route"]; FastAPI records the full template on the effective
+    # route context, so prefer that when present.
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    template = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return template or "unmatched"
+
+
+class MetricsMiddleware:
+    """Count and time every HTTP request by its route template.
+
+    Installed outermost so 401s and setup-gate redirects are counted too; the
+    route template (e.g. /webhooks/sonarr, /admin/requests/{request_id}) is
+    read from the scope after routing, so path parameters never explode the
+    label set. Unrouted requests (static files, gate responses) are labelled
+    "unmatched". Each request also gets its own QueryStats scope.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+        stats = QueryStats("http")
+        token = _query_stats.set(stats)
+        debug_headers = settings.environment == "development"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if debug_headers:
+                    # Streaming bodies may query after this point; the
+                    # headers reflect everything up to the first byte.
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-query-count", str(stats.count).encode()),
+                        (b"x-db-query-time-ms", f"{stats.seconds * 1000:.1f}".encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _query_stats.reset(token)
+            template = _route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, template, str(status))
+            HTTP_DURATION.observe(time.perf_counter() - started, method, template)
+            stats.name = f"{method} {template}"
+            _report_query_stats(stats)
+
+
+async def event_loop_lag_monitor() -> None:
+    """Sample how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL_SECONDS)
+        lag = max(0.0, loop.time() - started - EVENT_LOOP_LAG_INTERVAL_SECONDS)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+
+# ---------------------------------------------------------------------------
+# Scrape-time collectors
+# ---------------------------------------------------------------------------
+
+
+def _collect_notification_queue():
+    from sqlalchemy import func
+
+    from app.database import Notification, SessionLocal
+
+    db = SessionLocal()
+    try:
+        depth, oldest = (
+            db.query(func.count(Notification.id), func.min(Notification.created_at))
+            .filter(Notification.sent == False)  # noqa: E712
+            .one()
+        )
+    finally:
+        db.close()
+    age = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+    yield "notification_queue_depth", "gauge", "Pending (unsent) notifications.", [({}, depth or 0)]
+    yield (
+        "notification_queue_oldest_age_seconds",
+        "gauge",
+        "Age of the oldest pending notification.",
+        [({}, max(0.0, age))],
+    )
+
+
+def _collect_workers():
+    from app.background.system_health import get_worker_health
+
+    workers = get_worker_health()
+    durations, runs, failures, healthy = [], [], [], []
+    for worker in workers:
+        labels = {"worker": worker.get("worker_key") or worker.get("worker_name") or "unknown"}
+        if worker.get("last_duration_ms") is not None:
+            durations.append((labels, worker["last_duration_ms"] / 1000.0))
+        runs.append((labels, worker.get("run_count") or 0))
+        failures.append((labels, worker.get("failure_count") or 0))
+        healthy.append((labels, 0 if worker.get("status") == "error" else 1))
+    yield "worker_last_duration_seconds", "gauge", "Duration of each worker's last cycle.", durations
+    yield "worker_runs_total", "counter", "Worker cycles started.", runs
+    yield "worker_failures_total", "counter", "Worker cycles that failed.", failures
+    yield "worker_healthy", "gauge", "1 unless the worker's last cycle errored.", healthy
+
+
+def _collect_upstream():
+    from app.services.upstream_metrics import get_upstream_counters
+
+    requests, errors, in_flight = [], [], []
+    for (service, endpoint), counters in get_upstream_counters().items():
+        labels = {"service": service, "endpoint": endpoint}
+        requests.append((labels, counters["requests"]))
+        errors.append((labels, counters["errors"]))
+        in_flight.append((labels, counters["in_flight"]))
+    yield "upstream_requests_total", "counter", "Outbound calls to upstream services.", requests
+    yield "upstream_errors_total", "counter", "Outbound calls that failed.", errors
+    yield "upstream_in_flight", "gauge", "Outbound calls currently in progress.", in_flight
+
+
+def _collect_db_pool():
+    from app.database import STORAGE_PROFILE, engine
+
+    pool = engine.pool
+    yield (
+        "db_pool_connections",
+        "gauge",
+        f"SQLAlchemy pool connections (storage profile {STORAGE_PROFILE['name']}).",
+        [
+            ({"state": "checked_out"}, pool.checkedout()),
+            ({"state": "idle"}, pool.checkedin()),
+            ({"state": "overflow"}, max(0, pool.overflow())),
+        ],
+    )
+    yield "db_pool_size", "gauge", "Configured pool_size (max_overflow on top).", [({}, pool.size())]
+
+
+def _collect_acl_caches():
+    from app.security import network_acl_cache_stats
+
+    hits, misses = network_acl_cache_stats()
+    yield (
+        "acl_decision_cache_requests_total",
+        "counter",
+        "CIDR allow-list decision cache lookups.",
+        [({"result": "hit"}, hits), ({"result": "miss"}, misses)],
+    )
+
+
+for _collector in (
+    _collect_notification_queue,
+    _collect_workers,
+    _collect_upstream,
+    _collect_db_pool,
+    _collect_acl_caches,
+):
+    register_collector(_collector)
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition (format 0.0.4) of every metric and collector."""
+    lines: list[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            logger.warning("metrics collector %s failed: %s", collector.__name__, e)
+            continue
+        for name, kind, help_text, samples in families:
+            full_name = METRIC_PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -5,16 +5,20 @@ returns True. This is the *only* path enforcement that matters in v2 setup mode;
 auth (bcrypt + session + CIDR bypass) lives in app.auth.AuthMiddleware and runs
 on top once setup is complete.
 
-Both middlewares re-read settings from the module-level singleton on every
-request. The singleton is rebuilt on process boot (which is when /data/config.json
-is read), so the wizard's "save then restart" flow is what materialises new
-config -- there's no in-process hot reload.
+Both are plain ASGI middlewares (no BaseHTTPMiddleware) and re-read settings
+from the module-level singleton on every request. The singleton is rebuilt
+on process boot (which is when /data/config.json is read), so the wizard's
+"save then restart" flow is what materialises new config -- there's no
+in-process hot reload.
 """
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi.responses import JSONResponse, RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
 
@@ -22,7 +26,8 @@ from app.config import settings
 # Paths that are reachable even when setup is incomplete. /setup serves the
 # wizard page; /api/setup is its backend; /api/version powers the shared
 # footer; /static is required by the wizard (CSS, JS); /health and
-# /favicon.ico are housekeeping.
+# /favicon.ico are housekeeping. A tuple so str.startswith() checks every
+# prefix in one C-level call.
 _SETUP_MODE_ALLOWED = (
     "/setup",
     "/api/setup",
@@ -31,9 +36,11 @@ _SETUP_MODE_ALLOWED = (
     "/health",
     "/favicon.ico",
 )
+_SETUP_LOCKED_PATHS = frozenset({"/setup", "/api/setup"})
+_NON_HTML_PREFIXES = ("/api/", "/webhooks/", "/metrics")
 
 
-def _wants_html(request: Request) -> bool:
+def _wants_html(scope: Scope) -> bool:
     """Best-effort: should an unconfigured response be a redirect (HTML
     browser) or a 503 (API client)?
 
@@ -41,41 +48,58 @@ def _wants_html(request: Request) -> bool:
     Anything else -- POSTs, /api/*, /webhooks/*, application/json -- gets 503
     so upstreams (Sonarr/Radarr/Seerr) and AJAX clients see a real error.
     """
-    if request.method not in ("GET", "HEAD"):
+    if scope["method"] not in ("GET", "HEAD"):
         return False
-    path = request.url.path
-    if path.startswith("/api/") or path.startswith("/webhooks/"):
+    if scope["path"].startswith(_NON_HTML_PREFIXES):
         return False
-    accept = request.headers.get("accept", "")
+    accept = Headers(scope=scope).get("accept", "")
     if "application/json" in accept and "text/html" not in accept:
         return False
     return True
 
 
-class SetupGateMiddleware(BaseHTTPMiddleware):
-    """If the app isn't minimally configured, allow only the wizard routes."""
-
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
-        if settings.is_minimally_configured():
-            # Setup is complete -- lock the wizard page and the save endpoint
-            # (turnover §2.5). Leave /api/setup/status reachable so the wizard
-            # frontend can detect that the restart finished.
-            if path == "/setup" or path == "/api/setup":
-                return JSONResponse(
-                    status_code=403,
-                    content={"detail": "Setup already complete"},
-                )
-            return await call_next(request)
-
-        # Not configured -- only let the wizard + housekeeping through.
-        if any(path == p or path.startswith(p) for p in _SETUP_MODE_ALLOWED):
-            return await call_next(request)
-
-        if _wants_html(request):
-            return RedirectResponse(url="/setup", status_code=302)
-        return JSONResponse(
-            status_code=503,
-            content={"detail": "Setup required. Visit /setup in a browser to configure."},
-        )
+def setup_gate_response(scope: Scope) -> Optional[Response]:
+    """Return the response that short-circuits this request, or None to pass."""
+    path = scope["path"]
+
+    if settings.is_minimally_configured():
+        # Setup is complete -- lock the wizard page and the save endpoint
+        # (turnover §2.5). Leave /api/setup/status reachable so the wizard
+        # frontend can detect that the restart finished.
+        if path in _SETUP_LOCKED_PATHS:
+            return JSONResponse(
+                status_code=403,
+                content={"detail": "Setup already complete"},
+            )
+        return None
+
+    # Not configured -- only let the wizard + housekeeping through.
+    if path.startswith(_SETUP_MODE_ALLOWED):
+        return None
+
+    if _wants_html(scope):
+        return RedirectResponse(url="/setup", status_code=302)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Setup required. Visit /setup in a browser to configure."},
+    )
+
+
+class SetupGateMiddleware:
+    """If the app isn't minimally configured, allow only the wizard routes.
+
+    Plain ASGI rather than BaseHTTPMiddleware: requests that pass the gate
+    are handed to the app untouched, so streaming responses (SSE, log
+    stream) keep their backpressure and no extra task is spawned per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            response = setup_gate_response(scope)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -0,0 +1,139 @@
+"""Keyset (cursor) pagination and cached totals for admin list endpoints.
+
+Admin tables are ordered newest-first on (created_at, id). OFFSET pagination
+makes SQLite walk and discard every skipped row, so deep pages on a large
+notifications table degrade into full scans. A keyset cursor instead encodes
+the (created_at, id) of the last row served and the next page starts with an
+index seek on the composite (created_at, id) indexes.
+
+Rows with a NULL created_at (only possible for pre-v2 data) sort after every
+timestamped row, matching SQLite's DESC ordering, and are paged by id alone.
+
+Totals are cached briefly per (table, filters) key: the dashboard asks for
+the same count on every tab visit and an exact COUNT(*) is not free on a
+large table. Bulk mutations call invalidate_cached_counts().
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Query
+
+from app.metrics import record_cache
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+COUNT_CACHE_TTL_SECONDS = 30.0
+
+_count_cache: dict[tuple, tuple[float, int]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    return max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    stamp = created_at.isoformat() if created_at else ""
+    raw = f"{stamp}|{int(row_id)}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        stamp, _, row_id = base64.urlsafe_b64decode(padded).decode("utf-8").partition("|")
+        return (datetime.fromisoformat(stamp) if stamp else None, int(row_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+
+def keyset_page(
+    query: Query,
+    created_col: Any,
+    id_col: Any,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+) -> tuple[list[Any], Optional[str]]:
+    """Return one newest-first page of `query` and the cursor for the next.
+
+    `skip` is honoured only when no cursor is given so existing callers that
+    still send OFFSET-style parameters keep working.
+    """
+    page_size = clamp_limit(limit)
+    if not cursor:
+        if skip:
+            query = query.offset(max(0, int(skip)))
+        rows = query.order_by(created_col.desc(), id_col.desc()).limit(page_size + 1).all()
+        return _split_page(rows, page_size)
+
+    after_created, after_id = decode_cursor(cursor)
+    rows = []
+    if after_created is not None:
+        # Written as `<=` plus a tie-break rather than a single OR so SQLite
+        # can turn it into a range seek on the composite index.
+        rows = (
+            query.filter(
+                created_col <= after_created,
+                or_(created_col < after_created, id_col < after_id),
+            )
+            .order_by(created_col.desc(), id_col.desc())
+            .limit(page_size + 1)
+            .all()
+        )
+        after_id = None
+    if len(rows) <= page_size:
+        null_filters = [created_col.is_(None)]
+        if after_id is not None:
+            null_filters.append(id_col < after_id)
+        rows += (
+            query.filter(*null_filters)
+            .order_by(id_col.desc())
+            .limit(page_size + 1 - len(rows))
+            .all()
+        )
+    return _split_page(rows, page_size)
+
+
+def _split_page(rows: list[Any], page_size: int) -> tuple[list[Any], Optional[str]]:
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
+
+
+def cached_count(key: tuple, compute: Callable[[], int], ttl: float = COUNT_CACHE_TTL_SECONDS) -> int:
+    now = time.monotonic()
+    with _count_cache_lock:
+        hit = _count_cache.get(key)
+        if hit and hit[0] > now:
+            record_cache("admin_counts", True)
+            return hit[1]
+    record_cache("admin_counts", False)
+    value = int(compute() or 0)
+    with _count_cache_lock:
+        _count_cache[key] = (now + ttl, value)
+    return value
+
+
+def invalidate_cached_counts(table: Optional[str] = None) -> None:
+    """Drop cached totals for one table (first key element), or all of them."""
+    with _count_cache_lock:
+        if table is None:
+            _count_cache.clear()
+            return
+        for key in [k for k in _count_cache if k and k[0] == table]:
+            _count_cache.pop(key, None)
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, contains_eager, defer
+from sqlalchemy import func, or_
 import logging
 import os
 import json
 from datetime import datetime
+from typing import Optional
 
 from app.database import (
     AdminActivityLog,
@@ -26,6 +27,13 @@ from app.security import (
     validate_ip_or_cidr_csv,
 )
 from app.services.admin_activity import record_admin_activity
+from app.background.utils import refresh_maintenance_state
+from app.pagination import (
+    InvalidCursorError,
+    cached_count,
+    invalidate_cached_counts,
+    keyset_page,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -36,20 +44,40 @@ async def sync_users():
     """Manually trigger user sync from Jellyseerr"""
     try:
         sync_service = JellyseerrSyncService()
-        await sync_service.sync_users()
-        return {"success": True, "message": "User sync completed"}
+        summary = await sync_service.sync_users()
+        if summary is None:
+            return {"success": False, "message": "No users returned from Jellyseerr; sync skipped"}
+        return {
+            "success": True,
+            "message": (
+                f"User sync completed: {summary['created']} new, {summary['updated']} updated, "
+                f"{summary['reactivated']} reactivated, {summary['deactivated']} deactivated"
+            ),
+            "summary": summary,
+        }
     except Exception as e:
         logger.error(f"User sync failed: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.post("/sync/requests")
-async def sync_requests():
-    """Manually trigger request sync from Jellyseerr"""
+async def sync_requests(full: bool = False):
+    """Manually trigger request sync from Jellyseerr.
+
+    Incremental by default (requests modified since the last sync);
+    `?full=true` walks every page again.
+    """
     try:
         sync_service = JellyseerrSyncService()
-        await sync_service.sync_requests()
-        return {"success": True, "message": "Request sync completed"}
+        summary = await sync_service.sync_requests(full=full)
+        return {
+            "success": True,
+            "message": (
+                f"Request sync completed: {summary['created']} new, {summary['updated']} updated "
+                f"({summary['rows_per_second']} rows/s)"
+            ),
+            "summary": summary,
+        }
     except Exception as e:
         logger.error(f"Request sync failed: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -59,10 +87,16 @@ async def sync_requests():
 async def process_notifications(db: Session = Depends(get_db)):
     """Manually trigger processing of pending notifications"""
     try:
-        email_service = EmailService()
-        await email_service.process_pending_notifications(db)
+        from app.services.email_service import drain_pending_notifications
+
+        drained = await drain_pending_notifications("admin")
         record_admin_activity("process_notifications", "Processed pending notifications", db=db)
         db.commit()
+        if not drained:
+            return {
+                "success": True,
+                "message": "A notification run was already in progress; it will run again to pick these up",
+            }
         return {"success": True, "message": "Notifications processed"}
     except Exception as e:
         logger.error(f"Notification processing failed: {e}")
@@ -271,9 +305,31 @@ async def validate_config():
 
 
 @router.get("/users")
-async def list_users(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
-    """List all users"""
-    users = db.query(User).order_by(User.created_at.desc()).offset(skip).limit(limit).all()
+async def list_users(
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    """List users, newest first, with keyset pagination via `cursor`."""
+    filters = []
+    if active is not None:
+        filters.append(User.is_active == active)
+    if q:
+        filters.append(or_(User.email.icontains(q, autoescape=True), User.username.icontains(q, autoescape=True)))
+
+    try:
+        users, next_cursor = keyset_page(
+            db.query(User).filter(*filters), User.created_at, User.id, limit, cursor, skip
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = cached_count(
+        ("users", active, q),
+        lambda: db.query(func.count(User.id)).filter(*filters).scalar(),
+    )
     return {
         "users": [
             {
@@ -286,7 +342,9 @@ async def list_users(skip: int = 0, limit: int = 50, db: Session = Depends(get_d
                 "created_at": u.created_at.isoformat() + 'Z' if u.created_at else None
             }
             for u in users
-        ]
+        ],
+        "total": total,
+        "next_cursor": next_cursor,
     }
 
 
@@ -311,6 +369,7 @@ async def toggle_user_active(user_id: int, db: Session = Depends(get_db)):
         logger.info(f"Manually reactivated user: {user.username} ({user.email})")
     
     db.commit()
+    invalidate_cached_counts("users")
     
     return {
         "success": True,
@@ -320,9 +379,40 @@ async def toggle_user_active(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/requests")
-async def list_requests(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
-    """List all media requests"""
-    requests = db.query(MediaRequest).order_by(MediaRequest.created_at.desc()).offset(skip).limit(limit).all()
+async def list_requests(
+    skip: int = 0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    media_type: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """List media requests, newest first, with keyset pagination via `cursor`."""
+    filters = []
+    if status:
+        filters.append(MediaRequest.status == status)
+    if media_type:
+        filters.append(MediaRequest.media_type == media_type)
+    if q:
+        filters.append(or_(MediaRequest.title.icontains(q, autoescape=True), User.email.icontains(q, autoescape=True)))
+
+    query = (
+        db.query(MediaRequest)
+        .join(MediaRequest.user)
+        .options(contains_eager(MediaRequest.user))
+        .filter(*filters)
+    )
+    try:
+        requests, next_cursor = keyset_page(
+            query, MediaRequest.created_at, MediaRequest.id, limit, cursor, skip
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = cached_count(
+        ("media_requests", status, media_type, q),
+        lambda: db.query(func.count(MediaRequest.id)).join(MediaRequest.user).filter(*filters).scalar(),
+    )
     return {
         "requests": [
             {
@@ -334,7 +424,9 @@ async def list_requests(skip: int = 0, limit: int = 50, db: Session = Depends(ge
                 "created_at": r.created_at.isoformat() + 'Z' if r.created_at else None
             }
             for r in requests
-        ]
+        ],
+        "total": total,
+        "next_cursor": next_cursor,
     }
 
 
@@ -343,16 +435,41 @@ async def list_notifications(
     skip: int = 0,
     limit: int = 50,
     sent: bool = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    notification_type: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """List notifications"""
-    query = db.query(Notification)
-    
+    """List notifications, newest first, with keyset pagination via `cursor`.
+
+    The HTML body is deferred -- it is never shown in the list and is the
+    bulk of each row.
+    """
+    filters = []
     if sent is not None:
-        query = query.filter(Notification.sent == sent)
-    
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
-    
+        filters.append(Notification.sent == sent)
+    if notification_type:
+        filters.append(Notification.notification_type == notification_type)
+    if q:
+        filters.append(or_(Notification.subject.icontains(q, autoescape=True), User.email.icontains(q, autoescape=True)))
+
+    query = (
+        db.query(Notification)
+        .join(Notification.user)
+        .options(defer(Notification.body), contains_eager(Notification.user))
+        .filter(*filters)
+    )
+    try:
+        notifications, next_cursor = keyset_page(
+            query, Notification.created_at, Notification.id, limit, cursor, skip
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = cached_count(
+        ("notifications", sent, notification_type, q),
+        lambda: db.query(func.count(Notification.id)).join(Notification.user).filter(*filters).scalar(),
+    )
+
     return {
         "notifications": [
             {
@@ -366,7 +483,9 @@ async def list_notifications(
                 "created_at": n.created_at.isoformat() + 'Z' if n.created_at else None
             }
             for n in notifications
-        ]
+        ],
+        "total": total,
+        "next_cursor": next_cursor,
     }
 
 
@@ -549,22 +668,13 @@ async def import_existing_episodes(request_id: int, db: Session = Depends(get_db
         if request.media_type != "tv":
             raise HTTPException(status_code=400, detail="Request is not a TV show")
         
-        # Import existing episodes
-        from app.services.sonarr_service import SonarrService, get_all_sonarr_instances
+        # Import existing episodes from all Sonarr instances
         from app.services.jellyseerr_sync import JellyseerrSyncService
         
         sync_service = JellyseerrSyncService()
-        
-        # Try importing from all Sonarr instances
-        for sonarr in get_all_sonarr_instances():
-            await sync_service._import_existing_episodes(
-                db, 
-                request, 
-                request.tmdb_id, 
-                sonarr
-            )
-        
-        db.commit()
+        summary = await sync_service.import_existing_episodes(db, [request])
+        if summary["failed"]:
+            raise HTTPException(status_code=500, detail=f"Failed to import episodes for '{request.title}'; see logs")
         
         # Get count of imported episodes
         episode_count = db.query(EpisodeTracking).filter(
@@ -585,45 +695,45 @@ async def import_existing_episodes(request_id: int, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.post("/import-all-existing-episodes")
-async def import_all_existing_episodes(db: Session = Depends(get_db)):
-    """Import existing episodes from Sonarr for ALL TV show requests"""
+@router.post("/import-all-existing-episodes", status_code=202)
+async def import_all_existing_episodes():
+    """Import existing episodes from Sonarr for ALL TV show requests.
+
+    Runs as a background job; follow it at /sse/jobs/{job_id}.
+    """
     try:
-        from app.services.sonarr_service import SonarrService, get_all_sonarr_instances
+        from app.database import SessionLocal
+        from app.services.admin_jobs import start_admin_job
         from app.services.jellyseerr_sync import JellyseerrSyncService
-        
-        sonarr_instances = get_all_sonarr_instances()
-        sync_service = JellyseerrSyncService()
-        
-        # Get all TV show requests
-        tv_requests = db.query(MediaRequest).filter(MediaRequest.media_type == "tv").all()
-        
-        imported_count = 0
-        for request in tv_requests:
+
+        async def runner(job):
+            db = SessionLocal()
             try:
-                for sonarr in sonarr_instances:
-                    await sync_service._import_existing_episodes(
-                        db,
-                        request,
-                        request.tmdb_id,
-                        sonarr
-                    )
-                imported_count += 1
-            except Exception as e:
-                logger.error(f"Failed to import episodes for request {request.id}: {e}")
-                continue
-        
-        db.commit()
-        
+                tv_requests = db.query(MediaRequest).filter(MediaRequest.media_type == "tv").all()
+                job.update(processed=0, total=len(tv_requests))
+                summary = await JellyseerrSyncService().import_existing_episodes(
+                    db, tv_requests, on_progress=lambda processed: job.update(processed=processed)
+                )
+                record_admin_activity(
+                    "import_all_episodes",
+                    f"Imported {summary['imported']} existing episode(s) for {len(tv_requests)} TV request(s)",
+                    details={**summary, "job_id": job.id},
+                    db=db,
+                )
+                db.commit()
+                return summary
+            finally:
+                db.close()
+
+        job = start_admin_job("import_all_episodes", "Import existing episodes", runner)
         return {
             "success": True,
-            "message": f"Imported existing episodes for {imported_count} TV show requests",
-            "processed_requests": imported_count
+            "message": "Importing existing episodes for all TV show requests",
+            **job.to_dict(),
         }
         
     except Exception as e:
         logger.error(f"Failed to import all existing episodes: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -964,37 +1074,28 @@ async def list_backups():
 
 @router.get("/backup/download/{filename}")
 async def download_backup(filename: str):
-    """Download a backup file"""
+    """Download a backup file.
+
+    FileResponse streams from disk and answers Range / If-Range requests
+    with 206 partial content, so interrupted downloads can be resumed.
+    """
     try:
         from app.services.backup_service import BackupService
         from fastapi.responses import FileResponse
-        
+
         backup_service = BackupService()
-        
+
         # Validate filename against actual directory listing (no user input in path construction)
-        available_files = []
-        backup_dir = os.path.realpath(backup_service.backup_dir)
-        for entry in os.listdir(backup_dir):
-            full_path = os.path.join(backup_dir, entry)
-            if os.path.isfile(full_path) and entry.endswith('.zip'):
-                available_files.append((entry, full_path))
-        
-        # Match requested filename against known safe files
-        matched_path = None
-        matched_name = None
-        for name, path in available_files:
-            if name == filename:
-                matched_path = path
-                matched_name = name
-                break
-        
-        if not matched_path:
+        matched = backup_service.get_backup_path(filename)
+        if not matched:
             raise HTTPException(status_code=404, detail="Backup file not found")
-        
+        matched_path, stat_result = matched
+
         return FileResponse(
             path=matched_path,
-            filename=matched_name,
-            media_type="application/zip"
+            filename=os.path.basename(matched_path),
+            media_type="application/zip",
+            stat_result=stat_result,
         )
     except HTTPException:
         raise
@@ -1006,62 +1107,51 @@ async def download_backup(filename: str):
 @router.post("/backup/restore")
 async def restore_backup(file: UploadFile):
     """Restore from an uploaded backup file"""
+    temp_path = None
     try:
-        from app.services.backup_service import BackupService
+        from app.services.backup_service import (
+            COPY_CHUNK_SIZE,
+            MAX_RESTORE_UPLOAD_BYTES,
+            BackupService,
+            InvalidBackupError,
+        )
         import tempfile
-        import zipfile
 
         # SECURITY FIX [MED-4]: Validate upload
         if not file.filename or not file.filename.endswith('.zip'):
             raise HTTPException(status_code=400, detail="Only .zip files are accepted")
 
-        # Read and validate size (max 50MB)
-        content = await file.read()
-        max_size = 50 * 1024 * 1024
-        if len(content) > max_size:
-            raise HTTPException(status_code=400, detail="File too large (max 50MB)")
+        backup_service = BackupService()
 
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-            temp_file.write(content)
+        # Stream the upload to disk in chunks, enforcing the size cap as we go
+        # instead of buffering the whole archive in memory first.
+        received = 0
+        with tempfile.NamedTemporaryFile(
+            dir=backup_service.backup_dir, suffix='.upload.tmp', delete=False
+        ) as temp_file:
             temp_path = temp_file.name
+            while True:
+                chunk = await file.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                received += len(chunk)
+                if received > MAX_RESTORE_UPLOAD_BYTES:
+                    raise HTTPException(status_code=400, detail="File too large (max 50MB)")
+                temp_file.write(chunk)
 
         # SECURITY FIX [MED-4]: Validate ZIP contents before restore
         try:
-            with zipfile.ZipFile(temp_path, 'r') as zf:
-                names = zf.namelist()
-                if 'metadata.json' not in names:
-                    os.remove(temp_path)
-                    raise HTTPException(status_code=400, detail="Invalid backup: missing metadata.json")
-                if 'bingealert.db' not in names:
-                    os.remove(temp_path)
-                    raise HTTPException(status_code=400, detail="Invalid backup: missing bingealert.db")
-                for name in names:
-                    if name.startswith('/') or '..' in name:
-                        os.remove(temp_path)
-                        logger.warning(f"Zip-slip attempt detected: {name}")
-                        raise HTTPException(status_code=400, detail="Invalid backup: suspicious file paths")
-                allowed_extensions = {'.json', '.db', '.txt'}
-                for name in names:
-                    ext = os.path.splitext(name)[1].lower()
-                    if ext and ext not in allowed_extensions:
-                        os.remove(temp_path)
-                        raise HTTPException(status_code=400, detail=f"Invalid backup: unexpected file type")
-        except zipfile.BadZipFile:
-            os.remove(temp_path)
-            raise HTTPException(status_code=400, detail="Invalid or corrupted ZIP file")
+            backup_service.validate_archive(temp_path)
+        except InvalidBackupError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        backup_service = BackupService()
         success = backup_service.restore_backup(temp_path)
-        
-        # Cleanup temp file
-        os.remove(temp_path)
-        
+
         if success:
             record_admin_activity(
                 "backup_restore",
                 "Backup restored",
-                details={"filename": file.filename},
+                details={"filename": file.filename, "size": received},
             )
             return {
                 "success": True,
@@ -1074,6 +1164,10 @@ async def restore_backup(file: UploadFile):
     except Exception as e:
         logger.error(f"Restore failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        # Cleanup temp file
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
 
 
 @router.delete("/backup/delete/{filename}")
@@ -1421,7 +1515,7 @@ async def update_config(config: dict, db: Session = Depends(get_db)):
     Reconciliation tunables remain in the system_config DB table for now;
     the worker reads them lazily each cycle so they apply without restart.
     """
-    from app.auth import hash_password
+    from app.auth import hash_password_async
     from app.config import normalize_smtp_security, settings as _s
 
     updates: dict = {}
@@ -1554,7 +1648,7 @@ async def update_config(config: dict, db: Session = Depends(get_db)):
             label_updates.append("AUTH_REQUIRED")
         new_password = auth.get("password", "")
         if new_password and not _is_masked_value(new_password):
-            updates["admin_password_hash"] = hash_password(new_password)
+            updates["admin_password_hash"] = await hash_password_async(new_password)
             label_updates.append("AUTH_PASSWORD")
         if "local_network_cidr" in auth:
             updates["local_network_cidrs"] = validate_ip_or_cidr_csv(auth["local_network_cidr"])
@@ -1795,107 +1889,144 @@ async def stream_logs():
     return StreamingResponse(log_generator(), media_type="text/event-stream")
 
 
-@router.post("/notifications/mark-old-as-sent")
-async def mark_old_notifications_as_sent(hours_old: int = 24, db: Session = Depends(get_db)):
-    """Mark old notifications as sent without emailing them"""
+def _start_mark_pending_sent_job(kind: str, label: str, created_before: Optional[datetime], details: dict):
+    """Start a background job that marks pending notifications sent in batches."""
+    import asyncio
+    from app.background.ops_maintenance import (
+        count_pending_notifications,
+        mark_pending_batch_as_sent,
+        run_with_session,
+    )
+    from app.services.admin_jobs import start_admin_job
+
+    async def runner(job):
+        # Every batch runs in a worker thread on its own session, so one
+        # waiting on SQLite's write lock doesn't stall webhooks and requests.
+        total, max_id = await asyncio.to_thread(
+            run_with_session, count_pending_notifications, created_before
+        )
+        job.update(processed=0, total=total)
+        processed = 0
+        while max_id is not None:
+            changed = await asyncio.to_thread(
+                run_with_session,
+                mark_pending_batch_as_sent,
+                created_before=created_before,
+                max_id=max_id,
+            )
+            if not changed:
+                break
+            processed += changed
+            job.update(processed=processed)
+        invalidate_cached_counts("notifications")
+        await asyncio.to_thread(
+            record_admin_activity,
+            kind,
+            f"Marked {processed} {label} notification(s) as sent",
+            details={**details, "count": processed, "job_id": job.id},
+        )
+        logger.info(f"Marked {processed} {label} notifications as sent (admin override)")
+        return {"count": processed}
+
+    return start_admin_job(kind, f"Mark {label} notifications as sent", runner)
+
+
+@router.post("/notifications/mark-old-as-sent", status_code=202)
+async def mark_old_notifications_as_sent(hours_old: int = 24):
+    """Mark old notifications as sent without emailing them.
+
+    Runs as a background job; follow it at /sse/jobs/{job_id}.
+    """
     try:
-        from datetime import datetime, timedelta
-        
+        from datetime import timedelta
+
         cutoff = datetime.utcnow() - timedelta(hours=hours_old)
-        
-        # Find old pending notifications
-        old_notifications = db.query(Notification).filter(
-            Notification.sent == False,
-            Notification.created_at < cutoff
-        ).all()
-        
-        count = len(old_notifications)
-        
-        # Mark them as sent
-        for notif in old_notifications:
-            notif.sent = True
-            notif.sent_at = datetime.utcnow()
-        record_admin_activity(
-            "notification_mark_old_sent",
-            f"Marked {count} old notification(s) as sent",
-            details={"hours_old": hours_old, "count": count},
-            db=db,
+        job = _start_mark_pending_sent_job(
+            "notification_mark_old_sent", "old", cutoff, {"hours_old": hours_old}
         )
-        db.commit()
-        
-        logger.info(f"Marked {count} old notifications as sent (older than {hours_old} hours)")
-        
         return {
             "success": True,
-            "message": f"Marked {count} old notifications as sent",
-            "count": count,
-            "cutoff_hours": hours_old
+            "message": "Marking old notifications as sent",
+            "cutoff_hours": hours_old,
+            **job.to_dict(),
         }
-        
     except Exception as e:
         logger.error(f"Failed to mark old notifications: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.post("/notifications/clear-all-pending")
-async def clear_all_pending_notifications(db: Session = Depends(get_db)):
-    """Mark ALL pending notifications as sent without emailing them"""
+@router.post("/notifications/clear-all-pending", status_code=202)
+async def clear_all_pending_notifications():
+    """Mark ALL pending notifications as sent without emailing them.
+
+    Runs as a background job; follow it at /sse/jobs/{job_id}.
+    """
     try:
-        from datetime import datetime
-        
-        # Find ALL pending notifications
-        pending_notifications = db.query(Notification).filter(
-            Notification.sent == False
-        ).all()
-        
-        count = len(pending_notifications)
-        
-        # Mark them as sent
-        for notif in pending_notifications:
-            notif.sent = True
-            notif.sent_at = datetime.utcnow()
-        record_admin_activity(
-            "notification_clear_pending",
-            f"Marked {count} pending notification(s) as sent",
-            details={"count": count},
-            db=db,
+        job = _start_mark_pending_sent_job(
+            "notification_clear_pending", "pending", None, {}
         )
-        db.commit()
-        
-        logger.info(f"Marked {count} pending notifications as sent (admin override)")
-        
         return {
             "success": True,
-            "message": f"Marked {count} pending notifications as sent",
-            "count": count
+            "message": "Marking all pending notifications as sent",
+            **job.to_dict(),
         }
-        
     except Exception as e:
         logger.error(f"Failed to clear pending notifications: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/jobs")
+async def list_jobs():
+    """List recent background admin jobs, newest first."""
+    from app.services.admin_jobs import list_admin_jobs
+
+    return {"jobs": list_admin_jobs()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Return the current state of a background admin job."""
+    from app.services.admin_jobs import get_admin_job
+
+    job = get_admin_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
 @router.delete("/notifications/purge-sent")
-async def purge_sent_notifications(days_old: int = 90, db: Session = Depends(get_db)):
+async def purge_sent_notifications(days_old: int = 90):
     """Delete sent notifications older than the requested retention window."""
     try:
-        from app.background.ops_maintenance import purge_sent_notifications as purge_sent
+        import asyncio
+        from app.background.ops_maintenance import (
+            NOTIFICATION_BATCH_SIZE,
+            purge_cutoff,
+            purge_sent_batch,
+            run_with_session,
+        )
 
         if days_old < 1:
             raise HTTPException(status_code=400, detail="days_old must be at least 1")
         if days_old > 3650:
             raise HTTPException(status_code=400, detail="days_old must be 3650 or less")
 
-        deleted = purge_sent(db, days_old)
-        record_admin_activity(
+        # Batches run in a worker thread (see _start_mark_pending_sent_job).
+        cutoff = purge_cutoff(days_old)
+        deleted = 0
+        while True:
+            changed = await asyncio.to_thread(run_with_session, purge_sent_batch, cutoff)
+            deleted += changed
+            if changed < NOTIFICATION_BATCH_SIZE:
+                break
+        if deleted:
+            invalidate_cached_counts("notifications")
+        await asyncio.to_thread(
+            record_admin_activity,
             "notification_purge",
             f"Purged {deleted} sent notification(s)",
             details={"days_old": days_old, "count": deleted},
-            db=db,
         )
-        db.commit()
 
         logger.info("Purged %s sent notification(s) older than %s days", deleted, days_old)
         return {
@@ -1908,7 +2039,6 @@ async def purge_sent_notifications(days_old: int = 90, db: Session = Depends(get
         raise
     except Exception as e:
         logger.error(f"Failed to purge sent notifications: {e}")
-        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -1976,13 +2106,40 @@ async def manual_quality_release_check():
 # ===== Issues Management =====
 
 @router.get("/issues")
-async def get_issues(db: Session = Depends(get_db)):
-    """Get all reported issues"""
+async def get_issues(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """List reported issues, newest first, with keyset pagination via `cursor`."""
     try:
         from app.database import ReportedIssue
-        
-        issues = db.query(ReportedIssue).order_by(ReportedIssue.created_at.desc()).all()
-        
+
+        filters = []
+        if status:
+            filters.append(ReportedIssue.status == status)
+        if q:
+            filters.append(or_(ReportedIssue.title.icontains(q, autoescape=True), User.username.icontains(q, autoescape=True)))
+
+        query = (
+            db.query(ReportedIssue)
+            .outerjoin(ReportedIssue.user)
+            .options(contains_eager(ReportedIssue.user))
+            .filter(*filters)
+        )
+        try:
+            issues, next_cursor = keyset_page(
+                query, ReportedIssue.created_at, ReportedIssue.id, limit, cursor
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        total = cached_count(
+            ("reported_issues", status, q),
+            lambda: db.query(func.count(ReportedIssue.id)).outerjoin(ReportedIssue.user).filter(*filters).scalar(),
+        )
+
         result = []
         for issue in issues:
             result.append({
@@ -2003,8 +2160,10 @@ async def get_issues(db: Session = Depends(get_db)):
                 "created_at": issue.created_at.isoformat() if issue.created_at else None,
                 "resolved_at": issue.resolved_at.isoformat() if issue.resolved_at else None,
             })
-        
-        return result
+
+        return {"issues": result, "total": total, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get issues: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2125,6 +2284,7 @@ async def delete_issue(issue_id: int, db: Session = Depends(get_db)):
         
         db.delete(issue)
         db.commit()
+        invalidate_cached_counts("reported_issues")
         
         return {"success": True, "message": f"Issue #{issue_id} deleted"}
     except HTTPException:
@@ -2259,6 +2419,7 @@ async def request_on_behalf(
         
         # Create request in Jellyseerr
         from app.config import settings
+        from app.services.upstream_metrics import upstream_client
         import httpx
         
         jellyseerr_url = normalize_http_url(settings.jellyseerr_url)
@@ -2267,7 +2428,7 @@ async def request_on_behalf(
         # First, get the media details
         media_endpoint = f"{jellyseerr_url}/api/v1/{'movie' if media_type == 'movie' else 'tv'}/{tmdb_id}"
         
-        async with httpx.AsyncClient() as client:
+        async with upstream_client("Seerr") as client:
             # Get media details
             media_response = await client.get(
                 media_endpoint,
@@ -2348,26 +2509,16 @@ async def request_on_behalf(
 
 
 @router.get("/seerr-sonarr-servers")
-async def get_seerr_sonarr_servers():
+async def get_seerr_sonarr_servers(refresh: bool = False):
     """Fetch configured Sonarr servers from Jellyseerr/Seerr to discover server IDs and profiles"""
     try:
-        import httpx
-        from app.config import settings
-        
-        jellyseerr_url = normalize_http_url(settings.jellyseerr_url)
-        api_key = settings.jellyseerr_api_key
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{jellyseerr_url}/api/v1/settings/sonarr",
-                headers={"X-Api-Key": api_key}
-            )
-            response.raise_for_status()
-            servers = response.json()
+        from app.services.arr_metadata import SEERR_INSTANCE, get_metadata
+
+        servers = await get_metadata(SEERR_INSTANCE, "sonarr_servers", refresh=refresh)
         
         # Return simplified server info for the UI
         result = []
-        for server in servers:
+        for server in servers or []:
             result.append({
                 "id": server.get("id"),
                 "name": server.get("name"),
@@ -2387,6 +2538,36 @@ async def get_seerr_sonarr_servers():
         raise HTTPException(status_code=500, detail=f"Failed to fetch servers: {str(e)}")
 
 
+@router.get("/metadata-cache")
+async def get_metadata_cache():
+    """Return what is cached from Sonarr/Radarr/Seerr settings and how old it is."""
+    try:
+        from app.services.arr_metadata import metadata_cache_status
+
+        return {"entries": metadata_cache_status()}
+    except Exception as e:
+        logger.error(f"Failed to get metadata cache status: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/metadata-cache/refresh")
+async def refresh_metadata_cache(instance: Optional[str] = None):
+    """Refetch quality profiles, root folders, tags and Seerr server lists now."""
+    try:
+        from app.services.arr_metadata import refresh_metadata
+
+        result = await refresh_metadata([instance] if instance else None)
+        record_admin_activity(
+            "metadata_cache_refresh",
+            f"Refreshed metadata cache for {sanitize_for_log(instance) if instance else 'all instances'}",
+        )
+        failed = any(status != "ok" for kinds in result.values() for status in kinds.values())
+        return {"success": not failed, "instances": result}
+    except Exception as e:
+        logger.error(f"Failed to refresh metadata cache: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/test-smtp")
 async def test_email_connection(data: dict):
     """Test SMTP email connection"""
@@ -2622,6 +2803,7 @@ async def create_maintenance_window(data: dict, db: Session = Depends(get_db)):
         db.add(window)
         db.commit()
         db.refresh(window)
+        refresh_maintenance_state(db)
         
         logger.info(
             "Created maintenance window '%s' (%s - %s)",
@@ -2692,6 +2874,7 @@ async def update_maintenance_window(window_id: int, data: dict, db: Session = De
             window.status = "scheduled"
         
         db.commit()
+        refresh_maintenance_state(db)
         
         # Optionally send update announcement
         email_result = None
@@ -2741,6 +2924,7 @@ async def complete_maintenance_window(window_id: int, db: Session = Depends(get_
         window.completion_sent = True
         window.updated_at = datetime.utcnow()
         db.commit()
+        refresh_maintenance_state(db)
         
         logger.info(
             "Manually completed maintenance window '%s' (id=%s)",
@@ -2786,6 +2970,7 @@ async def cancel_maintenance_window(window_id: int, data: dict = None, db: Sessi
         window.status = "cancelled"
         window.updated_at = datetime.utcnow()
         db.commit()
+        refresh_maintenance_state(db)
         
         logger.info(
             "Cancelled maintenance window '%s' (id=%s)",
@@ -2817,6 +3002,7 @@ async def delete_maintenance_window(window_id: int, db: Session = Depends(get_db
         title = window.title
         db.delete(window)
         db.commit()
+        refresh_maintenance_state(db)
         
         logger.info(
             "Deleted maintenance window '%s' (id=%s)",
@@ -21,7 +21,7 @@ from app.auth import (
     get_client_ip,
     is_local_network,
     login_attempt_allowed,
-    verify_password,
+    verify_password_async,
     verify_session_token,
     verify_turnstile,
 )
@@ -107,7 +107,7 @@ async def auth_login(payload: LoginPayload, request: Request) -> JSONResponse:
             status_code=500, content={"detail": "No admin password configured"}
         )
 
-    if not verify_password(payload.password, settings.admin_password_hash):
+    if not await verify_password_async(payload.password, settings.admin_password_hash):
         logger.warning(f"failed login from {client_ip}")
         return JSONResponse(status_code=401, content={"detail": "Invalid password"})
 
@@ -27,7 +27,7 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, Field
 
-from app.auth import hash_password
+from app.auth import hash_password_async
 from app.config import normalize_smtp_security, settings
 from app.security import normalize_http_url, validate_ip_or_cidr_csv
 
@@ -172,7 +172,7 @@ async def save_setup(
         raise HTTPException(status_code=400, detail=str(e))
 
     if payload.admin_password:
-        config["admin_password_hash"] = hash_password(payload.admin_password)
+        config["admin_password_hash"] = await hash_password_async(payload.admin_password)
 
     if not config.get("app_secret_key"):
         # 32 bytes hex = 256 bits; matches v1's recommended `secrets.token_hex(32)`.
@@ -58,3 +58,45 @@ async def stream_stats(db: Session = Depends(get_db)):
             "X-Accel-Buffering": "no",  # Disable nginx buffering
         }
     )
+
+
+async def job_event_generator(job_id: str):
+    """Emit the job's state on every progress update until it finishes."""
+    from app.services.admin_jobs import get_admin_job
+
+    job = get_admin_job(job_id)
+    if job is None:
+        yield f"event: error\ndata: {json.dumps({'detail': 'Job not found'})}\n\n"
+        return
+
+    changed = job.subscribe()
+    try:
+        while True:
+            try:
+                # Wake up periodically even without progress so proxies see
+                # traffic and a vanished client is noticed.
+                await asyncio.wait_for(changed.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            changed.clear()
+            yield f"data: {json.dumps(job.to_dict())}\n\n"
+            if job.finished:
+                break
+    except asyncio.CancelledError:
+        pass
+    finally:
+        job.unsubscribe(changed)
+
+
+@router.get("/jobs/{job_id}")
+async def stream_job(job_id: str):
+    """Stream progress of a background admin job via SSE"""
+    return StreamingResponse(
+        job_event_generator(job_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
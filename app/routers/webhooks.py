@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
+import asyncio
 import hmac
-import ipaddress
 from sqlalchemy.orm import Session
 import logging
 from datetime import datetime, timedelta
@@ -8,7 +8,7 @@ from typing import List, Optional
 
 from app.database import get_db, MediaRequest, EpisodeTracking, Notification, User, SessionLocal
 from app.schemas import SonarrWebhook, RadarrWebhook, WebhookResponse
-from app.services.email_service import EmailService
+from app.services.email_service import EmailService, drain_pending_notifications
 from app.services.notification_history import (
     episode_dedupe_key,
     has_delivery,
@@ -16,12 +16,25 @@ from app.services.notification_history import (
 )
 from app.services.pushover_service import PushoverService
 from app.services.sonarr_service import SonarrService
+from app.services.user_directory import fetch_missing_user, find_user
 from app.config import settings
-from app.security import clean_email_address, sanitize_for_log
+from app.db_writer import run_write
+from app.metrics import Histogram, register_metric
+from app.security import clean_email_address, get_network_acl, sanitize_for_log
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Upper bound on how long a series' Download batch keeps waiting for more
+# imports before it is processed.
+DOWNLOAD_BATCH_MAX_WAIT_SECONDS = 30
+
+SONARR_DOWNLOAD_BATCH_EPISODES = register_metric(Histogram(
+    "sonarr_download_batch_episodes",
+    "Episodes per debounced Sonarr Download batch.",
+    buckets=(1, 2, 5, 10, 25, 50, 100),
+))
+
 
 def _coerce_positive_int(value) -> Optional[int]:
     """Return a positive integer from Seerr's mixed template values."""
@@ -143,17 +156,8 @@ def _check_webhook_auth(request: Request):
     allowed = (settings.webhook_allowed_ips or "").strip()
     if not allowed:
         return
-    allowed_list = [ip.strip() for ip in allowed.split(",") if ip.strip()]
-    for allowed_ip in allowed_list:
-        try:
-            if "/" in allowed_ip:
-                if ipaddress.ip_address(client_ip) in ipaddress.ip_network(allowed_ip, strict=False):
-                    return
-            else:
-                if client_ip == allowed_ip:
-                    return
-        except ValueError:
-            continue
+    if get_network_acl(allowed).contains(client_ip):
+        return
     logger.warning("Webhook rejected: IP %s not in allowed list", client_ip)
     raise HTTPException(status_code=403, detail="Forbidden")
 
@@ -165,13 +169,32 @@ def _notification_initial_delay() -> timedelta:
     return timedelta(minutes=minutes)
 
 
+def _cancel_quality_waiting(db: Session, media_type: str, tmdb_id: int) -> Optional[int]:
+    """Write unit: drop unsent quality_waiting notifications for a title.
+
+    Returns how many were deleted, or None if nobody requested it.
+    """
+    request_ids = [
+        request_id for (request_id,) in db.query(MediaRequest.id).filter(
+            MediaRequest.media_type == media_type,
+            MediaRequest.tmdb_id == tmdb_id
+        )
+    ]
+    if not request_ids:
+        return None
+    return db.query(Notification).filter(
+        Notification.request_id.in_(request_ids),
+        Notification.notification_type == "quality_waiting",
+        Notification.sent == False
+    ).delete(synchronize_session=False)
+
+
 async def _process_pending_notifications_background():
-    """Background-task wrapper with its own DB session."""
-    db = SessionLocal()
+    """Background-task wrapper; concurrent triggers share one drain."""
     try:
-        await email_service.process_pending_notifications(db)
-    finally:
-        db.close()
+        await drain_pending_notifications("webhook")
+    except Exception as e:
+        logger.error(f"Background notification processing failed: {e}", exc_info=True)
 
 
 @router.post("/sonarr", response_model=WebhookResponse)
@@ -199,26 +222,12 @@ async def sonarr_webhook(
                 logger.warning("Series %s has no TMDB ID", sanitize_for_log(webhook.series.title))
                 return WebhookResponse(success=False, message="Series has no TMDB ID")
             
-            # Find all requests for this series
-            requests = db.query(MediaRequest).filter(
-                MediaRequest.media_type == "tv",
-                MediaRequest.tmdb_id == tmdb_id
-            ).all()
-            
-            if not requests:
-                return WebhookResponse(success=True, message="No matching requests found")
-            
             # Cancel any pending quality_waiting notifications since download is starting
-            cancelled_count = 0
-            for request in requests:
-                cancelled = db.query(Notification).filter(
-                    Notification.request_id == request.id,
-                    Notification.notification_type == "quality_waiting",
-                    Notification.sent == False
-                ).delete()
-                cancelled_count += cancelled
-            
-            db.commit()
+            cancelled_count = await run_write(
+                lambda write_db: _cancel_quality_waiting(write_db, "tv", tmdb_id), "grab"
+            )
+            if cancelled_count is None:
+                return WebhookResponse(success=True, message="No matching requests found")
             
             if cancelled_count > 0:
                 logger.info(
@@ -240,228 +249,316 @@ async def sonarr_webhook(
     if webhook.eventType != "Download":
         return WebhookResponse(success=False, message=f"Unsupported event type: {webhook.eventType}")
     
+    if not webhook.series.tmdbId:
+        logger.warning("Series %s has no TMDB ID", sanitize_for_log(webhook.series.title))
+        return WebhookResponse(success=False, message="Series has no TMDB ID")
+    
+    # A season import fires one Download webhook per file; collect them per
+    # series and process the batch once the imports go quiet.
+    queued = _queue_sonarr_download(webhook)
+    return WebhookResponse(
+        success=True,
+        message=f"Queued {queued} episode(s) for {webhook.series.title}",
+        processed_items=queued
+    )
+
+
+# ----------------------------------------------------------------------
+# Sonarr Download batching
+# ----------------------------------------------------------------------
+# Sonarr series id -> {"series", "episodes": {(season, episode): (episode,
+# quality_cutoff_met)}, "first_at", "due_at" (event loop time), "task"}
+_pending_downloads: dict[int, dict] = {}
+_download_tasks: set[asyncio.Task] = set()
+
+
+def _queue_sonarr_download(webhook: SonarrWebhook) -> int:
+    """Add a Download webhook's episodes to its series' pending batch.
+
+    The batch is processed webhook_download_debounce_seconds after the last
+    webhook for the series, or DOWNLOAD_BATCH_MAX_WAIT_SECONDS after the
+    first, whichever comes first. Returns the number of episodes queued.
+    """
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    debounce = max(0, int(settings.webhook_download_debounce_seconds or 0))
+    series_id = webhook.series.id
+    batch = _pending_downloads.get(series_id)
+    if batch is None:
+        batch = _pending_downloads[series_id] = {"episodes": {}, "first_at": now}
+        batch["task"] = asyncio.ensure_future(_run_download_batch(series_id))
+        _download_tasks.add(batch["task"])
+        batch["task"].add_done_callback(_download_tasks.discard)
+    batch["series"] = webhook.series
+    batch["due_at"] = min(now + debounce, batch["first_at"] + DOWNLOAD_BATCH_MAX_WAIT_SECONDS)
+    # Last import wins for a re-downloaded (e.g. upgraded) episode.
+    quality_cutoff_met = not (webhook.episodeFile or {}).get('qualityCutoffNotMet', False)
+    for episode in webhook.episodes or []:
+        batch["episodes"][(episode.seasonNumber, episode.episodeNumber)] = (episode, quality_cutoff_met)
+    return len(webhook.episodes or [])
+
+
+async def _run_download_batch(series_id: int):
+    loop = asyncio.get_running_loop()
+    while True:
+        delay = _pending_downloads[series_id]["due_at"] - loop.time()
+        if delay <= 0:
+            break
+        await asyncio.sleep(delay)
+    await _process_download_batch(_pending_downloads.pop(series_id))
+
+
+async def _process_download_batch(batch: dict):
+    episodes = sorted(batch["episodes"].values(), key=lambda item: (item[0].seasonNumber, item[0].episodeNumber))
+    SONARR_DOWNLOAD_BATCH_EPISODES.observe(len(episodes))
+    try:
+        await _process_sonarr_download(batch["series"], episodes)
+    except Exception as e:
+        logger.error(
+            "Error processing Sonarr downloads for %s: %s",
+            sanitize_for_log(batch["series"].title),
+            e,
+            exc_info=True,
+        )
+
+
+async def flush_sonarr_downloads():
+    """Process every pending Download batch now (used at shutdown)."""
+    batches = list(_pending_downloads.values())
+    _pending_downloads.clear()
+    for batch in batches:
+        batch["task"].cancel()
+    for batch in batches:
+        await _process_download_batch(batch)
+    # Batches whose window had already closed are mid-processing.
+    if _download_tasks:
+        await asyncio.gather(*_download_tasks, return_exceptions=True)
+
+
+async def _process_sonarr_download(series, episodes: list):
+    """Track a batch of imported episodes and queue their notifications.
+
+    `episodes` is a list of (SonarrEpisode, quality_cutoff_met) for one series.
+    """
+    tmdb_id = series.tmdbId
+    db = SessionLocal()
     try:
-        # Get series TMDB ID
-        tmdb_id = webhook.series.tmdbId
-        if not tmdb_id:
-            logger.warning("Series %s has no TMDB ID", sanitize_for_log(webhook.series.title))
-            return WebhookResponse(success=False, message="Series has no TMDB ID")
-        
         # Find all requests for this series
-        requests = db.query(MediaRequest).filter(
+        request_count = db.query(MediaRequest).filter(
             MediaRequest.media_type == "tv",
             MediaRequest.tmdb_id == tmdb_id
-        ).all()
-        
-        if not requests:
-            logger.info(f"No requests found for series TMDB ID {tmdb_id}")
-            return WebhookResponse(success=True, message="No matching requests found")
-        
-        logger.info("Found %s request(s) for series: %s", len(requests), sanitize_for_log(webhook.series.title))
-        
-        # Process episodes - batch by user
-        # Structure: {user_id: {request_id: [episodes]}}
-        user_episode_batches = {}
-        
-        for episode in webhook.episodes or []:
-            for request in requests:
-                # Get all users for this request (original + shared)
-                users_to_notify = [request.user]
-                
-                # Add shared users
-                from app.database import SharedRequest
-                shared_requests = db.query(SharedRequest).filter(
-                    SharedRequest.request_id == request.id
-                ).all()
-                for shared in shared_requests:
-                    users_to_notify.append(shared.user)
-                
-                # Filter out inactive users
-                users_to_notify = [u for u in users_to_notify if not hasattr(u, 'is_active') or u.is_active]
-                
-                # Track episode ONCE per request (not per user)
-                episode_tracking = db.query(EpisodeTracking).filter(
-                    EpisodeTracking.request_id == request.id,
-                    EpisodeTracking.series_id == webhook.series.id,
-                    EpisodeTracking.season_number == episode.seasonNumber,
-                    EpisodeTracking.episode_number == episode.episodeNumber
-                ).first()
-                
-                if not episode_tracking:
-                    # Create new episode tracking
-                    episode_tracking = EpisodeTracking(
-                        request_id=request.id,
-                        series_id=webhook.series.id,
-                        season_number=episode.seasonNumber,
-                        episode_number=episode.episodeNumber,
-                        episode_title=episode.title,
-                        air_date=datetime.fromisoformat(episode.airDateUtc.replace('Z', '+00:00')) if episode.airDateUtc else None,
-                        notified=False,
-                        available_in_plex=True
-                    )
-                    db.add(episode_tracking)
-                else:
-                    # Update existing tracking
-                    episode_tracking.available_in_plex = True
-                    episode_tracking.episode_title = episode.title
-                
-                # Now notify all users
-                for user in users_to_notify:
-                    existing_notification = db.query(Notification).filter(
-                        Notification.user_id == user.id,
-                        Notification.request_id == request.id,
-                        Notification.notification_type == "episode",
-                        Notification.subject.contains(f"S{episode.seasonNumber:02d}E{episode.episodeNumber:02d}")
-                    ).first()
-                    delivered = episode_tracking.notified or has_delivery(
-                        db,
-                        user_id=user.id,
-                        request_id=request.id,
-                        notification_type="episode",
-                        dedupe_key=episode_dedupe_key(
-                            webhook.series.id,
-                            episode.seasonNumber,
-                            episode.episodeNumber,
-                        ),
-                    )
-                    
-                    # Only add to batch if not already notified
-                    if not existing_notification and not delivered:
-                        # Initialize user batch if needed
-                        if user.id not in user_episode_batches:
-                            user_episode_batches[user.id] = {
-                                'user': user,
-                                'request_id': request.id,
-                                'tmdb_id': request.tmdb_id,
-                                'episodes': []
-                            }
-                        
-                        # Add episode to user's batch
-                        user_episode_batches[user.id]['episodes'].append({
-                            'season': episode.seasonNumber,
-                            'episode': episode.episodeNumber,
-                            'title': episode.title,
-                            'air_date': episode.airDate,
-                            'tracking': episode_tracking
-                        })
-        
-        # Now create one notification row per episode so durable dedupe remains per-episode.
-        # First, check if the downloaded episodes meet quality cutoff
-        quality_cutoff_met = True
-        if webhook.episodeFile:
-            quality_cutoff_met = not webhook.episodeFile.get('qualityCutoffNotMet', False)
-            logger.info(f"Episodes downloaded - Quality cutoff met: {quality_cutoff_met}")
-        
-        # Only cancel quality_waiting notifications if quality is correct
-        if quality_cutoff_met:
-            cancelled_count = 0
-            for request in requests:
-                cancelled = db.query(Notification).filter(
-                    Notification.request_id == request.id,
-                    Notification.notification_type == "quality_waiting",
-                    Notification.sent == False
-                ).delete()
-                cancelled_count += cancelled
-            
-            if cancelled_count > 0:
-                logger.info(f"Cancelled {cancelled_count} pending quality_waiting notification(s) - correct quality downloaded")
-        else:
-            logger.info(f"Quality cutoff not met - skipping 'Episodes Available' notifications, keeping quality_waiting active")
-            # Don't process episode notifications - quality isn't right yet
-            return WebhookResponse(
-                success=True,
-                message=f"Episodes downloaded but quality cutoff not met - waiting for correct quality",
-                processed_items=0
+        ).count()
+    finally:
+        db.close()
+    
+    if not request_count:
+        logger.info(f"No requests found for series TMDB ID {tmdb_id}")
+        return
+    
+    logger.info(
+        "Found %s request(s) for series: %s (%s episode(s) imported)",
+        request_count,
+        sanitize_for_log(series.title),
+        len(episodes),
+    )
+    
+    # Only episodes whose file meets the quality cutoff get "Episodes
+    # Available" notifications; the rest keep quality_waiting active.
+    ready_episodes = [episode for episode, quality_cutoff_met in episodes if quality_cutoff_met]
+    if len(ready_episodes) < len(episodes):
+        logger.info(
+            f"Quality cutoff not met for {len(episodes) - len(ready_episodes)} episode(s) - "
+            f"skipping their 'Episodes Available' notifications"
+        )
+    if not ready_episodes:
+        return
+    
+    # Upstream calls happen before the write unit, which must not await.
+    from app.services.tmdb_service import TMDBService
+    tmdb_service = TMDBService(settings.jellyseerr_url, settings.jellyseerr_api_key)
+    poster_url = await tmdb_service.get_tv_poster(tmdb_id)
+    
+    notifications_created, pushover_episodes = await run_write(
+        lambda db: _record_sonarr_download(db, series, ready_episodes, poster_url),
+        "sonarr_download",
+    )
+
+    if notifications_created > 0:
+        try:
+            await PushoverService().send_episode_available(
+                series_title=series.title,
+                episodes=pushover_episodes,
+                notification_count=notifications_created,
             )
-        
-        notifications_created = 0
-        for user_id, batch in user_episode_batches.items():
-            if not batch['episodes']:
-                continue
+        except Exception as e:
+            logger.warning(f"Pushover episode alert failed: {e}")
+    
+    # Check if this download resolves any reported issues
+    await _check_issue_resolution(tmdb_id, "tv")
+    
+    # Send pending notifications
+    await _process_pending_notifications_background()
+
+
+def _record_sonarr_download(db: Session, series, ready_episodes: list, poster_url: Optional[str]) -> tuple:
+    """Write unit: episode tracking + notification rows for a Download batch.
+
+    Returns (notifications created, distinct episodes for the Pushover alert).
+    """
+    requests = db.query(MediaRequest).filter(
+        MediaRequest.media_type == "tv",
+        MediaRequest.tmdb_id == series.tmdbId
+    ).all()
+    
+    # Get all users for each request (original + shared), active only
+    from app.database import SharedRequest
+    users_by_request = {}
+    for request in requests:
+        users_to_notify = [request.user]
+        shared_requests = db.query(SharedRequest).filter(
+            SharedRequest.request_id == request.id
+        ).all()
+        for shared in shared_requests:
+            users_to_notify.append(shared.user)
+        users_by_request[request.id] = [
+            u for u in users_to_notify if not hasattr(u, 'is_active') or u.is_active
+        ]
+    
+    # Process episodes - batch by user
+    # Structure: {user_id: {request_id: [episodes]}}
+    user_episode_batches = {}
+    
+    for episode in ready_episodes:
+        for request in requests:
+            users_to_notify = users_by_request[request.id]
             
-            # Get poster URL
-            from app.services.tmdb_service import TMDBService
-            from app.config import settings
-            tmdb_service = TMDBService(settings.jellyseerr_url, settings.jellyseerr_api_key)
-            poster_url = await tmdb_service.get_tv_poster(batch['tmdb_id'])
+            # Track episode ONCE per request (not per user)
+            episode_tracking = db.query(EpisodeTracking).filter(
+                EpisodeTracking.request_id == request.id,
+                EpisodeTracking.series_id == series.id,
+                EpisodeTracking.season_number == episode.seasonNumber,
+                EpisodeTracking.episode_number == episode.episodeNumber
+            ).first()
             
-            for ep in batch['episodes']:
-                html_body = email_service.render_episode_notification(
-                    series_title=webhook.series.title,
-                    episodes=[ep],
-                    poster_url=poster_url
+            if not episode_tracking:
+                # Create new episode tracking
+                episode_tracking = EpisodeTracking(
+                    request_id=request.id,
+                    series_id=series.id,
+                    season_number=episode.seasonNumber,
+                    episode_number=episode.episodeNumber,
+                    episode_title=episode.title,
+                    air_date=datetime.fromisoformat(episode.airDateUtc.replace('Z', '+00:00')) if episode.airDateUtc else None,
+                    notified=False,
+                    available_in_plex=True
                 )
-                subject = f"New Episode: {webhook.series.title} S{ep['season']:02d}E{ep['episode']:02d}"
-
-                # Give Plex time to index and let nearby episode imports batch.
-                send_after = datetime.utcnow() + _notification_initial_delay()
-
-                notification = Notification(
-                    user_id=batch['user'].id,
-                    request_id=batch['request_id'],
+                db.add(episode_tracking)
+            else:
+                # Update existing tracking
+                episode_tracking.available_in_plex = True
+                episode_tracking.episode_title = episode.title
+            
+            # Now notify all users
+            for user in users_to_notify:
+                existing_notification = db.query(Notification).filter(
+                    Notification.user_id == user.id,
+                    Notification.request_id == request.id,
+                    Notification.notification_type == "episode",
+                    Notification.subject.contains(f"S{episode.seasonNumber:02d}E{episode.episodeNumber:02d}")
+                ).first()
+                delivered = episode_tracking.notified or has_delivery(
+                    db,
+                    user_id=user.id,
+                    request_id=request.id,
                     notification_type="episode",
-                    subject=subject,
-                    body=html_body,
-                    send_after=send_after,
-                    series_id=webhook.series.id  # Store series ID for smart batching
-                )
-                db.add(notification)
-                notifications_created += 1
-
-                logger.info(
-                    "Created episode notification for %s: S%02dE%02d, will send after %s",
-                    batch['user'].email,
-                    ep['season'],
-                    ep['episode'],
-                    send_after,
+                    dedupe_key=episode_dedupe_key(
+                        series.id,
+                        episode.seasonNumber,
+                        episode.episodeNumber,
+                    ),
                 )
+                
+                # Only add to batch if not already notified
+                if not existing_notification and not delivered:
+                    # Initialize user batch if needed
+                    if user.id not in user_episode_batches:
+                        user_episode_batches[user.id] = {
+                            'user': user,
+                            'request_id': request.id,
+                            'tmdb_id': request.tmdb_id,
+                            'episodes': []
+                        }
+                    
+                    # Add episode to user's batch
+                    user_episode_batches[user.id]['episodes'].append({
+                        'season': episode.seasonNumber,
+                        'episode': episode.episodeNumber,
+                        'title': episode.title,
+                        'air_date': episode.airDate,
+                        'tracking': episode_tracking
+                    })
+    
+    # Correct quality downloaded - cancel pending quality_waiting notifications
+    cancelled_count = 0
+    for request in requests:
+        cancelled = db.query(Notification).filter(
+            Notification.request_id == request.id,
+            Notification.notification_type == "quality_waiting",
+            Notification.sent == False
+        ).delete()
+        cancelled_count += cancelled
+    
+    if cancelled_count > 0:
+        logger.info(f"Cancelled {cancelled_count} pending quality_waiting notification(s) - correct quality downloaded")
+    
+    # Now create one notification row per episode so durable dedupe remains per-episode.
+    notifications_created = 0
+    for user_id, batch in user_episode_batches.items():
+        if not batch['episodes']:
+            continue
         
-        try:
-            db.commit()
-        except Exception as e:
-            # Handle duplicate episode tracking (race condition from multiple webhooks)
-            if "duplicate key value violates unique constraint" in str(e):
-                logger.warning(f"Duplicate episode detected (likely from multiple webhooks), rolling back: {e}")
-                db.rollback()
-                # Continue without error - the episode was already tracked
-            else:
-                # Re-raise other errors
-                db.rollback()
-                raise
+        for ep in batch['episodes']:
+            html_body = email_service.render_episode_notification(
+                series_title=series.title,
+                episodes=[ep],
+                poster_url=poster_url
+            )
+            subject = f"New Episode: {series.title} S{ep['season']:02d}E{ep['episode']:02d}"
 
-        if notifications_created > 0:
-            pushover_episodes = []
-            seen_episode_keys = set()
-            for batch in user_episode_batches.values():
-                for ep in batch.get('episodes', []):
-                    key = (ep.get('season'), ep.get('episode'))
-                    if key in seen_episode_keys:
-                        continue
-                    seen_episode_keys.add(key)
-                    pushover_episodes.append(ep)
-            background_tasks.add_task(
-                PushoverService().send_episode_available,
-                series_title=webhook.series.title,
-                episodes=pushover_episodes,
-                notification_count=notifications_created,
+            # Give Plex time to index and let nearby episode imports batch.
+            send_after = datetime.utcnow() + _notification_initial_delay()
+
+            notification = Notification(
+                user_id=batch['user'].id,
+                request_id=batch['request_id'],
+                notification_type="episode",
+                subject=subject,
+                body=html_body,
+                send_after=send_after,
+                series_id=series.id  # Store series ID for smart batching
             )
-        
-        # Check if this download resolves any reported issues
-        background_tasks.add_task(_check_issue_resolution, webhook.series.tmdbId, "tv")
-        
-        # Send pending notifications in background
-        background_tasks.add_task(_process_pending_notifications_background)
-        
-        return WebhookResponse(
-            success=True,
-            message=f"Processed {len(webhook.episodes or [])} episodes",
-            processed_items=notifications_created
-        )
-        
-    except Exception as e:
-        logger.error(f"Error processing Sonarr webhook: {e}", exc_info=True)
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Internal server error")
+            db.add(notification)
+            notifications_created += 1
+
+            logger.info(
+                "Created episode notification for %s: S%02dE%02d, will send after %s",
+                batch['user'].email,
+                ep['season'],
+                ep['episode'],
+                send_after,
+            )
+    
+    # Distinct episodes for the Pushover alert (detached from the session)
+    pushover_episodes = []
+    seen_episode_keys = set()
+    for batch in user_episode_batches.values():
+        for ep in batch.get('episodes', []):
+            key = (ep.get('season'), ep.get('episode'))
+            if key in seen_episode_keys:
+                continue
+            seen_episode_keys.add(key)
+            pushover_episodes.append({k: v for k, v in ep.items() if k != 'tracking'})
+    return notifications_created, pushover_episodes
 
 
 @router.post("/radarr", response_model=WebhookResponse)
@@ -486,26 +583,12 @@ async def radarr_webhook(
         try:
             tmdb_id = webhook.movie.tmdbId
             
-            # Find all requests for this movie
-            requests = db.query(MediaRequest).filter(
-                MediaRequest.media_type == "movie",
-                MediaRequest.tmdb_id == tmdb_id
-            ).all()
-            
-            if not requests:
-                return WebhookResponse(success=True, message="No matching requests found")
-            
             # Cancel any pending quality_waiting notifications since download is starting
-            cancelled_count = 0
-            for request in requests:
-                cancelled = db.query(Notification).filter(
-                    Notification.request_id == request.id,
-                    Notification.notification_type == "quality_waiting",
-                    Notification.sent == False
-                ).delete()
-                cancelled_count += cancelled
-            
-            db.commit()
+            cancelled_count = await run_write(
+                lambda write_db: _cancel_quality_waiting(write_db, "movie", tmdb_id), "grab"
+            )
+            if cancelled_count is None:
+                return WebhookResponse(success=True, message="No matching requests found")
             
             if cancelled_count > 0:
                 logger.info(f"Grab event: Cancelled {cancelled_count} pending quality_waiting notification(s) for {webhook.movie.title} - download started")
@@ -711,25 +794,14 @@ async def jellyseerr_webhook(
                     user_email = item.get('value')
         
         # Find or create user
-        user = None
-        if user_email:
-            user = db.query(User).filter(User.email == user_email).first()
-        
-        if not user and user_username:
-            user = db.query(User).filter(User.username == user_username).first()
+        user = find_user(db, email=user_email, username=user_username)
         
         if not user:
-            # Try to sync users from Jellyseerr to find this user
-            logger.info("User not found, attempting sync...")
-            from app.services.jellyseerr_sync import JellyseerrSyncService
-            sync_service = JellyseerrSyncService()
-            await sync_service.sync_users()
-            
-            # Try again
-            if user_email:
-                user = db.query(User).filter(User.email == user_email).first()
-            if not user and user_username:
-                user = db.query(User).filter(User.username == user_username).first()
+            # Fetch just this request's user from Seerr instead of re-syncing everyone
+            logger.info("User not found, fetching from Seerr...")
+            user_id = await fetch_missing_user(request_id=request_data.get('request_id'))
+            if user_id:
+                user = db.get(User, user_id)
         
         if not user:
             logger.error(f"Could not find or create user: {user_email or user_username}")
@@ -825,11 +897,8 @@ async def check_request_quality_status(request_id: int):
                 return
 
             monitor = QualityReleaseMonitor()
-
-            if request.media_type == 'tv':
-                await monitor._check_tv_show(request, db)
-            elif request.media_type == 'movie':
-                await monitor._check_movie(request, db)
+            await monitor.check_request(request, db)
+            db.commit()
 
             logger.info(f"Completed immediate quality check for request {request_id}")
         finally:
@@ -839,6 +908,27 @@ async def check_request_quality_status(request_id: int):
         logger.error(f"Failed to check request quality: {e}")
 
 
+async def _backfill_issue_user(reported_issue_id: int, seerr_issue_id: int):
+    """Fetch an issue's unknown reporter from Seerr and attach them to the issue."""
+    from app.database import ReportedIssue
+    
+    user_id = await fetch_missing_user(issue_id=seerr_issue_id)
+    if not user_id:
+        return
+    db = SessionLocal()
+    try:
+        db.query(ReportedIssue).filter(
+            ReportedIssue.id == reported_issue_id,
+            ReportedIssue.user_id.is_(None),
+        ).update({"user_id": user_id}, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to attach reporter to issue {reported_issue_id}: {e}")
+    finally:
+        db.close()
+
+
 async def _handle_issue_webhook(webhook: dict, background_tasks: BackgroundTasks, db: Session):
     """Handle ISSUE_CREATED / ISSUE_COMMENT webhooks from Seerr"""
     from app.database import ReportedIssue
@@ -944,11 +1034,7 @@ async def _handle_issue_webhook(webhook: dict, background_tasks: BackgroundTasks
             reported_by_email = issue.get('reportedBy_email')
         
         # Find user in our database
-        user = None
-        if reported_by_email:
-            user = db.query(User).filter(User.email == reported_by_email).first()
-        if not user and reported_by_username:
-            user = db.query(User).filter(User.username == reported_by_username).first()
+        user = find_user(db, email=reported_by_email, username=reported_by_username)
         
         # Find matching media request
         request_obj = db.query(MediaRequest).filter(
@@ -981,6 +1067,10 @@ async def _handle_issue_webhook(webhook: dict, background_tasks: BackgroundTasks
                 scope += f"E{episode_number:02d}"
         logger.info(f"Issue reported: {title}{scope} ({media_type}) - Type: {issue_type} - By: {reported_by_username or 'Unknown'}")
         
+        if not user and seerr_issue_id:
+            # Unknown reporter: fetch them from Seerr after responding
+            background_tasks.add_task(_backfill_issue_user, reported_issue.id, seerr_issue_id)
+        
         # Get autofix mode
         import os
         autofix_mode = os.getenv("ISSUE_AUTOFIX_MODE", app_settings.issue_autofix_mode)
@@ -1,9 +1,12 @@
 """Small security helpers shared by request and background code."""
 from __future__ import annotations
 
+import bisect
 import ipaddress
 import logging
 import socket
+import threading
+from functools import lru_cache
 from email.utils import parseaddr
 from html import escape
 from urllib.parse import urlparse, urlunparse
@@ -67,6 +70,94 @@ def validate_ip_or_cidr_csv(value: str | None) -> str:
     return ",".join(cleaned)
 
 
+class NetworkACL:
+    """A CIDR/IP allow-list compiled for fast membership checks.
+
+    Entries are parsed once, split by address family and merged into sorted,
+    non-overlapping integer ranges, so a lookup is a binary search rather
+    than an ip_network() construction per entry. Recent decisions are kept in
+    a small LRU since the same handful of clients hit every request.
+    IPv4-mapped IPv6 clients (::ffff:a.b.c.d) are matched as IPv4.
+    """
+
+    DECISION_CACHE_SIZE = 1024
+
+    def __init__(self, cidr_csv: str | None):
+        ranges: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for item in (cidr_csv or "").split(","):
+            part = item.strip()
+            if not part:
+                continue
+            try:
+                network = ipaddress.ip_network(part, strict=False)
+            except ValueError:
+                continue
+            ranges[network.version].append(
+                (int(network.network_address), int(network.broadcast_address))
+            )
+
+        self._starts: dict[int, list[int]] = {}
+        self._ends: dict[int, list[int]] = {}
+        for version, spans in ranges.items():
+            merged: list[list[int]] = []
+            for start, end in sorted(spans):
+                if merged and start <= merged[-1][1] + 1:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self._starts[version] = [start for start, _ in merged]
+            self._ends[version] = [end for _, end in merged]
+        self.contains = lru_cache(maxsize=self.DECISION_CACHE_SIZE)(self._contains)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts[4] or self._starts[6])
+
+    def _contains(self, ip_str: str) -> bool:
+        try:
+            addr = ipaddress.ip_address(ip_str)
+        except ValueError:
+            return False
+        if addr.version == 6 and addr.ipv4_mapped is not None:
+            addr = addr.ipv4_mapped
+        starts = self._starts[addr.version]
+        value = int(addr)
+        idx = bisect.bisect_right(starts, value) - 1
+        return idx >= 0 and value <= self._ends[addr.version][idx]
+
+
+_network_acls: dict[str, NetworkACL] = {}
+_network_acls_lock = threading.Lock()
+
+
+def get_network_acl(cidr_csv: str | None) -> NetworkACL:
+    """Return the compiled ACL for a CSV setting value, building it once.
+
+    Keyed by the raw setting string, so a changed setting naturally compiles
+    a new ACL; clear_network_acls() drops stale ones on config reload.
+    """
+    key = cidr_csv or ""
+    acl = _network_acls.get(key)
+    if acl is None:
+        with _network_acls_lock:
+            acl = _network_acls.get(key)
+            if acl is None:
+                acl = NetworkACL(key)
+                _network_acls[key] = acl
+    return acl
+
+
+def network_acl_cache_stats() -> tuple[int, int]:
+    """Summed (hits, misses) of every compiled ACL's decision cache."""
+    with _network_acls_lock:
+        infos = [acl.contains.cache_info() for acl in _network_acls.values()]
+    return sum(info.hits for info in infos), sum(info.misses for info in infos)
+
+
+def clear_network_acls() -> None:
+    with _network_acls_lock:
+        _network_acls.clear()
+
+
 def _host_is_blocked(host: str) -> bool:
     host_l = host.strip("[]").lower().rstrip(".")
     if not host_l or host_l in _BLOCKED_HOSTS or host_l.endswith(".localhost"):
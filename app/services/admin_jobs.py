@@ -0,0 +1,153 @@
+"""In-process registry for long-running admin jobs.
+
+Bulk admin actions (clearing a notification backlog, importing episodes for
+every request) can take far longer than an HTTP request should. The route
+starts a job here and returns its id straight away; the dashboard follows
+progress over SSE at /sse/jobs/{job_id} or polls /admin/jobs/{job_id}.
+
+Jobs live only in memory: a restart forgets them, which is fine because
+every job is written to be safely re-run (it works on whatever rows still
+match when it starts).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from app.services.admin_activity import record_admin_activity
+
+
+logger = logging.getLogger(__name__)
+
+MAX_RETAINED_JOBS = 50
+
+JobRunner = Callable[["AdminJob"], Awaitable[Optional[dict[str, Any]]]]
+
+
+class AdminJob:
+    """Progress state for one background admin job."""
+
+    def __init__(self, kind: str, label: str):
+        self.id = secrets.token_hex(8)
+        self.kind = kind
+        self.label = label
+        self.status = "running"
+        self.processed = 0
+        self.total: Optional[int] = None
+        self.message: Optional[str] = None
+        self.result: Optional[dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._subscribers: set[asyncio.Event] = set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"completed", "failed"}
+
+    def update(
+        self,
+        processed: Optional[int] = None,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        if processed is not None:
+            self.processed = processed
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        self._notify()
+
+    def _finish(self, status: str, result: Optional[dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = datetime.utcnow()
+        self._notify()
+
+    def _notify(self) -> None:
+        for event in self._subscribers:
+            event.set()
+
+    def subscribe(self) -> asyncio.Event:
+        event = asyncio.Event()
+        event.set()  # deliver the current state immediately
+        self._subscribers.add(event)
+        return event
+
+    def unsubscribe(self, event: asyncio.Event) -> None:
+        self._subscribers.discard(event)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "label": self.label,
+            "status": self.status,
+            "processed": self.processed,
+            "total": self.total,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() + "Z",
+            "finished_at": self.finished_at.isoformat() + "Z" if self.finished_at else None,
+        }
+
+
+_jobs: "OrderedDict[str, AdminJob]" = OrderedDict()
+_tasks: set[asyncio.Task] = set()
+
+
+def get_admin_job(job_id: str) -> Optional[AdminJob]:
+    return _jobs.get(job_id)
+
+
+def list_admin_jobs() -> list[dict[str, Any]]:
+    return [job.to_dict() for job in reversed(_jobs.values())]
+
+
+def start_admin_job(kind: str, label: str, runner: JobRunner) -> AdminJob:
+    """Schedule `runner` as a job, or return the one of this kind already running.
+
+    Only one job per kind runs at a time: a second click on "Clear ALL
+    pending" while the first is still going should follow the existing job,
+    not race it over the same rows.
+    """
+    for job in _jobs.values():
+        if job.kind == kind and not job.finished:
+            return job
+
+    job = AdminJob(kind, label)
+    _jobs[job.id] = job
+    while len(_jobs) > MAX_RETAINED_JOBS:
+        oldest_id = next(iter(_jobs))
+        if not _jobs[oldest_id].finished:
+            break
+        _jobs.pop(oldest_id)
+
+    async def _run() -> None:
+        try:
+            result = await runner(job)
+            job._finish("completed", result=result or {})
+        except asyncio.CancelledError:
+            job._finish("failed", error="Job cancelled")
+            raise
+        except Exception as e:
+            logger.error("admin job %s (%s) failed: %s", job.id, kind, e, exc_info=True)
+            job._finish("failed", error="Job failed; see logs for details")
+            record_admin_activity(
+                kind,
+                f"{label} failed",
+                status="error",
+                details={"job_id": job.id, "processed": job.processed},
+            )
+
+    task = asyncio.create_task(_run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
@@ -0,0 +1,200 @@
+"""Cached Sonarr / Radarr / Seerr configuration metadata.
+
+Quality profiles, root folders and tags per *arr instance, and the Sonarr /
+Radarr server lists Seerr is configured with, change rarely but were fetched
+live by workers (per request) and admin pages (per view). They are cached
+here per (instance, kind) for METADATA_TTL_SECONDS:
+
+  - get_metadata() serves from the cache, refetching once it expires
+    (concurrent callers share one fetch); refresh=True forces a refetch.
+  - If a refetch after expiry fails, the previous value is served and the
+    error logged; with nothing cached the error propagates to the caller.
+    A forced refresh (refresh=True) always propagates the error, so admin
+    refreshes and the periodic refresher report unreachable instances
+    instead of passing off the stale copy as fresh.
+  - arr_metadata_refresher() warms every entry at startup and refreshes
+    them each TTL, so workers and admin pages normally never wait on it.
+
+Instances are addressed by the same names the services use for logging and
+upstream metrics: "Sonarr", "Sonarr Anime", "Radarr", "Seerr".
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from app.metrics import record_cache
+
+
+logger = logging.getLogger(__name__)
+
+METADATA_TTL_SECONDS = 6 * 60 * 60
+
+ARR_KINDS = {
+    "quality_profiles": "/qualityProfile",
+    "root_folders": "/rootfolder",
+    "tags": "/tag",
+}
+SEERR_KINDS = {
+    "sonarr_servers": "/settings/sonarr",
+    "radarr_servers": "/settings/radarr",
+}
+SEERR_INSTANCE = "Seerr"
+RADARR_INSTANCE = "Radarr"
+
+# (instance, kind) -> {"value", "expires_at" (monotonic), "fetched_at"}
+_cache: dict[tuple[str, str], dict[str, Any]] = {}
+_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+
+def clear_metadata_cache() -> None:
+    """Forget everything cached (e.g. after *arr URLs / keys change)."""
+    _cache.clear()
+
+
+def _configured_instances() -> dict[str, Any]:
+    """Instance name -> service object for everything currently configured."""
+    from app.config import settings
+    from app.services.jellyseerr_sync import JellyseerrSyncService
+    from app.services.radarr_service import RadarrService
+    from app.services.sonarr_service import get_all_sonarr_instances
+
+    instances: dict[str, Any] = {}
+    if settings.sonarr_url and settings.sonarr_api_key:
+        for sonarr in get_all_sonarr_instances():
+            instances[sonarr.instance_name] = sonarr
+    if settings.radarr_url and settings.radarr_api_key:
+        instances[RADARR_INSTANCE] = RadarrService()
+    if settings.jellyseerr_url and settings.jellyseerr_api_key:
+        instances[SEERR_INSTANCE] = JellyseerrSyncService()
+    return instances
+
+
+def _kinds_for(instance: str) -> dict[str, str]:
+    return SEERR_KINDS if instance == SEERR_INSTANCE else ARR_KINDS
+
+
+def instance_name(service: Any) -> str:
+    """Cache instance name for a SonarrService / RadarrService object."""
+    return getattr(service, "instance_name", RADARR_INSTANCE)
+
+
+async def _fetch(instance: str, kind: str, service: Any = None) -> Any:
+    endpoint = _kinds_for(instance).get(kind)
+    if endpoint is None:
+        raise ValueError(f"Unknown metadata kind {kind!r} for {instance}")
+    if service is None:
+        service = _configured_instances().get(instance)
+        if service is None:
+            raise LookupError(f"{instance} is not configured")
+    return await service._get(endpoint)
+
+
+async def get_metadata(instance: str, kind: str, refresh: bool = False, service: Any = None) -> Any:
+    """Cached metadata for one instance; see the module docstring."""
+    key = (instance, kind)
+    requested_at = datetime.utcnow()
+    entry = _cache.get(key)
+    if entry is not None and not refresh and entry["expires_at"] > time.monotonic():
+        record_cache("arr_metadata", True)
+        return entry["value"]
+
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        entry = _cache.get(key)
+        # Someone else fetched it while we waited for the lock.
+        if entry is not None and entry["expires_at"] > time.monotonic() and (
+            not refresh or entry["fetched_at"] >= requested_at
+        ):
+            record_cache("arr_metadata", True)
+            return entry["value"]
+        record_cache("arr_metadata", False)
+        try:
+            value = await _fetch(instance, kind, service)
+        except Exception as e:
+            if entry is not None and not refresh:
+                logger.warning(f"Refreshing {instance} {kind} failed, serving cached copy: {e}")
+                return entry["value"]
+            raise
+        _cache[key] = {
+            "value": value,
+            "expires_at": time.monotonic() + METADATA_TTL_SECONDS,
+            "fetched_at": datetime.utcnow(),
+        }
+        return value
+
+
+async def get_quality_profiles(service: Any) -> list:
+    """Quality profiles of a SonarrService / RadarrService, cached ([] on failure)."""
+    try:
+        return await get_metadata(instance_name(service), "quality_profiles", service=service) or []
+    except Exception as e:
+        logger.error(f"Failed to fetch quality profiles from {instance_name(service)}: {e}")
+        return []
+
+
+async def quality_profile_name(service: Any, profile_id: Optional[int]) -> Optional[str]:
+    """Name of a quality profile id on `service`, or None if unknown."""
+    if not profile_id:
+        return None
+    profiles = await get_quality_profiles(service)
+    return next((p.get("name") for p in profiles if p.get("id") == profile_id), None)
+
+
+async def refresh_metadata(instances: Optional[list[str]] = None) -> dict[str, dict[str, str]]:
+    """Refetch every kind for the given (default: all configured) instances.
+
+    Returns {instance: {kind: "ok" | error message}}.
+    """
+    configured = _configured_instances()
+    targets = [
+        (name, kind, service)
+        for name, service in configured.items()
+        if instances is None or name in instances
+        for kind in _kinds_for(name)
+    ]
+    results = await asyncio.gather(
+        *(get_metadata(name, kind, refresh=True, service=service) for name, kind, service in targets),
+        return_exceptions=True,
+    )
+    summary: dict[str, dict[str, str]] = {}
+    for (name, kind, _), result in zip(targets, results):
+        summary.setdefault(name, {})[kind] = f"error: {result}" if isinstance(result, Exception) else "ok"
+    return summary
+
+
+def metadata_cache_status() -> list[dict[str, Any]]:
+    """What is cached, how big, and how old -- for the admin UI."""
+    now = time.monotonic()
+    rows = []
+    for (instance, kind), entry in sorted(_cache.items()):
+        value = entry["value"]
+        rows.append({
+            "instance": instance,
+            "kind": kind,
+            "items": len(value) if isinstance(value, list) else None,
+            "fetched_at": entry["fetched_at"].isoformat() + "Z",
+            "expires_in_seconds": max(0, int(entry["expires_at"] - now)),
+        })
+    return rows
+
+
+async def arr_metadata_refresher() -> None:
+    """Warm the cache at startup, then refresh it every METADATA_TTL_SECONDS."""
+    while True:
+        try:
+            summary = await refresh_metadata()
+            failed = {
+                f"{name} {kind}": status
+                for name, kinds in summary.items()
+                for kind, status in kinds.items()
+                if status != "ok"
+            }
+            if failed:
+                logger.warning(f"Metadata cache refresh incomplete: {failed}")
+        except Exception as e:
+            logger.warning(f"Metadata cache refresh failed: {e}")
+        await asyncio.sleep(METADATA_TTL_SECONDS)
@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+import shutil
 import sqlite3
 import tempfile
 import zipfile
@@ -14,6 +15,17 @@ from app.config import CONFIG_FILE, settings
 
 logger = logging.getLogger(__name__)
 
+# Archives and extracted databases are copied in fixed-size chunks so a large
+# backup never has to fit in memory.
+COPY_CHUNK_SIZE = 1024 * 1024
+MAX_RESTORE_UPLOAD_BYTES = 50 * 1024 * 1024
+_ALLOWED_ARCHIVE_EXTENSIONS = {".json", ".db", ".txt"}
+_REQUIRED_ARCHIVE_MEMBERS = ("metadata.json", "bingealert.db")
+
+
+class InvalidBackupError(ValueError):
+    """Raised when an uploaded archive is not a usable BingeAlert backup."""
+
 
 class BackupService:
     """SQLite backup and restore service."""
@@ -96,12 +108,37 @@ class BackupService:
             logger.error("Failed to create backup: %s", e, exc_info=True)
             return None
 
+    def validate_archive(self, backup_file: str) -> None:
+        """Check archive structure without extracting anything.
+
+        Only the zip central directory is read here; member payloads are
+        streamed later by restore_backup().
+        """
+        try:
+            with zipfile.ZipFile(backup_file, "r") as zipf:
+                names = zipf.namelist()
+        except zipfile.BadZipFile as e:
+            raise InvalidBackupError("Invalid or corrupted ZIP file") from e
+
+        for required in _REQUIRED_ARCHIVE_MEMBERS:
+            if required not in names:
+                raise InvalidBackupError(f"Invalid backup: missing {required}")
+        for name in names:
+            if name.startswith("/") or ".." in name:
+                logger.warning("Zip-slip attempt detected: %s", name)
+                raise InvalidBackupError("Invalid backup: suspicious file paths")
+            ext = os.path.splitext(name)[1].lower()
+            if ext and ext not in _ALLOWED_ARCHIVE_EXTENSIONS:
+                raise InvalidBackupError("Invalid backup: unexpected file type")
+
     def _validate_sqlite_file(self, db_file: Path) -> None:
+        # quick_check skips the index-vs-table cross checks integrity_check
+        # does, so it stays roughly linear in file size on large restores.
         conn = sqlite3.connect(db_file)
         try:
-            integrity = conn.execute("PRAGMA integrity_check").fetchone()
-            if not integrity or integrity[0] != "ok":
-                raise ValueError("SQLite integrity check failed")
+            result = conn.execute("PRAGMA quick_check").fetchone()
+            if not result or result[0] != "ok":
+                raise ValueError("SQLite quick_check failed")
             tables = {
                 row[0]
                 for row in conn.execute(
@@ -116,55 +153,75 @@ class BackupService:
             conn.close()
 
     def restore_backup(self, backup_file: str) -> bool:
-        """Restore a SQLite backup zip. A container restart is required after."""
+        """Restore a SQLite backup zip. A container restart is required after.
+
+        The database member is streamed into a staging file next to the live
+        database (same filesystem, so the final os.replace is atomic), checked
+        with PRAGMA quick_check, and only then swapped into place.
+        """
+        staged_db: Optional[Path] = None
         try:
             backup_path = Path(backup_file)
             if not backup_path.exists():
                 logger.error("Backup file not found: %s", backup_file)
                 return False
 
-            with tempfile.TemporaryDirectory() as temp_dir_raw:
-                temp_dir = Path(temp_dir_raw)
-                restored_db = temp_dir / "bingealert.db"
-
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.data_dir,
+                prefix=f"{self.db_path.stem}.restore-",
+                suffix=".db",
+                delete=False,
+            ) as dst:
+                staged_db = Path(dst.name)
                 with zipfile.ZipFile(backup_path, "r") as zipf:
                     names = set(zipf.namelist())
                     if "metadata.json" not in names or "bingealert.db" not in names:
                         logger.error("Invalid SQLite backup: missing metadata.json or bingealert.db")
                         return False
-                    with zipf.open("bingealert.db") as src, restored_db.open("wb") as dst:
-                        dst.write(src.read())
+                    with zipf.open("bingealert.db") as src:
+                        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                dst.flush()
+                os.fsync(dst.fileno())
 
-                self._validate_sqlite_file(restored_db)
+            self._validate_sqlite_file(staged_db)
 
-                self.data_dir.mkdir(parents=True, exist_ok=True)
-                from app.database import engine
+            from app.database import engine
 
-                engine.dispose()
+            engine.dispose()
 
-                if self.db_path.exists():
-                    pre_restore = self.data_dir / (
-                        f"{self.db_path.stem}.pre-restore-"
-                        f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.db"
-                    )
-                    self._copy_sqlite_database(pre_restore)
-                    logger.info("Saved pre-restore database copy: %s", pre_restore)
+            if self.db_path.exists():
+                pre_restore = self.data_dir / (
+                    f"{self.db_path.stem}.pre-restore-"
+                    f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.db"
+                )
+                self._copy_sqlite_database(pre_restore)
+                logger.info("Saved pre-restore database copy: %s", pre_restore)
 
-                for suffix in ("", "-wal", "-shm"):
-                    path = Path(str(self.db_path) + suffix)
-                    if path.exists():
-                        path.unlink()
+            # A stale WAL would be replayed over the restored file, so it has
+            # to go before the swap rather than after.
+            for suffix in ("-wal", "-shm"):
+                path = Path(str(self.db_path) + suffix)
+                if path.exists():
+                    path.unlink()
 
-                os.replace(restored_db, self.db_path)
+            os.replace(staged_db, self.db_path)
+            staged_db = None
 
-                if CONFIG_FILE.is_file():
-                    logger.info("Restore kept existing config.json in place")
+            if CONFIG_FILE.is_file():
+                logger.info("Restore kept existing config.json in place")
 
             logger.info("Backup restored successfully from %s", backup_file)
             return True
         except Exception as e:
             logger.error("Failed to restore backup: %s", e, exc_info=True)
             return False
+        finally:
+            if staged_db is not None:
+                for suffix in ("", "-wal", "-shm"):
+                    path = Path(str(staged_db) + suffix)
+                    if path.exists():
+                        path.unlink()
 
     def list_backups(self):
         """List all available backups."""
@@ -188,6 +245,19 @@ class BackupService:
             logger.error("Failed to list backups: %s", e)
             return []
 
+    def get_backup_path(self, filename: str) -> Optional[tuple[str, os.stat_result]]:
+        """Resolve a backup by exact filename; returns (path, stat) or None.
+
+        The filename is matched against the directory listing, never joined
+        onto the backup dir directly, so path traversal is not possible.
+        """
+        backup_dir = os.path.realpath(self.backup_dir)
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                if entry.name == filename and entry.name.endswith(".zip") and entry.is_file():
+                    return entry.path, entry.stat()
+        return None
+
     def delete_backup(self, filename: str) -> bool:
         """Delete a backup file by exact filename."""
         try:
@@ -1,3 +1,4 @@
+import asyncio
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -7,14 +8,28 @@ from typing import List, Optional
 from datetime import datetime
 
 from app.config import normalize_smtp_security, settings
-from app.database import EpisodeTracking, Notification, User
+from app.database import EpisodeTracking, Notification, SessionLocal, User
+from app.metrics import Counter, record_email, register_metric
 from app.services.notification_history import (
     delivery_entries_for_notification,
     record_delivery_for_notification,
 )
+from app.services.upstream_metrics import track_upstream
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_DRAIN_TRIGGERS = register_metric(Counter(
+    "notification_drain_triggers_total",
+    "Requests to drain pending notifications, by source and whether they ran "
+    "a drain or were coalesced into the one already running.",
+    ("trigger", "result"),
+))
+NOTIFICATION_DRAIN_PASSES = register_metric(Counter(
+    "notification_drain_passes_total",
+    "Drain passes run: initial, or rerun for triggers that arrived mid-drain.",
+    ("pass",),
+))
+
 
 # All notification templates render through this single Environment so HTML
 # autoescape applies uniformly. Variables like series_title, episode title,
@@ -124,29 +139,32 @@ class EmailService:
             }
             
             # Send email with or without authentication
-            if self.use_auth:
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.smtp_host,
-                    port=self.smtp_port,
-                    username=self.smtp_user,
-                    password=self.smtp_password,
-                    **tls_kwargs,
-                )
-            else:
-                # No authentication
-                await aiosmtplib.send(
-                    message,
-                    hostname=self.smtp_host,
-                    port=self.smtp_port,
-                    **tls_kwargs,
-                )
+            async with track_upstream("SMTP", "SEND"):
+                if self.use_auth:
+                    await aiosmtplib.send(
+                        message,
+                        hostname=self.smtp_host,
+                        port=self.smtp_port,
+                        username=self.smtp_user,
+                        password=self.smtp_password,
+                        **tls_kwargs,
+                    )
+                else:
+                    # No authentication
+                    await aiosmtplib.send(
+                        message,
+                        hostname=self.smtp_host,
+                        port=self.smtp_port,
+                        **tls_kwargs,
+                    )
             
             logger.info(f"Email sent successfully to {to_email}")
+            record_email(True)
             return True
             
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {e}")
+            record_email(False)
             return False
     
     def _inject_calendar_footer(self, html_body: str, user: Optional[User]) -> str:
@@ -437,7 +455,6 @@ class EmailService:
                 # Get poster from one of the notifications (they're all the same series)
                 # We'll use the body from the first notification but update episode list
                 from app.services.tmdb_service import TMDBService
-                from app.config import settings
                 tmdb_service = TMDBService(settings.jellyseerr_url, settings.jellyseerr_api_key)
                 poster_url = await tmdb_service.get_tv_poster(notif.request.tmdb_id)
                 
@@ -1161,3 +1178,44 @@ class EmailService:
         
         logger.info(f"Maintenance {email_type} email: sent={sent}, failed={failed}, total={len(users)}")
         return {"sent": sent, "failed": failed, "total": len(users)}
+
+
+# ----------------------------------------------------------------------
+# Single-flight drain
+# ----------------------------------------------------------------------
+# The periodic processor, webhooks and the admin "process now" button all
+# drain the same unsent rows. Running two drains at once would send the
+# same notification twice and repeat the Sonarr queue lookups, so at most
+# one drain runs; triggers that arrive meanwhile set _drain_rerun and are
+# served by one follow-up pass once it finishes.
+_drain_lock = asyncio.Lock()
+_drain_rerun = False
+
+
+async def drain_pending_notifications(trigger: str) -> bool:
+    """Process pending notifications unless a drain is already running.
+
+    Returns True if this call drained, False if it was coalesced into the
+    running drain (which will make one more pass for it).
+    """
+    global _drain_rerun
+    if _drain_lock.locked():
+        _drain_rerun = True
+        NOTIFICATION_DRAIN_TRIGGERS.inc(trigger, "coalesced")
+        return False
+    async with _drain_lock:
+        NOTIFICATION_DRAIN_TRIGGERS.inc(trigger, "ran")
+        email_service = EmailService()
+        drain_pass = "initial"
+        while True:
+            _drain_rerun = False
+            NOTIFICATION_DRAIN_PASSES.inc(drain_pass)
+            db = SessionLocal()
+            try:
+                await email_service.process_pending_notifications(db)
+            finally:
+                db.close()
+            if not _drain_rerun:
+                return True
+            logger.debug("Notification drain re-running for triggers received mid-drain")
+            drain_pass = "rerun"
@@ -1,15 +1,73 @@
+import asyncio
 import httpx
 import logging
-from typing import List, Optional
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import User, MediaRequest, EpisodeTracking, get_db
+from app.database import User, MediaRequest, EpisodeTracking, SystemConfig, get_db
 from app.schemas import JellyseerrUser, JellyseerrRequest
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
+from app.services.user_directory import refresh_user_index
 
 logger = logging.getLogger(__name__)
 
+USER_PAGE_SIZE = 50
+USER_PAGE_CONCURRENCY = 4
+REQUEST_PAGE_SIZE = 100
+# Concurrent Seerr page / media-detail fetches during a request sync.
+REQUEST_PAGE_CONCURRENCY = 4
+MEDIA_DETAILS_CONCURRENCY = 8
+# SQLite caps bound parameters; prefetch existing rows in chunks of this size.
+PREFETCH_CHUNK_SIZE = 500
+# SystemConfig key holding the newest Seerr `updatedAt` seen by a completed sync.
+REQUEST_SYNC_CURSOR_KEY = "jellyseerr_request_sync_cursor"
+
+# Requests handled per episode-import batch (one commit and progress update
+# each) and concurrent Sonarr episode fetches within a batch.
+EPISODE_IMPORT_BATCH_SIZE = 20
+EPISODE_IMPORT_CONCURRENCY = 4
+
+STATUS_MAP = {1: "pending", 2: "approved", 3: "declined", 4: "available"}
+
+
+def _parse_seerr_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse Seerr's ISO `updatedAt` into a naive UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def seerr_user_fields(user_data: dict) -> dict:
+    """Local User columns for a Seerr user object (which must have an email)."""
+    email = user_data.get("email")
+    # Use username, displayName, plexUsername, or email as fallback
+    username = (user_data.get("username") or
+                user_data.get("displayName") or
+                user_data.get("plexUsername") or
+                email.split("@")[0])
+    return {
+        "jellyseerr_id": user_data.get("id"),
+        "email": email,
+        "username": username,
+        "plex_id": user_data.get("plexId"),
+    }
+
+
+def _chunks(values: list, size: int = PREFETCH_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
 
 class JellyseerrSyncService:
     def __init__(self):
@@ -20,35 +78,62 @@ class JellyseerrSyncService:
             "Content-Type": "application/json"
         }
     
-    async def _get(self, endpoint: str) -> dict:
-        """Make GET request to Jellyseerr API"""
+    async def _get(self, endpoint: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+        """Make GET request to Jellyseerr API.
+
+        Pass `client` to reuse one connection pool across many calls (bulk
+        syncs); otherwise a short-lived client is opened.
+        """
         url = f"{self.base_url}/api/v1{endpoint}"
-        async with httpx.AsyncClient() as client:
+        if client is not None:
+            response = await client.get(url, headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+        async with upstream_client("Seerr") as client:
             response = await client.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
     
     async def get_users(self) -> List[dict]:
-        """Fetch all users from Jellyseerr (paginated to handle large installs)"""
-        all_users = []
+        """Fetch all users from Jellyseerr (paginated to handle large installs).
+
+        The first page reports the total; the remaining pages are fetched
+        concurrently. Any page failing returns [] rather than a partial list,
+        because sync_users deactivates everyone missing from the result.
+        """
         try:
-            page_size = 50
-            skip = 0
-            while True:
-                data = await self._get(f"/user?take={page_size}&skip={skip}")
-                results = data.get("results", [])
-                all_users.extend(results)
-                
-                # If we got fewer than requested, we've reached the end
-                if len(results) < page_size:
-                    break
-                skip += page_size
-            
-            return all_users
+            async with upstream_client("Seerr", timeout=30.0) as client:
+                first = await self._get(f"/user?take={USER_PAGE_SIZE}&skip=0", client)
+                all_users = list(first.get("results", []))
+                total = (first.get("pageInfo") or {}).get("results")
+                if total is None:
+                    # Older Seerr builds omit pageInfo: fall back to walking pages.
+                    skip = USER_PAGE_SIZE
+                    page = all_users
+                    while len(page) == USER_PAGE_SIZE:
+                        data = await self._get(f"/user?take={USER_PAGE_SIZE}&skip={skip}", client)
+                        page = data.get("results", [])
+                        all_users.extend(page)
+                        skip += USER_PAGE_SIZE
+                    return all_users
+
+                semaphore = asyncio.Semaphore(USER_PAGE_CONCURRENCY)
+
+                async def _page(skip: int) -> List[dict]:
+                    async with semaphore:
+                        data = await self._get(f"/user?take={USER_PAGE_SIZE}&skip={skip}", client)
+                        return data.get("results", [])
+
+                pages = await asyncio.gather(
+                    *(_page(skip) for skip in range(USER_PAGE_SIZE, total, USER_PAGE_SIZE))
+                )
+            for page in pages:
+                all_users.extend(page)
+            return list({user.get("id"): user for user in all_users}.values())
         except Exception as e:
             logger.error(f"Failed to fetch users from Jellyseerr: {e}")
             return []
-    
+
     async def get_requests(self, take: int = 100, skip: int = 0) -> List[dict]:
         """Fetch requests from Jellyseerr"""
         try:
@@ -58,177 +143,326 @@ class JellyseerrSyncService:
             logger.error(f"Failed to fetch requests from Jellyseerr: {e}")
             return []
     
-    async def get_media_details(self, media_type: str, tmdb_id: int) -> dict:
+    async def get_requests_page(
+        self,
+        take: int = REQUEST_PAGE_SIZE,
+        skip: int = 0,
+        sort: str = "added",
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> dict:
+        """Fetch one raw page (`results` + `pageInfo`) of requests. Raises on failure."""
+        return await self._get(f"/request?take={take}&skip={skip}&filter=all&sort={sort}", client)
+
+    async def fetch_all_requests(
+        self,
+        client: httpx.AsyncClient,
+        since: Optional[datetime] = None,
+    ) -> List[dict]:
+        """Walk every request page.
+
+        Full walk: the first page reports the total, then the remaining pages
+        are fetched concurrently. Incremental walk (`since` given): pages are
+        read newest-modified first and the walk stops at the first request
+        not modified after `since`. Raises if any page fails, so callers never
+        mistake a partial listing for the complete one.
+        """
+        if since is not None:
+            collected: List[dict] = []
+            skip = 0
+            while True:
+                data = await self.get_requests_page(skip=skip, sort="modified", client=client)
+                results = data.get("results", [])
+                for item in results:
+                    updated = _parse_seerr_timestamp(item.get("updatedAt"))
+                    if updated is not None and updated < since:
+                        return collected
+                    collected.append(item)
+                if len(results) < REQUEST_PAGE_SIZE:
+                    return collected
+                skip += REQUEST_PAGE_SIZE
+
+        first = await self.get_requests_page(client=client)
+        collected = list(first.get("results", []))
+        total = (first.get("pageInfo") or {}).get("results") or len(collected)
+        remaining = list(range(REQUEST_PAGE_SIZE, total, REQUEST_PAGE_SIZE))
+        if not remaining:
+            return collected
+
+        semaphore = asyncio.Semaphore(REQUEST_PAGE_CONCURRENCY)
+
+        async def _page(skip: int) -> List[dict]:
+            async with semaphore:
+                data = await self.get_requests_page(skip=skip, client=client)
+                return data.get("results", [])
+
+        for page in await asyncio.gather(*(_page(skip) for skip in remaining)):
+            collected.extend(page)
+        # New requests landing mid-walk shift the offsets; drop the duplicates.
+        unique = {item.get("id"): item for item in collected}
+        return list(unique.values())
+
+    async def get_media_details(
+        self, media_type: str, tmdb_id: int, client: Optional[httpx.AsyncClient] = None
+    ) -> dict:
         """Fetch media details including title from Jellyseerr"""
         try:
             # Jellyseerr uses /movie/{tmdbId} or /tv/{tmdbId}
             endpoint = f"/{media_type}/{tmdb_id}"
-            data = await self._get(endpoint)
+            data = await self._get(endpoint, client)
             return data
         except Exception as e:
             logger.error(f"Failed to fetch media details for {media_type} {tmdb_id}: {e}")
             return {}
-    
-    async def sync_users(self):
+
+    async def _fetch_titles(
+        self, client: httpx.AsyncClient, keys: set[tuple[str, int]]
+    ) -> dict[tuple[str, int], str]:
+        """Resolve titles for unique (media_type, tmdb_id) pairs with bounded concurrency."""
+        semaphore = asyncio.Semaphore(MEDIA_DETAILS_CONCURRENCY)
+
+        async def _title(media_type: str, tmdb_id: int) -> str:
+            async with semaphore:
+                details = await self.get_media_details(media_type, tmdb_id, client)
+            return details.get("title") or details.get("name") or f"TMDB {tmdb_id}"
+
+        ordered = list(keys)
+        titles = await asyncio.gather(*(_title(media_type, tmdb_id) for media_type, tmdb_id in ordered))
+        return dict(zip(ordered, titles))
+
+    async def sync_users(self) -> Optional[dict]:
         """Sync users from Jellyseerr to local database.
         
         - Creates new users found in Jellyseerr
         - Updates existing users' info
         - Reactivates users who were previously deactivated but are back in Jellyseerr
         - Soft-deactivates users no longer present in Jellyseerr
+
+        Local users are loaded once into a dict keyed by jellyseerr_id, only
+        rows that actually differ are written (as bulk INSERT / UPDATE), and
+        a diff summary is returned. Returns None when the sync was skipped.
         """
         logger.info("Starting user sync from Jellyseerr...")
+        started = time.monotonic()
         users_data = await self.get_users()
         
         if not users_data:
             logger.warning("No users returned from Jellyseerr — skipping sync to avoid false deactivations")
-            return
+            return None
         
         db = next(get_db())
-        synced_count = 0
-        deactivated_count = 0
-        reactivated_count = 0
+        summary = {
+            "fetched": len(users_data),
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "reactivated": 0,
+            "deactivated": 0,
+            "skipped_no_email": 0,
+            "seconds": 0.0,
+        }
         
         try:
-            # Collect all jellyseerr IDs from the API response
+            local_by_seerr_id = {
+                row.jellyseerr_id: row
+                for row in db.query(
+                    User.id, User.jellyseerr_id, User.email, User.username, User.plex_id, User.is_active
+                )
+            }
+            now = datetime.utcnow()
+            inserts: list[dict] = []
+            updates: list[dict] = []
             active_jellyseerr_ids = set()
             
             for user_data in users_data:
                 # Skip users without email
                 if not user_data.get("email"):
                     logger.warning(f"Skipping user {user_data.get('id')} - no email address")
+                    summary["skipped_no_email"] += 1
                     continue
                 
-                jellyseerr_id = user_data.get("id")
+                fields = seerr_user_fields(user_data)
+                jellyseerr_id = fields["jellyseerr_id"]
                 active_jellyseerr_ids.add(jellyseerr_id)
+                email = fields["email"]
+                username = fields["username"]
+                plex_id = fields["plex_id"]
                 
-                existing_user = db.query(User).filter(User.jellyseerr_id == jellyseerr_id).first()
+                existing = local_by_seerr_id.get(jellyseerr_id)
+                if existing is None:
+                    inserts.append({
+                        "jellyseerr_id": jellyseerr_id,
+                        "email": email,
+                        "username": username,
+                        "plex_id": plex_id,
+                        "is_active": True,
+                    })
+                    logger.info(f"Created new user: {username} ({email})")
+                    continue
                 
-                # Use username, displayName, plexUsername, or email as fallback
-                username = (user_data.get("username") or 
-                          user_data.get("displayName") or 
-                          user_data.get("plexUsername") or 
-                          user_data.get("email").split("@")[0])
+                if (existing.email, existing.username, existing.plex_id, existing.is_active) == (
+                    email, username, plex_id, True
+                ):
+                    summary["unchanged"] += 1
+                    continue
                 
-                if existing_user:
-                    # Update existing user
-                    existing_user.email = user_data.get("email")
-                    existing_user.username = username
-                    existing_user.plex_id = user_data.get("plexId")
-                    
-                    # Reactivate if they were previously deactivated
-                    if not existing_user.is_active:
-                        existing_user.is_active = True
-                        existing_user.deactivated_at = None
-                        reactivated_count += 1
-                        logger.info(f"Reactivated user: {username} ({user_data.get('email')}) — back in Jellyseerr")
-                    else:
-                        logger.info(f"Updated user: {username} ({user_data.get('email')})")
+                change = {
+                    "id": existing.id,
+                    "email": email,
+                    "username": username,
+                    "plex_id": plex_id,
+                    "updated_at": now,
+                }
+                if not existing.is_active:
+                    # Reactivate: they were previously deactivated but are back in Jellyseerr
+                    change.update(is_active=True, deactivated_at=None)
+                    summary["reactivated"] += 1
+                    logger.info(f"Reactivated user: {username} ({email}) — back in Jellyseerr")
                 else:
-                    # Create new user
-                    new_user = User(
-                        jellyseerr_id=jellyseerr_id,
-                        email=user_data.get("email"),
-                        username=username,
-                        plex_id=user_data.get("plexId"),
-                        is_active=True
-                    )
-                    db.add(new_user)
-                    logger.info(f"Created new user: {username} ({user_data.get('email')})")
-                
-                synced_count += 1
+                    summary["updated"] += 1
+                    logger.info(f"Updated user: {username} ({email})")
+                updates.append(change)
             
             # Deactivate users no longer in Jellyseerr
-            from datetime import datetime
-            local_users = db.query(User).filter(User.is_active == True).all()
-            for local_user in local_users:
-                if local_user.jellyseerr_id not in active_jellyseerr_ids:
-                    local_user.is_active = False
-                    local_user.deactivated_at = datetime.utcnow()
-                    deactivated_count += 1
+            for local_user in local_by_seerr_id.values():
+                if local_user.is_active and local_user.jellyseerr_id not in active_jellyseerr_ids:
+                    updates.append({
+                        "id": local_user.id,
+                        "is_active": False,
+                        "deactivated_at": now,
+                        "updated_at": now,
+                    })
+                    summary["deactivated"] += 1
                     logger.warning(
                         f"Deactivated user: {local_user.username} ({local_user.email}) "
                         f"— no longer in Jellyseerr (ID: {local_user.jellyseerr_id})"
                     )
             
+            if inserts:
+                db.execute(insert(User), inserts)
+            if updates:
+                # ORM bulk UPDATE by primary key; rows are grouped by their key set.
+                db.execute(update(User), updates)
             db.commit()
-            
-            summary = f"Synced {synced_count} users from Jellyseerr"
-            if deactivated_count:
-                summary += f", deactivated {deactivated_count}"
-            if reactivated_count:
-                summary += f", reactivated {reactivated_count}"
-            logger.info(summary)
+            summary["created"] = len(inserts)
+            refresh_user_index(db)
             
         except Exception as e:
             db.rollback()
             logger.error(f"Error syncing users: {e}")
+            raise
         finally:
             db.close()
+        
+        summary["seconds"] = round(time.monotonic() - started, 2)
+        logger.info(
+            f"Synced {summary['fetched'] - summary['skipped_no_email']} users from Jellyseerr "
+            f"in {summary['seconds']}s: {summary['created']} new, {summary['updated']} updated, "
+            f"{summary['unchanged']} unchanged, {summary['reactivated']} reactivated, "
+            f"{summary['deactivated']} deactivated"
+        )
+        return summary
     
-    async def sync_requests(self):
-        """Sync media requests from Jellyseerr to local database"""
+    async def sync_requests(self, full: bool = False) -> dict:
+        """Sync media requests from Jellyseerr to local database.
+
+        Walks every page of requests. After the first complete sync, later
+        runs are incremental: they only read requests modified since the
+        newest `updatedAt` seen last time (`full=True` forces a full walk).
+        Users and existing requests are prefetched into dicts, titles are
+        fetched concurrently, and a summary with rows/sec is returned.
+        """
         logger.info("Starting request sync from Jellyseerr...")
-        requests_data = await self.get_requests(take=200)
-        
+        started = time.monotonic()
         db = next(get_db())
-        synced_count = 0
-        
+        summary = {
+            "mode": "full",
+            "fetched": 0,
+            "created": 0,
+            "updated": 0,
+            "skipped_no_user": 0,
+            "seconds": 0.0,
+            "rows_per_second": 0.0,
+        }
+
         try:
-            # Import SonarrService for episode checking
-            from app.services.sonarr_service import SonarrService, get_all_sonarr_instances
-            sonarr_instances = get_all_sonarr_instances()
-            
-            for request_data in requests_data:
+            cursor_row = db.query(SystemConfig).filter(SystemConfig.key == REQUEST_SYNC_CURSOR_KEY).first()
+            since = None if full or cursor_row is None else _parse_seerr_timestamp(cursor_row.value)
+            if since is not None:
+                summary["mode"] = "incremental"
+
+            async with upstream_client("Seerr", timeout=30.0) as client:
+                requests_data = await self.fetch_all_requests(client, since=since)
+                summary["fetched"] = len(requests_data)
+
+                # Prefetch everything the loop below needs in a handful of queries.
+                seerr_user_ids = list({
+                    (r.get("requestedBy") or {}).get("id") for r in requests_data
+                } - {None})
+                users_by_seerr_id: dict[int, User] = {}
+                for chunk in _chunks(seerr_user_ids):
+                    for user in db.query(User).filter(User.jellyseerr_id.in_(chunk)):
+                        users_by_seerr_id[user.jellyseerr_id] = user
+
+                request_ids = [r.get("id") for r in requests_data if r.get("id") is not None]
+                existing_by_seerr_id: dict[int, MediaRequest] = {}
+                for chunk in _chunks(request_ids):
+                    for existing in db.query(MediaRequest).filter(MediaRequest.jellyseerr_request_id.in_(chunk)):
+                        existing_by_seerr_id[existing.jellyseerr_request_id] = existing
+
+                syncable = [
+                    r for r in requests_data
+                    if (r.get("requestedBy") or {}).get("id") in users_by_seerr_id
+                ]
+                summary["skipped_no_user"] = len(requests_data) - len(syncable)
+                # Never move the cursor past a request we could not store yet,
+                # so the next incremental run picks it up once its user exists.
+                skipped_updated = [
+                    _parse_seerr_timestamp(r.get("updatedAt"))
+                    for r in requests_data
+                    if (r.get("requestedBy") or {}).get("id") not in users_by_seerr_id
+                ]
+                oldest_skipped = min((t for t in skipped_updated if t is not None), default=None)
+                if summary["skipped_no_user"]:
+                    logger.warning(
+                        f"Skipped {summary['skipped_no_user']} requests whose user is not synced yet"
+                    )
+
+                titles = await self._fetch_titles(client, {
+                    (r.get("type", "").lower(), (r.get("media") or {}).get("tmdbId"))
+                    for r in syncable
+                    if (r.get("media") or {}).get("tmdbId") is not None
+                })
+
+            newest_seen = since
+            tv_requests: list[MediaRequest] = []
+            for request_data in syncable:
                 jellyseerr_request_id = request_data.get("id")
-                existing_request = db.query(MediaRequest).filter(
-                    MediaRequest.jellyseerr_request_id == jellyseerr_request_id
-                ).first()
-                
-                # Get user
-                requested_by = request_data.get("requestedBy", {})
-                user = db.query(User).filter(
-                    User.jellyseerr_id == requested_by.get("id")
-                ).first()
-                
-                if not user:
-                    logger.warning(f"User not found for request {jellyseerr_request_id}")
-                    continue
-                
-                media = request_data.get("media", {})
+                user = users_by_seerr_id[request_data["requestedBy"]["id"]]
+                media = request_data.get("media") or {}
                 media_type = request_data.get("type", "").lower()
                 tmdb_id = media.get("tmdbId")
-                
-                # Fetch the actual title from Jellyseerr's media endpoint
-                title = "Unknown"
-                try:
-                    media_details = await self.get_media_details(media_type, tmdb_id)
-                    title = media_details.get("title") or media_details.get("name") or f"TMDB {tmdb_id}"
-                except Exception as e:
-                    logger.warning(f"Could not fetch title for {media_type} {tmdb_id}: {e}")
-                    title = f"TMDB {tmdb_id}"
-                
-                # Map Jellyseerr status codes
-                status_code = request_data.get("status", 1)
-                status_map = {1: "pending", 2: "approved", 3: "declined", 4: "available"}
-                status = status_map.get(status_code, "pending")
-                
+                title = titles.get((media_type, tmdb_id)) or f"TMDB {tmdb_id}"
+                status = STATUS_MAP.get(request_data.get("status", 1), "pending")
+
+                updated = _parse_seerr_timestamp(request_data.get("updatedAt"))
+                if updated is not None and (newest_seen is None or updated > newest_seen):
+                    newest_seen = updated
+
+                existing_request = existing_by_seerr_id.get(jellyseerr_request_id)
                 if existing_request:
-                    # Update existing request
                     # Don't downgrade status: if it's already "available", keep it that way
                     # (Webhooks from Sonarr/Radarr set to "available", Jellyseerr might lag behind)
                     if existing_request.status != "available":
                         existing_request.status = status
                     existing_request.title = title  # Update title in case it changed
-                    logger.info(f"Updated request: {title} ({media_type})")
+                    summary["updated"] += 1
                     request_to_check = existing_request
                 else:
-                    # Create new request
                     season_count = None
                     if media_type == "tv" and "seasons" in request_data:
                         season_count = len(request_data["seasons"])
-                    
-                    new_request = MediaRequest(
+
+                    request_to_check = MediaRequest(
                         user_id=user.id,
                         jellyseerr_request_id=jellyseerr_request_id,
                         media_type=media_type,
@@ -237,95 +471,142 @@ class JellyseerrSyncService:
                         status=status,
                         season_count=season_count
                     )
-                    db.add(new_request)
-                    db.flush()  # Get the ID for the new request
+                    db.add(request_to_check)
+                    existing_by_seerr_id[jellyseerr_request_id] = request_to_check
+                    summary["created"] += 1
                     logger.info(f"Created new request: {title} ({media_type})")
-                    request_to_check = new_request
-                
-                # For TV shows, check all Sonarr instances for existing episodes
+
                 if media_type == "tv":
-                    for sonarr in sonarr_instances:
-                        await self._import_existing_episodes(
-                            db, 
-                            request_to_check, 
-                            tmdb_id,
-                            sonarr
-                        )
-                
-                synced_count += 1
-            
+                    tv_requests.append(request_to_check)
+
+            db.flush()  # assign ids to new requests before importing episodes
+
+            # For TV shows, check all Sonarr instances for existing episodes
+            if tv_requests:
+                await self.import_existing_episodes(db, tv_requests)
+
+            if oldest_skipped is not None and newest_seen is not None:
+                newest_seen = min(newest_seen, oldest_skipped)
+            if newest_seen is not None:
+                if cursor_row is None:
+                    db.add(SystemConfig(key=REQUEST_SYNC_CURSOR_KEY, value=newest_seen.isoformat()))
+                else:
+                    cursor_row.value = newest_seen.isoformat()
             db.commit()
-            logger.info(f"Synced {synced_count} requests from Jellyseerr")
         except Exception as e:
             db.rollback()
             logger.error(f"Error syncing requests: {e}")
+            raise
         finally:
             db.close()
-    
-    async def _import_existing_episodes(self, db, request: MediaRequest, tmdb_id: int, sonarr):
-        """Import existing episodes from Sonarr for a TV show request"""
-        try:
-            # Find the series in Sonarr by TMDB ID
-            series = await sonarr.get_series_by_tmdb(tmdb_id)
-            
-            if not series:
-                logger.info(f"Series with TMDB ID {tmdb_id} not found in Sonarr")
-                return
-            
-            series_id = series.get("id")
-            logger.info(f"Found series '{series.get('title')}' (ID: {series_id}) in Sonarr")
-            
-            # Get all episodes for this series
-            episodes = await sonarr.get_episodes_by_series(series_id)
-            
-            if not episodes:
-                logger.info(f"No episodes found for series ID {series_id}")
-                return
-            
-            imported_count = 0
-            for episode in episodes:
-                # Only track episodes that have an episode file (downloaded)
-                if not episode.get("hasFile"):
+
+        elapsed = time.monotonic() - started
+        summary["seconds"] = round(elapsed, 2)
+        summary["rows_per_second"] = round(summary["fetched"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"Synced {summary['created'] + summary['updated']} requests from Jellyseerr "
+            f"({summary['mode']}: {summary['created']} new, {summary['updated']} updated, "
+            f"{summary['fetched']} fetched in {summary['seconds']}s, "
+            f"{summary['rows_per_second']} rows/s)"
+        )
+        return summary
+
+    async def import_existing_episodes(
+        self,
+        db: Session,
+        requests: List[MediaRequest],
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> dict:
+        """Import already-downloaded Sonarr episodes for TV requests, in bulk.
+
+        Each Sonarr instance's /series list is fetched once and indexed by
+        TMDB ID. Episode lists are fetched concurrently per batch of requests,
+        and for each series the already-tracked (season, episode) keys are
+        read in one query before the missing rows are inserted in one
+        statement. Each series is inserted inside a SAVEPOINT, so one that
+        fails (e.g. a webhook tracked the same episode meanwhile) is logged,
+        counted in `failed` and skipped without losing the rest. Commits after
+        every batch and reports the number of requests processed through
+        `on_progress`.
+        """
+        from app.services.sonarr_service import get_all_sonarr_instances
+
+        instances = get_all_sonarr_instances()
+        indexes = await asyncio.gather(*(sonarr.get_series_index() for sonarr in instances))
+        sources = [(sonarr, index) for sonarr, index in zip(instances, indexes) if index]
+        semaphore = asyncio.Semaphore(EPISODE_IMPORT_CONCURRENCY)
+        summary = {"requests": len(requests), "series_matched": 0, "imported": 0, "failed": 0}
+
+        async def _episodes(sonarr, series_id: int) -> list:
+            async with semaphore:
+                return await sonarr.get_episodes_by_series(series_id) or []
+
+        processed = 0
+        for start in range(0, len(requests), EPISODE_IMPORT_BATCH_SIZE):
+            batch = requests[start:start + EPISODE_IMPORT_BATCH_SIZE]
+            lookups = [
+                (request, sonarr, index[request.tmdb_id])
+                for request in batch
+                for sonarr, index in sources
+                if request.tmdb_id in index
+            ]
+            episode_lists = await asyncio.gather(
+                *(_episodes(sonarr, series["id"]) for _request, sonarr, series in lookups)
+            )
+            for (request, _sonarr, series), episodes in zip(lookups, episode_lists):
+                summary["series_matched"] += 1
+                try:
+                    with db.begin_nested():
+                        imported = self._insert_missing_episodes(db, request, series, episodes)
+                except Exception as e:
+                    summary["failed"] += 1
+                    logger.error(
+                        f"Failed to import episodes for '{series.get('title')}' (request {request.id}): {e}"
+                    )
                     continue
-                
-                season_number = episode.get("seasonNumber")
-                episode_number = episode.get("episodeNumber")
-                
-                # Check if we're already tracking this episode
-                existing_tracking = db.query(EpisodeTracking).filter(
-                    EpisodeTracking.series_id == series_id,
-                    EpisodeTracking.season_number == season_number,
-                    EpisodeTracking.episode_number == episode_number
-                ).first()
-                
-                if existing_tracking:
-                    continue  # Already tracked
-                
-                # Create episode tracking record
-                from datetime import datetime
-                
-                air_date = None
-                if episode.get("airDateUtc"):
-                    try:
-                        air_date = datetime.fromisoformat(episode.get("airDateUtc").replace('Z', '+00:00'))
-                    except:
-                        pass
-                
-                episode_tracking = EpisodeTracking(
-                    request_id=request.id,
-                    series_id=series_id,
-                    season_number=season_number,
-                    episode_number=episode_number,
-                    episode_title=episode.get("title"),
-                    air_date=air_date,
-                    notified=True,  # Mark as already notified to prevent spam
-                    available_in_plex=True
-                )
-                db.add(episode_tracking)
-                imported_count += 1
-            
-            if imported_count > 0:
-                logger.info(f"Imported {imported_count} existing episodes for '{series.get('title')}'")
-            
-        except Exception as e:
-            logger.error(f"Error importing existing episodes for request {request.id}: {e}")
+                summary["imported"] += imported
+            db.commit()
+            processed += len(batch)
+            if on_progress:
+                on_progress(processed)
+            await asyncio.sleep(0)  # let webhooks in between batches
+
+        logger.info(
+            f"Episode import: {summary['imported']} episodes imported across "
+            f"{summary['series_matched']} matched series for {summary['requests']} requests"
+            + (f" ({summary['failed']} series failed)" if summary["failed"] else "")
+        )
+        return summary
+
+    @staticmethod
+    def _insert_missing_episodes(db: Session, request: MediaRequest, series: dict, episodes: list) -> int:
+        """Insert tracking rows for downloaded episodes not yet tracked for this series."""
+        series_id = series.get("id")
+        tracked = set(
+            db.query(EpisodeTracking.season_number, EpisodeTracking.episode_number)
+            .filter(EpisodeTracking.series_id == series_id)
+            .all()
+        )
+        rows = []
+        for episode in episodes:
+            # Only track episodes that have an episode file (downloaded)
+            if not episode.get("hasFile"):
+                continue
+            key = (episode.get("seasonNumber"), episode.get("episodeNumber"))
+            if key in tracked:
+                continue
+            tracked.add(key)
+            rows.append({
+                "request_id": request.id,
+                "series_id": series_id,
+                "season_number": key[0],
+                "episode_number": key[1],
+                "episode_title": episode.get("title"),
+                "air_date": _parse_seerr_timestamp(episode.get("airDateUtc")),
+                "notified": True,  # Mark as already notified to prevent spam
+                "available_in_plex": True,
+            })
+        if rows:
+            db.execute(insert(EpisodeTracking), rows)
+            logger.info(f"Imported {len(rows)} existing episodes for '{series.get('title')}'")
+        return len(rows)
@@ -137,21 +137,36 @@ def record_delivery_for_notification(
     return count
 
 
-def backfill_delivery_log_from_notifications(db: Session) -> int:
-    """Backfill ledger rows from sent notifications before retention purges them."""
-    rows = db.query(Notification).filter(Notification.sent.is_(True)).all()
+def backfill_delivery_log_from_notifications(db: Session, batch_size: int = 500) -> int:
+    """Backfill ledger rows from sent notifications before retention purges them.
+
+    Walks the table in id order so only one batch of bodies is in memory.
+    """
     created = 0
-    for notification in rows:
-        try:
-            created += record_delivery_for_notification(
-                db,
-                notification,
-                sent_at=notification.sent_at,
-            )
-        except Exception:
-            logger.debug(
-                "failed to backfill delivery log from notification %s",
-                notification.id,
-                exc_info=True,
-            )
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Notification)
+            .filter(Notification.sent.is_(True), Notification.id > last_id)
+            .order_by(Notification.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for notification in rows:
+            try:
+                created += record_delivery_for_notification(
+                    db,
+                    notification,
+                    sent_at=notification.sent_at,
+                )
+            except Exception:
+                logger.debug(
+                    "failed to backfill delivery log from notification %s",
+                    notification.id,
+                    exc_info=True,
+                )
+            db.expunge(notification)
+        last_id = rows[-1].id
     return created
@@ -1,10 +1,10 @@
 """
 Plex service for checking if media exists in Plex library
 """
-import httpx
 import logging
 from app.config import settings
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class PlexService:
             "Accept": "application/json"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with upstream_client("Plex", timeout=30.0) as client:
             response = await client.get(url, headers=headers)
             response.raise_for_status()
             return response.json()
@@ -4,9 +4,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
-
 from app.config import settings
+from app.services.upstream_metrics import upstream_client
 
 
 logger = logging.getLogger(__name__)
@@ -79,7 +78,7 @@ class PushoverService:
             payload["url_title"] = url_title or "Open BingeAlert"
 
         try:
-            async with httpx.AsyncClient(timeout=8.0) as client:
+            async with upstream_client("Pushover", timeout=8.0) as client:
                 response = await client.post(PUSHOVER_API_URL, data=payload)
             response.raise_for_status()
             return True
@@ -1,9 +1,9 @@
-import httpx
 import logging
 from typing import Optional, Dict
 
 from app.config import settings
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ class RadarrService:
     async def _get(self, endpoint: str) -> dict:
         """Make GET request to Radarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client("Radarr") as client:
             response = await client.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
@@ -56,18 +56,14 @@ class RadarrService:
             return []
     
     async def get_quality_profiles(self) -> list:
-        """Get all quality profiles from Radarr"""
-        try:
-            profiles = await self._get("/qualityProfile")
-            return profiles
-        except Exception as e:
-            logger.error(f"Failed to fetch quality profiles from Radarr: {e}")
-            return []
+        """Get all quality profiles from Radarr (cached per instance, see app.services.arr_metadata)"""
+        from app.services.arr_metadata import get_quality_profiles
+        return await get_quality_profiles(self)
     
     async def _delete(self, endpoint: str, params: dict = None) -> bool:
         """Make DELETE request to Radarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client("Radarr") as client:
             response = await client.delete(url, headers=self.headers, params=params)
             response.raise_for_status()
             return True
@@ -75,7 +71,7 @@ class RadarrService:
     async def _post(self, endpoint: str, data: dict) -> dict:
         """Make POST request to Radarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client("Radarr") as client:
             response = await client.post(url, headers=self.headers, json=data)
             response.raise_for_status()
             return response.json()
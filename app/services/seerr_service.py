@@ -1,9 +1,9 @@
-import httpx
 import logging
 from typing import Optional
 
 from app.config import settings
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ class SeerrService:
         """Mark an issue as resolved in Seerr via API"""
         try:
             url = f"{self.base_url}/api/v1/issue/{seerr_issue_id}/resolved"
-            async with httpx.AsyncClient() as client:
+            async with upstream_client("Seerr") as client:
                 response = await client.post(url, headers=self.headers)
                 response.raise_for_status()
                 logger.info(f"Resolved issue #{seerr_issue_id} in Seerr")
@@ -1,9 +1,10 @@
-import httpx
+import asyncio
 import logging
 from typing import Optional, Dict
 
 from app.config import settings
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class SonarrService:
     async def _get(self, endpoint: str) -> dict:
         """Make GET request to Sonarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client(self.instance_name) as client:
             response = await client.get(url, headers=self.headers)
             response.raise_for_status()
             return response.json()
@@ -34,7 +35,7 @@ class SonarrService:
     async def _post(self, endpoint: str, data: dict) -> dict:
         """Make POST request to Sonarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client(self.instance_name) as client:
             response = await client.post(url, headers=self.headers, json=data)
             response.raise_for_status()
             return response.json()
@@ -108,6 +109,17 @@ class SonarrService:
             logger.error(f"Failed to find series with TMDB ID {tmdb_id}: {e}")
             return None
     
+    async def get_series_index(self) -> Optional[Dict[int, Dict]]:
+        """Fetch /series once and index it by TMDB ID (None on failure).
+
+        Bulk callers should build this once and look series up in it rather
+        than calling get_series_by_tmdb, which downloads every series per call.
+        """
+        all_series = await self.get_all_series()
+        if all_series is None:
+            return None
+        return {series["tmdbId"]: series for series in all_series if series.get("tmdbId")}
+    
     async def get_episodes_by_series(self, series_id: int) -> Optional[list]:
         """Get all episodes for a series"""
         try:
@@ -144,18 +156,35 @@ class SonarrService:
             return None
     
     async def get_quality_profiles(self) -> list:
-        """Get all quality profiles from Sonarr"""
-        try:
-            profiles = await self._get("/qualityProfile")
-            return profiles
-        except Exception as e:
-            logger.error(f"Failed to fetch quality profiles from {self.instance_name}: {e}")
-            return []
+        """Get all quality profiles from Sonarr (cached per instance, see app.services.arr_metadata)"""
+        from app.services.arr_metadata import get_quality_profiles
+        return await get_quality_profiles(self)
     
+    async def wait_for_command(
+        self, command_id: Optional[int], timeout: float = 60, interval: float = 1.0
+    ) -> str:
+        """Poll /command/{id} until it finishes; returns its final status.
+
+        Returns "timeout" if it is still running after `timeout` seconds, or
+        "unknown" without an id.
+        """
+        if not command_id:
+            return "unknown"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            command = await self._get(f"/command/{command_id}")
+            status = (command.get("status") or "").lower()
+            if status in ("completed", "failed", "aborted", "cancelled", "orphaned"):
+                return status
+            if loop.time() >= deadline:
+                return "timeout"
+            await asyncio.sleep(interval)
+
     async def _delete(self, endpoint: str, params: dict = None) -> bool:
         """Make DELETE request to Sonarr API"""
         url = f"{self.base_url}/api/v3{endpoint}"
-        async with httpx.AsyncClient() as client:
+        async with upstream_client(self.instance_name) as client:
             response = await client.delete(url, headers=self.headers, params=params)
             response.raise_for_status()
             return True
@@ -1,7 +1,7 @@
-import httpx
 import logging
 from typing import Optional
 from app.security import normalize_http_url
+from app.services.upstream_metrics import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class TMDBService:
         try:
             if self.use_jellyseerr:
                 # Use Jellyseerr as a proxy (already has TMDB data)
-                async with httpx.AsyncClient() as client:
+                async with upstream_client("Seerr") as client:
                     response = await client.get(
                         f"{self.jellyseerr_url}/api/v1/tv/{tmdb_id}",
                         headers={"X-Api-Key": self.jellyseerr_api_key},
@@ -52,7 +52,7 @@ class TMDBService:
         try:
             if self.use_jellyseerr:
                 # Use Jellyseerr as a proxy (already has TMDB data)
-                async with httpx.AsyncClient() as client:
+                async with upstream_client("Seerr") as client:
                     response = await client.get(
                         f"{self.jellyseerr_url}/api/v1/movie/{tmdb_id}",
                         headers={"X-Api-Key": self.jellyseerr_api_key},
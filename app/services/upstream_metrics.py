@@ -0,0 +1,321 @@
+"""Latency, error and in-flight tracking for outbound calls to upstream services.
+
+Every HTTP call to Sonarr, Radarr, Seerr, Plex and Pushover goes through an
+httpx client built by upstream_client(), whose transport times the request
+(until response headers arrive) and records it against a
+"METHOD /normalised/path" endpoint label. SMTP sends are wrapped in
+track_upstream() directly.
+
+Per endpoint we keep a log-bucketed LatencyHistogram (fixed memory, see
+app.histogram), request/error counters and an in-flight gauge. The histogram
+and counters accumulated since the last flush are merged into hourly
+`upstream_latency_rollups` rows by upstream_metrics_flusher(), so
+percentiles survive restarts; the dashboard reads the last 24 hourly rows
+plus whatever is still pending in memory.
+
+An error is a raised exception (timeout, connection refused, ...) or an HTTP
+status >= 400 other than 404, which the *arr lookups use for "not found".
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from app.histogram import LatencyHistogram, merge_histograms
+
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_FLUSH_SECONDS = 60
+UPSTREAM_ROLLUP_RETENTION = timedelta(days=14)
+# Cap distinct endpoint labels per service so odd URLs can't grow memory.
+MAX_ENDPOINTS_PER_SERVICE = 50
+OVERFLOW_ENDPOINT = "other"
+
+# Path segments that are ids rather than routes: numbers, uuids, long hex.
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+
+def normalize_endpoint(method: str, path: str) -> str:
+    """'GET /api/v3/series/12/episodes' -> 'GET /api/v3/series/{id}/episodes'."""
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    ]
+    return f"{method.upper()} {'/'.join(segments) or '/'}"
+
+
+class _EndpointStats:
+    __slots__ = ("in_flight", "requests", "errors", "pending", "pending_requests", "pending_errors")
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.pending = LatencyHistogram()
+        self.pending_requests = 0
+        self.pending_errors = 0
+
+    def observe(self, latency_ms: float, failed: bool) -> None:
+        self.requests += 1
+        self.pending_requests += 1
+        self.pending.record(latency_ms)
+        if failed:
+            self.errors += 1
+            self.pending_errors += 1
+
+
+_stats: dict[tuple[str, str], _EndpointStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _stats_for(service: str, endpoint: str) -> _EndpointStats:
+    key = (service, endpoint)
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            known = sum(1 for svc, _ in _stats if svc == service)
+            if known >= MAX_ENDPOINTS_PER_SERVICE:
+                key = (service, OVERFLOW_ENDPOINT)
+                stats = _stats.get(key)
+            if stats is None:
+                stats = _stats[key] = _EndpointStats()
+        return stats
+
+
+class _Outcome:
+    __slots__ = ("failed",)
+
+    def __init__(self) -> None:
+        self.failed = False
+
+
+@asynccontextmanager
+async def track_upstream(service: str, endpoint: str) -> AsyncIterator[_Outcome]:
+    """Time the enclosed call; an exception, or setting `.failed`, counts as an error."""
+    stats = _stats_for(service, endpoint)
+    outcome = _Outcome()
+    stats.in_flight += 1
+    started = time.perf_counter()
+    failed = True
+    try:
+        yield outcome
+        failed = outcome.failed
+    finally:
+        stats.in_flight -= 1
+        stats.observe((time.perf_counter() - started) * 1000.0, failed)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """httpx transport wrapper that records every request under `service`."""
+
+    def __init__(self, service: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._service = service
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = normalize_endpoint(request.method, request.url.path)
+        async with track_upstream(self._service, endpoint) as outcome:
+            response = await self._transport.handle_async_request(request)
+            outcome.failed = response.status_code >= 400 and response.status_code != 404
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def upstream_client(service: str, **kwargs: Any) -> httpx.AsyncClient:
+    """An httpx.AsyncClient whose requests are recorded under `service`."""
+    return httpx.AsyncClient(transport=InstrumentedTransport(service), **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Persistence and reporting
+# ---------------------------------------------------------------------------
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _take_pending() -> dict[tuple[str, str], tuple[LatencyHistogram, int, int]]:
+    taken = {}
+    with _stats_lock:
+        for key, stats in _stats.items():
+            if not stats.pending_requests:
+                continue
+            taken[key] = (stats.pending, stats.pending_requests, stats.pending_errors)
+            stats.pending = LatencyHistogram()
+            stats.pending_requests = 0
+            stats.pending_errors = 0
+    return taken
+
+
+def _restore_pending(taken: dict[tuple[str, str], tuple[LatencyHistogram, int, int]]) -> None:
+    with _stats_lock:
+        for key, (histogram, requests, errors) in taken.items():
+            stats = _stats.setdefault(key, _EndpointStats())
+            stats.pending.merge(histogram)
+            stats.pending_requests += requests
+            stats.pending_errors += errors
+
+
+def _write_rollups(db, taken: dict) -> int:
+    """Merge taken samples into this hour's rollup rows (caller commits)."""
+    from app.database import UpstreamLatencyRollup
+
+    now = datetime.utcnow()
+    bucket_start = _hour(now)
+    existing = {
+        (row.service, row.endpoint): row
+        for row in db.query(UpstreamLatencyRollup).filter(
+            UpstreamLatencyRollup.bucket_start == bucket_start,
+            UpstreamLatencyRollup.service.in_({service for service, _ in taken}),
+        )
+    }
+    for (service, endpoint), (histogram, requests, errors) in taken.items():
+        row = existing.get((service, endpoint))
+        if row is None:
+            row = UpstreamLatencyRollup(
+                service=service,
+                endpoint=endpoint,
+                bucket_start=bucket_start,
+                requests=0,
+                errors=0,
+                latency_sum_ms=0,
+            )
+            db.add(row)
+        merged = LatencyHistogram.loads(row.latency_histogram).merge(histogram)
+        row.latency_histogram = merged.dumps()
+        row.requests += requests
+        row.errors += errors
+        row.latency_sum_ms += int(histogram.total_ms)
+        row.latency_max_ms = max(row.latency_max_ms or 0, int(histogram.max_ms))
+    db.query(UpstreamLatencyRollup).filter(
+        UpstreamLatencyRollup.bucket_start < now - UPSTREAM_ROLLUP_RETENTION
+    ).delete(synchronize_session=False)
+    return len(taken)
+
+
+def flush_upstream_metrics() -> int:
+    """Merge pending samples into this hour's rollup rows. Returns rows written."""
+    from app.database import SessionLocal
+
+    taken = _take_pending()
+    if not taken:
+        return 0
+    db = SessionLocal()
+    try:
+        written = _write_rollups(db, taken)
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        _restore_pending(taken)
+        raise
+    finally:
+        db.close()
+
+
+async def _flush_through_writer() -> int:
+    from app.db_writer import run_write
+
+    taken = _take_pending()
+    if not taken:
+        return 0
+    try:
+        return await run_write(lambda db: _write_rollups(db, taken), "upstream_metrics")
+    except Exception:
+        _restore_pending(taken)
+        raise
+
+
+async def upstream_metrics_flusher() -> None:
+    """Persist upstream latency rollups every UPSTREAM_FLUSH_SECONDS."""
+    try:
+        while True:
+            await asyncio.sleep(UPSTREAM_FLUSH_SECONDS)
+            try:
+                await _flush_through_writer()
+            except Exception as e:
+                logger.warning("upstream metrics flush failed: %s", e)
+    except asyncio.CancelledError:
+        try:
+            flush_upstream_metrics()
+        except Exception:
+            logger.debug("final upstream metrics flush failed", exc_info=True)
+        raise
+
+
+def get_upstream_counters() -> dict[tuple[str, str], dict[str, int]]:
+    """Cumulative (since process start) requests/errors and current in-flight per endpoint."""
+    with _stats_lock:
+        return {
+            key: {"requests": stats.requests, "errors": stats.errors, "in_flight": stats.in_flight}
+            for key, stats in _stats.items()
+        }
+
+
+def get_upstream_metrics(hours: int = 24) -> list[dict[str, Any]]:
+    """Per-endpoint request/error counts and latency percentiles for the window.
+
+    Reads the persisted hourly rollups and adds samples not yet flushed, so
+    the figures are current to the last call.
+    """
+    from app.database import SessionLocal, UpstreamLatencyRollup
+
+    since = _hour(datetime.utcnow()) - timedelta(hours=max(1, hours) - 1)
+    combined: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def _entry(key: tuple[str, str]) -> dict[str, Any]:
+        return combined.setdefault(key, {"histograms": [], "requests": 0, "errors": 0})
+
+    db = SessionLocal()
+    try:
+        for row in db.query(UpstreamLatencyRollup).filter(UpstreamLatencyRollup.bucket_start >= since):
+            entry = _entry((row.service, row.endpoint))
+            entry["histograms"].append(
+                LatencyHistogram.loads(
+                    row.latency_histogram, total_ms=row.latency_sum_ms, max_ms=row.latency_max_ms
+                )
+            )
+            entry["requests"] += row.requests or 0
+            entry["errors"] += row.errors or 0
+    finally:
+        db.close()
+
+    with _stats_lock:
+        in_flight = {key: stats.in_flight for key, stats in _stats.items()}
+        for key, stats in _stats.items():
+            entry = _entry(key)
+            if stats.pending_requests:
+                entry["histograms"].append(LatencyHistogram().merge(stats.pending))
+                entry["requests"] += stats.pending_requests
+                entry["errors"] += stats.pending_errors
+
+    rows = []
+    for (service, endpoint), entry in combined.items():
+        latency = merge_histograms(entry["histograms"]).summary()
+        requests = entry["requests"]
+        rows.append({
+            "service": service,
+            "endpoint": endpoint,
+            "requests": requests,
+            "errors": entry["errors"],
+            "error_rate": round(entry["errors"] / requests * 100, 1) if requests else None,
+            "in_flight": in_flight.get((service, endpoint), 0),
+            "p50_ms": latency["p50_ms"],
+            "p95_ms": latency["p95_ms"],
+            "p99_ms": latency["p99_ms"],
+            "max_ms": latency["max_ms"],
+        })
+    rows.sort(key=lambda row: (row["service"], -(row["p95_ms"] or 0)))
+    return rows
@@ -0,0 +1,188 @@
+"""Case-insensitive user resolution for Seerr webhooks.
+
+Webhooks identify the requester / reporter by email and username only. We
+keep two in-memory maps (lower-cased email -> user id, lower-cased username
+-> user id), loaded lazily and rebuilt after every sync_users(). A map miss
+falls back to the lower(email) / lower(username) expression indexes, which
+covers rows written since the last rebuild.
+
+A user Seerr knows but we don't is fetched on its own: the request (or
+issue) the webhook is about carries the full user object, so one GET of
+/request/{id} or /issue/{id} plus a single-row upsert replaces the old full
+user re-sync. Fetches are coalesced per request/issue, so a burst of
+webhooks for the same item makes one Seerr call.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, User
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds a webhook waits for a missing user to be fetched from Seerr.
+USER_FETCH_TIMEOUT_SECONDS = 10.0
+
+_lock = threading.Lock()
+_by_email: dict[str, int] = {}
+_by_username: dict[str, int] = {}
+_loaded = False
+_pending_fetches: dict[tuple[str, int], asyncio.Task] = {}
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def remember_user(user_id: int, email: Optional[str], username: Optional[str]) -> None:
+    with _lock:
+        if _normalize(email):
+            _by_email[_normalize(email)] = user_id
+        if _normalize(username):
+            _by_username[_normalize(username)] = user_id
+
+
+def refresh_user_index(db: Optional[Session] = None) -> int:
+    """Rebuild both maps from the users table. Returns the number of users."""
+    global _loaded
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        # Active users last so they win when an email/username is shared
+        # with a deactivated account.
+        rows = db.query(User.id, User.email, User.username).order_by(User.is_active, User.id).all()
+    finally:
+        if own_session:
+            db.close()
+    by_email: dict[str, int] = {}
+    by_username: dict[str, int] = {}
+    for user_id, email, username in rows:
+        if _normalize(email):
+            by_email[_normalize(email)] = user_id
+        if _normalize(username):
+            by_username[_normalize(username)] = user_id
+    with _lock:
+        _by_email.clear()
+        _by_email.update(by_email)
+        _by_username.clear()
+        _by_username.update(by_username)
+        _loaded = True
+    return len(rows)
+
+
+def _lookup(db: Session, mapping: dict[str, int], column, value: Optional[str]) -> Optional[User]:
+    key = _normalize(value)
+    if not key:
+        return None
+    with _lock:
+        user_id = mapping.get(key)
+    if user_id is not None:
+        user = db.get(User, user_id)
+        if user is not None:
+            return user
+    user = db.query(User).filter(func.lower(column) == key).order_by(User.is_active.desc(), User.id).first()
+    if user is not None:
+        remember_user(user.id, user.email, user.username)
+    return user
+
+
+def find_user(db: Session, email: Optional[str] = None, username: Optional[str] = None) -> Optional[User]:
+    """Resolve a webhook user by email, then username (case-insensitive)."""
+    if not _loaded:
+        refresh_user_index(db)
+    return _lookup(db, _by_email, User.email, email) or _lookup(db, _by_username, User.username, username)
+
+
+def _upsert_seerr_user(user_data: dict) -> Optional[int]:
+    """Insert or refresh one Seerr user; returns the local user id."""
+    from app.services.jellyseerr_sync import seerr_user_fields
+
+    if not user_data.get("id") or not user_data.get("email"):
+        return None
+    fields = seerr_user_fields(user_data)
+    now = datetime.utcnow()
+    stmt = sqlite_insert(User).values(**fields, is_active=True)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["jellyseerr_id"],
+        set_={
+            "email": fields["email"],
+            "username": fields["username"],
+            "plex_id": fields["plex_id"],
+            "is_active": True,
+            "deactivated_at": None,
+            "updated_at": now,
+        },
+    )
+    db = SessionLocal()
+    try:
+        db.execute(stmt)
+        db.commit()
+        user_id = db.query(User.id).filter(User.jellyseerr_id == fields["jellyseerr_id"]).scalar()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    if user_id is not None:
+        remember_user(user_id, fields["email"], fields["username"])
+        logger.info(f"Fetched missing user from Seerr: {fields['username']} ({fields['email']})")
+    return user_id
+
+
+async def _fetch_and_store(kind: str, seerr_id: int) -> Optional[int]:
+    from app.services.jellyseerr_sync import JellyseerrSyncService
+
+    data = await JellyseerrSyncService()._get(f"/{kind}/{seerr_id}")
+    user_data = (data or {}).get("requestedBy" if kind == "request" else "createdBy")
+    if not isinstance(user_data, dict):
+        return None
+    return _upsert_seerr_user(user_data)
+
+
+def _fetch_finished(key: tuple[str, int], task: asyncio.Task) -> None:
+    _pending_fetches.pop(key, None)
+    if not task.cancelled():
+        # Mark the exception retrieved even if every waiter already timed out.
+        task.exception()
+
+
+async def fetch_missing_user(
+    *, request_id: Optional[int] = None, issue_id: Optional[int] = None
+) -> Optional[int]:
+    """Fetch the Seerr user behind a request or issue and store it locally.
+
+    Concurrent calls for the same request/issue share one fetch. Returns the
+    local user id, or None if Seerr didn't return a usable user.
+    """
+    try:
+        if request_id:
+            key = ("request", int(request_id))
+        elif issue_id:
+            key = ("issue", int(issue_id))
+        else:
+            return None
+    except (TypeError, ValueError):
+        return None
+    task = _pending_fetches.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_store(*key))
+        _pending_fetches[key] = task
+        task.add_done_callback(lambda done: _fetch_finished(key, done))
+    try:
+        # shield(): a webhook timing out must not cancel the shared fetch.
+        return await asyncio.wait_for(asyncio.shield(task), timeout=USER_FETCH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out fetching user for Seerr {key[0]} {key[1]}")
+        return None
+    except Exception as e:
+        logger.error(f"Failed fetching user for Seerr {key[0]} {key[1]}: {e}")
+        return None
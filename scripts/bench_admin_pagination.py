@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Compare OFFSET vs keyset pagination latency on the notifications list.
+
+Usage
+-----
+    python scripts/bench_admin_pagination.py [--rows 50000] [--page-size 50]
+
+What it does
+------------
+    1. Builds a throwaway SQLite database in a temp dir (alembic head schema,
+       so the composite (created_at, id) index is present).
+    2. Seeds one user, one request and --rows notifications with multi-KB
+       bodies, like a real backlog.
+    3. Times page 1 and page 500 of the admin notifications query both ways:
+       OFFSET (what /admin/notifications used to do) and keyset via
+       app.pagination.keyset_page (what it does now).
+
+Nothing touches your real /data directory.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="bingealert-bench-")
+    os.environ["DATA_DIR"] = data_dir
+    subprocess.run(["alembic", "upgrade", "head"], cwd=ROOT, check=True, capture_output=True)
+
+    from sqlalchemy import insert
+    from sqlalchemy.orm import contains_eager, defer
+
+    from app.database import MediaRequest, Notification, SessionLocal, User
+    from app.pagination import encode_cursor, keyset_page
+
+    db = SessionLocal()
+    user = User(jellyseerr_id=1, email="bench@example.com", username="bench")
+    db.add(user)
+    db.flush()
+    request = MediaRequest(
+        user_id=user.id, jellyseerr_request_id=1, media_type="tv",
+        tmdb_id=1, title="Bench Show", status="approved",
+    )
+    db.add(request)
+    db.flush()
+    base = datetime.utcnow()
+    body = "<p>" + ("x" * 4000) + "</p>"
+    db.execute(
+        insert(Notification),
+        [
+            {
+                "user_id": user.id,
+                "request_id": request.id,
+                "notification_type": "episode",
+                "subject": f"Episode {i}",
+                "body": body,
+                "sent": True,
+                "created_at": base - timedelta(seconds=i),
+            }
+            for i in range(args.rows)
+        ],
+    )
+    db.commit()
+
+    def base_query():
+        return (
+            db.query(Notification)
+            .join(Notification.user)
+            .options(defer(Notification.body), contains_eager(Notification.user))
+        )
+
+    def offset_page(page: int):
+        return (
+            base_query()
+            .order_by(Notification.created_at.desc(), Notification.id.desc())
+            .offset((page - 1) * args.page_size)
+            .limit(args.page_size)
+            .all()
+        )
+
+    # The cursor a client would hold after walking to the page before.
+    boundary = offset_page(args.page - 1)[-1]
+    cursor = encode_cursor(boundary.created_at, boundary.id)
+    db.expunge_all()
+
+    results = {
+        "offset page 1": _timed(lambda: offset_page(1), args.repeat),
+        f"offset page {args.page}": _timed(lambda: offset_page(args.page), args.repeat),
+        "keyset page 1": _timed(
+            lambda: keyset_page(base_query(), Notification.created_at, Notification.id, args.page_size),
+            args.repeat,
+        ),
+        f"keyset page {args.page}": _timed(
+            lambda: keyset_page(
+                base_query(), Notification.created_at, Notification.id, args.page_size, cursor
+            ),
+            args.repeat,
+        ),
+    }
+    db.close()
+
+    print(f"{args.rows} notifications, page size {args.page_size}, median of {args.repeat}")
+    for label, ms in results.items():
+        print(f"  {label:<18} {ms:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
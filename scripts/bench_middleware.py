@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Measure requests/sec through the setup + auth gates, before vs after.
+
+Usage
+-----
+    python scripts/bench_middleware.py [--requests 5000] [--concurrency 20]
+
+What it does
+------------
+    Builds two tiny apps with stub /health and /webhooks/sonarr routes (so
+    only middleware cost is measured) and drives each in-process via httpx's
+    ASGI transport:
+
+      before  the same gate logic wrapped in Starlette BaseHTTPMiddleware,
+              as app.middleware / app.auth used to do
+      after   the pure-ASGI SetupGateMiddleware + AuthMiddleware
+
+    A throwaway DATA_DIR with a minimal configured config.json is used so the
+    gates take their normal "configured, auth required" path.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_data_dir = tempfile.mkdtemp(prefix="bingealert-bench-")
+os.environ["DATA_DIR"] = _data_dir
+(Path(_data_dir) / "config.json").write_text(
+    json.dumps(
+        {
+            "smtp_host": "smtp.invalid",
+            "smtp_from": "bench@example.com",
+            "jellyseerr_url": "http://seerr.invalid",
+            "jellyseerr_api_key": "x",
+            "sonarr_url": "http://sonarr.invalid",
+            "sonarr_api_key": "x",
+            "radarr_url": "http://radarr.invalid",
+            "radarr_api_key": "x",
+            "app_secret_key": "x" * 32,
+            "auth_required": True,
+            "admin_password_hash": "x",
+        }
+    ),
+    encoding="utf-8",
+)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from app.auth import AuthMiddleware, auth_gate_response  # noqa: E402
+from app.middleware import SetupGateMiddleware, setup_gate_response  # noqa: E402
+
+
+def _legacy(gate):
+    class _Legacy(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            response = gate(request.scope)
+            if response is not None:
+                return response
+            return await call_next(request)
+
+    return _Legacy
+
+
+def _build_app(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/webhooks/sonarr")
+    async def sonarr_webhook(payload: dict):
+        return {"status": "ignored", "eventType": payload.get("eventType")}
+
+    if pure_asgi:
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(SetupGateMiddleware)
+    else:
+        app.add_middleware(_legacy(auth_gate_response))
+        app.add_middleware(_legacy(setup_gate_response))
+    return app
+
+
+async def _run(app: FastAPI, method: str, path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app, client=("203.0.113.5", 40000))
+    body = {"eventType": "Test"} if method == "POST" else None
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = total
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.request(method, path, json=body)
+                response.raise_for_status()
+
+        for _ in range(50):  # warm-up
+            await client.request(method, path, json=body)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for method, path in (("GET", "/health"), ("POST", "/webhooks/sonarr")):
+        before = await _run(_build_app(False), method, path, args.requests, args.concurrency)
+        after = await _run(_build_app(True), method, path, args.requests, args.concurrency)
+        print(
+            f"  {method:<4} {path:<18} before {before:8.0f} req/s   "
+            f"after {after:8.0f} req/s   ({after / before:.2f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Compare SQLite storage profiles on webhook ingest and notification drain.
+
+Usage
+-----
+    python scripts/bench_storage.py [--profiles safe,balanced,performance]
+                                    [--series 40] [--episodes 12]
+                                    [--concurrency 16] [--pending 2000]
+
+What it does
+------------
+    For each profile in app.database.SQLITE_PROFILES, in a fresh subprocess
+    (the engine reads its profile once at import) with a throwaway DATA_DIR:
+
+      1. Builds the alembic head schema and seeds one user and one TV
+         request per series.
+      2. webhook   Posts --series x --episodes Sonarr Download webhooks,
+                   --concurrency at a time, through the real webhook router
+                   (debounce 0), and waits for every batch to be written.
+                   Reports webhooks/s and episode notifications created.
+      3. drain     Seeds --pending ready movie + episode notifications and
+                   times one drain_pending_notifications() pass.
+                   Reports notifications/s.
+
+    TMDB, Pushover, Sonarr and SMTP are stubbed, so only our code and SQLite
+    are measured. Run it on the box you deploy to -- the point is how the
+    profiles compare on *your* disk and memory. Set the winner with
+    "sqlite_profile" in config.json (or SQLITE_PROFILE), and override single
+    values with the sqlite_* / db_pool_* settings if needed.
+
+Nothing touches your real /data directory.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _write_config(data_dir: str, profile: str) -> None:
+    (Path(data_dir) / "config.json").write_text(
+        json.dumps(
+            {
+                "smtp_host": "smtp.invalid",
+                "smtp_from": "bench@example.com",
+                "jellyseerr_url": "http://seerr.invalid",
+                "jellyseerr_api_key": "x",
+                "sonarr_url": "http://sonarr.invalid",
+                "sonarr_api_key": "x",
+                "radarr_url": "http://radarr.invalid",
+                "radarr_api_key": "x",
+                "app_secret_key": "x" * 32,
+                "auth_required": False,
+                "sqlite_profile": profile,
+                "webhook_download_debounce_seconds": 0,
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+def _stub_upstreams() -> None:
+    from app.services.email_service import EmailService
+    from app.services.pushover_service import PushoverService
+    from app.services.sonarr_service import SonarrService
+    from app.services.tmdb_service import TMDBService
+
+    async def no_poster(self, tmdb_id):
+        return None
+
+    async def empty_queue(self, series_id):
+        return []
+
+    async def sent(self, *args, **kwargs):
+        return True
+
+    TMDBService.get_tv_poster = no_poster
+    TMDBService.get_movie_poster = no_poster
+    SonarrService.get_series_episodes_in_queue = empty_queue
+    EmailService.send_email = sent
+    PushoverService.send_episode_available = sent
+
+
+def _seed(series: int) -> None:
+    from app.database import MediaRequest, SessionLocal, User
+
+    db = SessionLocal()
+    for index in range(1, series + 1):
+        user = User(jellyseerr_id=index, email=f"user{index}@example.com", username=f"user{index}")
+        db.add(user)
+        db.flush()
+        db.add(MediaRequest(
+            user_id=user.id, jellyseerr_request_id=index, media_type="tv",
+            tmdb_id=1000 + index, title=f"Show {index}", status="approved",
+        ))
+        db.add(MediaRequest(
+            user_id=user.id, jellyseerr_request_id=100_000 + index, media_type="movie",
+            tmdb_id=5000 + index, title=f"Movie {index}", status="approved",
+        ))
+    db.commit()
+    db.close()
+
+
+async def _bench_webhooks(args) -> dict:
+    import httpx
+    from fastapi import FastAPI
+
+    from app.database import Notification, SessionLocal
+    from app.routers import webhooks
+
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/webhooks")
+    payloads = [
+        {
+            "eventType": "Download",
+            "series": {"id": index, "title": f"Show {index}", "tvdbId": index, "tmdbId": 1000 + index},
+            "episodes": [{"id": index * 1000 + ep, "seasonNumber": 1, "episodeNumber": ep, "title": f"E{ep}"}],
+            "episodeFile": {"qualityCutoffNotMet": False},
+        }
+        for ep in range(1, args.episodes + 1)
+        for index in range(1, args.series + 1)
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def post(payload):
+            async with semaphore:
+                response = await client.post("/webhooks/sonarr", json=payload)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(payload) for payload in payloads))
+        while webhooks._download_tasks:
+            await asyncio.gather(*list(webhooks._download_tasks), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    created = db.query(Notification).filter(Notification.notification_type == "episode").count()
+    db.close()
+    return {"webhooks_per_s": len(payloads) / elapsed, "notifications": created}
+
+
+async def _bench_drain(args) -> dict:
+    from sqlalchemy import insert, update
+
+    from app.database import MediaRequest, Notification, SessionLocal
+    from app.services.email_service import drain_pending_notifications
+
+    db = SessionLocal()
+    ready_at = datetime.utcnow() - timedelta(minutes=1)
+    # Episode rows from the webhook phase become ready, plus fresh movie rows.
+    db.execute(update(Notification).values(send_after=ready_at, created_at=ready_at - timedelta(hours=1)))
+    movies = db.query(MediaRequest.id, MediaRequest.user_id).filter(MediaRequest.media_type == "movie").all()
+    db.execute(
+        insert(Notification),
+        [
+            {
+                "user_id": movies[i % len(movies)].user_id,
+                "request_id": movies[i % len(movies)].id,
+                "notification_type": "movie",
+                "subject": f"Now Available: Movie {i}",
+                "body": "<p>" + ("x" * 2000) + "</p>",
+                "sent": False,
+                "send_after": ready_at,
+            }
+            for i in range(args.pending)
+        ],
+    )
+    db.commit()
+    pending = db.query(Notification).filter(Notification.sent.is_(False)).count()
+    db.close()
+
+    started = time.perf_counter()
+    await drain_pending_notifications("bench")
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    left = db.query(Notification).filter(Notification.sent.is_(False)).count()
+    db.close()
+    return {"drained_per_s": (pending - left) / elapsed, "drained": pending - left}
+
+
+def _child(args) -> int:
+    from app.database import STORAGE_PROFILE
+
+    _stub_upstreams()
+    _seed(args.series)
+    result = {"profile": STORAGE_PROFILE}
+    result.update(asyncio.run(_bench_webhooks(args)))
+    result.update(asyncio.run(_bench_drain(args)))
+    print(json.dumps(result))
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", default="safe,balanced,performance")
+    parser.add_argument("--series", type=int, default=40)
+    parser.add_argument("--episodes", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pending", type=int, default=2000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return _child(args)
+
+    print(
+        f"{args.series} series x {args.episodes} episode webhooks (concurrency {args.concurrency}), "
+        f"drain of webhook rows + {args.pending} movie notifications"
+    )
+    for profile in [name.strip() for name in args.profiles.split(",") if name.strip()]:
+        with tempfile.TemporaryDirectory(prefix="bingealert-bench-") as data_dir:
+            _write_config(data_dir, profile)
+            env = dict(os.environ, DATA_DIR=data_dir)
+            subprocess.run(["alembic", "upgrade", "head"], cwd=ROOT, env=env, check=True, capture_output=True)
+            child = subprocess.run(
+                [sys.executable, __file__, "--child", *sys.argv[1:]],
+                cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+            )
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        settings = result["profile"]
+        print(
+            f"  {profile:<12} webhook {result['webhooks_per_s']:8.0f} /s ({result['notifications']} notifications)"
+            f"   drain {result['drained_per_s']:8.0f} /s ({result['drained']} sent)"
+            f"   [cache {settings['cache_size_kib']} KiB, mmap {settings['mmap_size_mb']} MB,"
+            f" pool {settings['pool_size']}+{settings['max_overflow']}]"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())